@@ -1,8 +1,6 @@
 # backend/app/__init__.py
 
 import os
-import random
-from datetime import datetime
 
 from dotenv import load_dotenv
 from flask import Flask
@@ -10,10 +8,6 @@ from flask_cors import CORS
 from flask_jwt_extended import JWTManager
 from flask_migrate import Migrate
 
-# NOTE: Keep APScheduler import, but do NOT start it under Passenger unless enabled.
-from apscheduler.schedulers.background import BackgroundScheduler
-
-from twilio.rest import Client as TwilioClient
 from openai import OpenAI
 
 from app.utils.db import db
@@ -32,8 +26,9 @@ from app.models.models import (
     HealthTip,
 )
 
-from app.helpers.healthtip_agent import generate_health_tip
-from app.helpers.gemini_client import gemini_generate
+from app.helpers.healthtip_scheduler import send_daily_health_tips  # noqa: F401 (re-export)
+from app.utils.scheduler import init_scheduler
+from app.cli import register_cli
 
 # -------------------------------
 # Environment Setup
@@ -51,17 +46,6 @@ migrate = Migrate()
 openai_client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
 
 
-def _is_openai_quota_or_rate_limit_error(e: Exception) -> bool:
-    msg = str(e).lower()
-    return (
-        "insufficient_quota" in msg
-        or "exceeded your current quota" in msg
-        or "rate limit" in msg
-        or "429" in msg
-        or "too many requests" in msg
-    )
-
-
 def _get_required_env(name: str) -> str:
     """
     Fetch an environment variable and fail fast if missing.
@@ -92,7 +76,7 @@ def create_app():
     # Initialize extensions
     db.init_app(app)
     migrate.init_app(app, db)
-    CORS(app)
+    CORS(app, expose_headers=["X-Next-Cursor", "Link"])  # pagination headers (utils/pagination.py)
 
     # JWT Setup
     app.config["JWT_SECRET_KEY"] = os.getenv("JWT_SECRET_KEY", "supersecretjwtkey")
@@ -134,6 +118,22 @@ def create_app():
     except Exception as e:
         print("Could not load Admin routes:", e)
 
+    try:
+        from app.routes.stats_routes import stats_bp
+
+        app.register_blueprint(stats_bp)
+        print("Stats routes registered successfully.")
+    except Exception as e:
+        print("Could not load Stats routes:", e)
+
+    try:
+        from app.routes.export_routes import export_bp
+
+        app.register_blueprint(export_bp)
+        print("Export routes registered successfully.")
+    except Exception as e:
+        print("Could not load Export routes:", e)
+
     # Internal cron / tasks routes
     try:
         from app.routes.tasks_routes import tasks_bp
@@ -172,97 +172,22 @@ def create_app():
             db.session.rollback()
             return {"error": str(e)}, 500
 
+    # -------------------------------
+    # CLI commands (flask run-job, flask tips-dry-run, ...)
+    # -------------------------------
+    register_cli(app)
+
     # -------------------------------
     # Scheduler (DISABLED under Passenger unless explicitly enabled)
     # -------------------------------
-    # RUN_SCHEDULER=1  -> enable (NOT recommended on Passenger)
-    # RUN_SCHEDULER=0  -> disable (recommended; use cPanel cron)
+    # RUN_SCHEDULER=1  -> every worker joins leader election; exactly one
+    #                     (holder of the scheduler lock) runs JOB_REGISTRY
+    #                     (not with gunicorn --preload, see utils/scheduler.py)
+    # RUN_SCHEDULER=0  -> disable (use cPanel cron + /tasks endpoints)
     if os.getenv("RUN_SCHEDULER") == "1":
-
-        def _scheduled_job():
-            with app.app_context():
-                send_daily_health_tips()
-
-        scheduler = BackgroundScheduler()
-        scheduler.add_job(_scheduled_job, "interval", hours=24)
-        scheduler.start()
-        print("Daily Health Tip Scheduler started.")
+        init_scheduler(app)
+        print("Scheduler leader election started.")
     else:
-        print("Daily Health Tip Scheduler is disabled (RUN_SCHEDULER != 1).")
+        print("Scheduler is disabled (RUN_SCHEDULER != 1).")
 
     return app
-
-
-# -------------------------------
-# Daily Health Tip Sender
-# -------------------------------
-def send_daily_health_tips():
-    print("Sending daily health tips...")
-
-    account_sid = os.getenv("TWILIO_ACCOUNT_SID")
-    auth_token = os.getenv("TWILIO_AUTH_TOKEN")
-
-    if not account_sid or not auth_token:
-        print("Missing Twilio credentials in environment.")
-        return
-
-    twilio_client = TwilioClient(account_sid, auth_token)
-    users = User.query.all()
-
-    if not users:
-        print("No users found.")
-        return
-
-    fallback_pool = [
-        "Drink plenty of water throughout the day.",
-        "Aim for at least 30 minutes of activity daily.",
-        "Get enough sleep — your body needs it to recover.",
-        "Eat more fruits and vegetables for balanced nutrition.",
-        "Take time to relax and breathe deeply each day.",
-    ]
-
-    for user in users:
-        try:
-            tip_text = generate_health_tip(user)
-        except Exception as e:
-            if _is_openai_quota_or_rate_limit_error(e):
-                print("OpenAI quota/rate limit hit. Falling back to Gemini.")
-                prompt = (
-                    "Write one short, friendly daily health tip suitable for a general audience in Kenya. "
-                    "Keep it under 50 words."
-                )
-                try:
-                    tip_text = gemini_generate(prompt)
-                except Exception as ge:
-                    print("Gemini fallback failed:", ge)
-                    tip_text = random.choice(fallback_pool)
-            else:
-                print("Error generating personalized tip:", e)
-                tip_text = random.choice(fallback_pool)
-
-        if not (tip_text or "").strip():
-            tip_text = random.choice(fallback_pool)
-
-        try:
-            twilio_client.messages.create(
-                from_=os.getenv("TWILIO_WHATSAPP_FROM", "whatsapp:+14155238886"),
-                to=f"whatsapp:{user.phone}",
-                body=f"*Daily Health Tip*\n{tip_text}",
-            )
-
-            new_tip = HealthTip(
-                user_id=user.id,
-                tip_text=tip_text,
-                sent=True,
-                date_sent=datetime.utcnow(),
-            )
-            db.session.add(new_tip)
-            db.session.commit()
-
-            print("Sent tip to", user.phone)
-
-        except Exception as e:
-            db.session.rollback()
-            print("Failed to send tip to", user.phone, ":", e)
-
-    print("All health tips sent successfully.")
@@ -0,0 +1,126 @@
+# backend/app/cli.py
+"""
+Flask CLI commands (run with FLASK_APP=run.py flask <command>).
+Registered from create_app() via register_cli(app).
+"""
+
+import json
+
+import click
+
+from app.utils.scheduler import JOB_REGISTRY, run_job
+
+
+def register_cli(app):
+    @app.cli.command("run-job")
+    @click.argument("name", type=click.Choice(sorted(JOB_REGISTRY)))
+    def run_job_command(name):
+        """Run one registered scheduler job now (under its job lock)."""
+        ran, result = run_job(name)
+        click.echo(f"{name}: ran={ran} result={result}")
+
+    @app.cli.command("tips-dry-run")
+    @click.option("--users", default=0, help="Synthetic recipients (0 = real users table).")
+    @click.option("--concurrency", default=1, show_default=True)
+    @click.option("--llm-latency-ms", default=800.0, show_default=True)
+    @click.option("--llm-error-rate", default=0.0, show_default=True)
+    @click.option("--send-latency-ms", default=150.0, show_default=True)
+    @click.option("--send-error-rate", default=0.0, show_default=True)
+    @click.option("--jitter-ms", default=50.0, show_default=True)
+    @click.option("--real-llm", is_flag=True, help="Call the real LLM instead of the stub.")
+    def tips_dry_run_command(**options):
+        """Benchmark the daily tip broadcast against stub providers (sends nothing)."""
+        from app.helpers.broadcast_bench import run_broadcast_dry_run
+
+        report = run_broadcast_dry_run(**options)
+        click.echo(json.dumps(report, indent=2))
+
+    @app.cli.command("import-clinics")
+    @click.argument("path", type=click.Path(exists=True, dir_okay=False))
+    def import_clinics_command(path):
+        """Load clinics/hospitals from an OSM extract (.geojson or .osm.pbf)."""
+        from app.helpers.clinic_index import import_extract
+
+        count = import_extract(path)
+        click.echo(f"Imported {count} clinics.")
+
+    @app.cli.command("migrate-prescription-blobs")
+    @click.option("--batch-size", default=50, show_default=True)
+    @click.option("--limit", default=None, type=int, help="Stop after this many rows.")
+    def migrate_prescription_blobs_command(batch_size, limit):
+        """Move inline prescription images into the blob store (resumable)."""
+        from app.helpers.prescription_store import migrate_legacy_blobs
+
+        click.echo(json.dumps(migrate_legacy_blobs(batch_size, limit), indent=2))
+
+    @app.cli.command("bench-ocr")
+    @click.argument("fixture_dir", type=click.Path(exists=True, file_okay=False))
+    @click.option("--all-combos", is_flag=True, help="Every stage subset instead of the default ladder.")
+    def bench_ocr_command(fixture_dir, all_combos):
+        """OCR time and text quality per preprocessing stage combination."""
+        from app.helpers.ocr_bench import run_ocr_benchmark
+
+        click.echo(json.dumps(run_ocr_benchmark(fixture_dir, all_combos), indent=2))
+
+    @app.cli.command("bench-ocr-pool")
+    @click.argument("fixture_dir", type=click.Path(exists=True, file_okay=False))
+    @click.option("--workers", default=2, show_default=True)
+    @click.option("--concurrency", default=2, show_default=True)
+    @click.option("--rounds", default=3, show_default=True)
+    def bench_ocr_pool_command(fixture_dir, workers, concurrency, rounds):
+        """Subprocess-per-call OCR vs the persistent worker pool."""
+        from app.helpers.ocr_bench import run_ocr_pool_benchmark
+
+        click.echo(json.dumps(run_ocr_pool_benchmark(fixture_dir, workers, concurrency, rounds), indent=2))
+
+    @app.cli.command("bench-clinic-ranker")
+    @click.option("--points", default=50_000, show_default=True)
+    @click.option("--queries", default=1000, show_default=True)
+    @click.option("--k", default=5, show_default=True)
+    @click.option("--radius-m", default=5000, show_default=True)
+    def bench_clinic_ranker_command(points, queries, k, radius_m):
+        """Time nearest-K queries over synthetic clinics (no DB / network)."""
+        from app.helpers.clinic_ranker import benchmark
+
+        click.echo(json.dumps(benchmark(points, queries, k, radius_m), indent=2))
+
+    @app.cli.command("bench-http")
+    @click.option("--requests", "requests_count", default=200, show_default=True)
+    @click.option("--latency-ms", default=0.0, show_default=True, help="Stub server think time.")
+    def bench_http_command(requests_count, latency_ms):
+        """Cold vs pooled request latency against a local HTTP stub."""
+        from app.utils.http import benchmark
+
+        click.echo(json.dumps(benchmark(requests_count, latency_ms), indent=2))
+
+    @app.cli.command("rollup-backfill")
+    @click.option("--since", required=True, type=click.DateTime(formats=["%Y-%m-%d"]), help="First day (UTC).")
+    @click.option("--until", default=None, type=click.DateTime(formats=["%Y-%m-%d"]), help="Last day (default: yesterday).")
+    def rollup_backfill_command(since, until):
+        """Recompute daily_stats rows for a range of past days."""
+        from app.helpers.analytics_rollup import backfill
+
+        click.echo(json.dumps(backfill(since.date(), until.date() if until else None), indent=2))
+
+    @app.cli.command("bench-export")
+    @click.option("--rows", default=1_000_000, show_default=True)
+    @click.option("--database-url", default=None, help="Scratch database (default: temp SQLite file).")
+    @click.option("--batch-rows", default=None, type=int, help="yield_per batch (default EXPORT_BATCH_ROWS).")
+    @click.option("--skip-memory", is_flag=True, help="Skip the traced (slower) peak-memory pass.")
+    def bench_export_command(rows, database_url, batch_rows, skip_memory):
+        """Rows/s, first byte and peak memory: JSON list vs streamed NDJSON / CSV export."""
+        from app.helpers.export_bench import run_export_benchmark
+
+        click.echo(json.dumps(run_export_benchmark(rows, database_url, batch_rows, not skip_memory), indent=2))
+
+    @app.cli.command("bench-list")
+    @click.option("--prescriptions", default=50_000, show_default=True)
+    @click.option("--users", default=20_000, show_default=True)
+    @click.option("--page-size", default=1000, show_default=True)
+    @click.option("--legacy-fraction", default=0.05, show_default=True, help="Share of rows with inline image bytes.")
+    @click.option("--blob-kb", default=50, show_default=True)
+    def bench_list_command(prescriptions, users, page_size, legacy_fraction, blob_kb):
+        """Page latency and memory: full ORM entities vs column projection (scratch SQLite)."""
+        from app.helpers.list_bench import run_list_benchmark
+
+        click.echo(json.dumps(run_list_benchmark(prescriptions, users, page_size, legacy_fraction, blob_kb), indent=2))
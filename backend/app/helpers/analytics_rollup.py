@@ -0,0 +1,182 @@
+# backend/app/helpers/analytics_rollup.py
+"""
+Daily analytics rollup: one daily_stats row per (metric, day, dimension).
+
+  new_users      dimension = role
+  messages_in    user_message rows
+  messages_out   response_message rows
+  prescriptions
+  tips_sent      dimension = "health_tip" (daily WhatsApp tips) | "tip" (practitioner tips)
+  llm_tokens     dimension = "input" | "output" (response_message + prescriptions)
+
+Each day is recomputed from a [day, day + 1) range on the source tables'
+timestamp indexes, so the cost of a run depends on the days it touches,
+not on history size. The "daily_stats" watermark holds the contiguous range
+of final days. A run redoes the last ROLLUP_RECHECK_DAYS final days and
+everything after them through today (today's numbers stay partial until
+the next day's run).
+Registered in app.utils.scheduler.JOB_REGISTRY as "analytics_rollup";
+`flask rollup-backfill --since YYYY-MM-DD` fills older history.
+"""
+
+import os
+from datetime import date, datetime, time, timedelta
+
+from sqlalchemy import func
+
+from ..models import db, DailyStat, HealthTip, Prescription, ResponseMessage, RollupWatermark, Tip, User, UserMessage
+
+WATERMARK = "daily_stats"
+# First run without a watermark covers this many days; use backfill for more
+ROLLUP_INITIAL_DAYS = int(os.getenv("ROLLUP_INITIAL_DAYS", "30"))
+# Rows written late (clock skew, retries) still land if they are this recent
+ROLLUP_RECHECK_DAYS = int(os.getenv("ROLLUP_RECHECK_DAYS", "1"))
+
+
+def _count(col, start, end, *filters) -> int:
+    return db.session.query(func.count()).filter(col >= start, col < end, *filters).scalar() or 0
+
+
+def _to_int(value) -> int:
+    try:
+        return int(str(value).strip() or 0)
+    except (TypeError, ValueError):
+        return 0
+
+
+def _new_users(start, end):
+    return dict(
+        db.session.query(User.role, func.count())
+        .filter(User.created_at >= start, User.created_at < end)
+        .group_by(User.role)
+        .all()
+    )
+
+
+def _tips_sent(start, end):
+    return {
+        "health_tip": _count(HealthTip.date_sent, start, end, HealthTip.sent.is_(True)),
+        "tip": _count(Tip.sent_timestamp, start, end),
+    }
+
+
+def _llm_tokens(start, end):
+    # Token counts are stored as strings; summed here so junk values count as 0
+    totals = {"input": 0, "output": 0}
+    for model in (ResponseMessage, Prescription):
+        rows = (
+            db.session.query(model.input_token, model.output_token)
+            .filter(model.timestamp >= start, model.timestamp < end)
+            .filter((model.input_token.isnot(None)) | (model.output_token.isnot(None)))
+            .yield_per(1000)
+        )
+        for input_token, output_token in rows:
+            totals["input"] += _to_int(input_token)
+            totals["output"] += _to_int(output_token)
+    return totals
+
+
+# metric -> fn(start, end) -> {dimension: value}
+SOURCES = {
+    "new_users": _new_users,
+    "messages_in": lambda start, end: {"": _count(UserMessage.timestamp, start, end)},
+    "messages_out": lambda start, end: {"": _count(ResponseMessage.timestamp, start, end)},
+    "prescriptions": lambda start, end: {"": _count(Prescription.timestamp, start, end)},
+    "tips_sent": _tips_sent,
+    "llm_tokens": _llm_tokens,
+}
+
+
+def compute_day(day: date) -> dict:
+    """{(metric, dimension): value} for one UTC day, zero values dropped."""
+    start = datetime.combine(day, time.min)
+    end = start + timedelta(days=1)
+    values = {}
+    for metric, fn in SOURCES.items():
+        for dimension, value in fn(start, end).items():
+            if value:
+                values[(metric, dimension or "")] = int(value)
+    return values
+
+
+def rollup_day(day: date) -> int:
+    """Replaces the day's daily_stats rows (caller commits). Returns rows written."""
+    values = compute_day(day)
+    DailyStat.query.filter(DailyStat.day == day).delete(synchronize_session=False)
+    now = datetime.utcnow()
+    db.session.add_all([
+        DailyStat(day=day, metric=metric, dimension=dimension, value=value, updated_at=now)
+        for (metric, dimension), value in values.items()
+    ])
+    return len(values)
+
+
+def final_range():
+    """(first_day, last_day) covered by final daily_stats rows, or None before the first run."""
+    mark = db.session.get(RollupWatermark, WATERMARK)
+    return (mark.first_day, mark.last_day) if mark else None
+
+
+def _extend_watermark(first: date, last: date) -> bool:
+    """Merges [first, last] into the final range if it touches it. Returns False for a gap."""
+    mark = db.session.get(RollupWatermark, WATERMARK)
+    if mark is None:
+        db.session.add(RollupWatermark(name=WATERMARK, first_day=first, last_day=last, updated_at=datetime.utcnow()))
+        return True
+    if first > mark.last_day + timedelta(days=1) or last < mark.first_day - timedelta(days=1):
+        return False
+    mark.first_day = min(mark.first_day, first)
+    mark.last_day = max(mark.last_day, last)
+    mark.updated_at = datetime.utcnow()
+    return True
+
+
+def _rollup_range(first: date, last: date) -> dict:
+    days = rows = 0
+    day = first
+    while day <= last:
+        try:
+            rows += rollup_day(day)
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+        days += 1
+        day += timedelta(days=1)
+    return {"days": days, "rows": rows}
+
+
+def run_rollup() -> dict:
+    """Scheduled job: recompute the last final day(s) and everything after them through today."""
+    today = datetime.utcnow().date()
+    yesterday = today - timedelta(days=1)
+    final = final_range()
+    if final:
+        first = max(final[0], final[1] - timedelta(days=ROLLUP_RECHECK_DAYS - 1))
+    else:
+        first = today - timedelta(days=ROLLUP_INITIAL_DAYS)
+    first = min(first, today)
+
+    result = _rollup_range(first, today)
+    if first <= yesterday:
+        _extend_watermark(first, yesterday)
+        db.session.commit()
+
+    result.update(first=first.isoformat(), final_range=[str(d) for d in final_range() or ()])
+    print("Analytics rollup done:", result)
+    return result
+
+
+def backfill(since: date, until: date = None) -> dict:
+    """Recomputes [since, until] (default: through yesterday), one commit per day."""
+    yesterday = datetime.utcnow().date() - timedelta(days=1)
+    until = min(until or yesterday, yesterday)
+    if since > until:
+        return {"days": 0, "rows": 0}
+
+    result = _rollup_range(since, until)
+    if not _extend_watermark(since, until):
+        print(f"⚠️ Backfill {since}..{until} leaves a gap before the final range; watermark unchanged")
+    db.session.commit()
+    result.update(first=since.isoformat(), last=until.isoformat(), final_range=[str(d) for d in final_range() or ()])
+    return result
@@ -0,0 +1,135 @@
+# backend/app/helpers/broadcast_bench.py
+"""
+Dry-run / benchmark mode for the daily tip broadcast.
+
+Runs the real broadcast pipeline (helpers/healthtip_scheduler.broadcast_tips)
+against stub LLM and Twilio providers with configurable latency and error
+rates, rolls back every DB write, and reports throughput, per-stage latency
+percentiles and peak RSS. Used to size TIP_BROADCAST_CONCURRENCY before a
+campaign.
+
+Entry points: `flask tips-dry-run` and POST /tasks/send-daily-tips?dry_run=1
+"""
+
+import random
+import resource
+import sys
+import threading
+import time
+
+from .healthtip_agent import generate_health_tip
+from .healthtip_scheduler import broadcast_tips
+from ..models import db, User
+from ..utils.metrics import percentiles
+
+
+class StubLLM:
+    """Stands in for generate_health_tip(user)."""
+
+    def __init__(self, latency_ms: float = 800, jitter_ms: float = 200, error_rate: float = 0.0):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+
+    def __call__(self, user=None) -> str:
+        _sleep_ms(self.latency_ms, self.jitter_ms)
+        if random.random() < self.error_rate:
+            raise RuntimeError("stub LLM error (429 rate limit)")
+        return "Stub tip: drink water and rest well today."
+
+
+class StubSender:
+    """Stands in for the Twilio send(to_phone, body) callable."""
+
+    def __init__(self, latency_ms: float = 150, jitter_ms: float = 50, error_rate: float = 0.0):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, to_phone: str, body: str):
+        _sleep_ms(self.latency_ms, self.jitter_ms)
+        if random.random() < self.error_rate:
+            raise RuntimeError("stub Twilio error (HTTP 503)")
+        with self._lock:
+            self.count += 1
+
+
+def _sleep_ms(mean_ms: float, jitter_ms: float):
+    delay = max(0.0, mean_ms + random.uniform(-jitter_ms, jitter_ms))
+    if delay:
+        time.sleep(delay / 1000.0)
+
+
+def _peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS reports bytes
+    divisor = 1024 * 1024 if sys.platform == "darwin" else 1024
+    return round(peak / divisor, 1)
+
+
+def _synthetic_users(n: int):
+    # Transient User rows (never added to the session), so generate_health_tip
+    # gets a real User; their HealthTip rows have user_id=None and are rolled back.
+    return [
+        User(phone=f"+2547{i:08d}", email=f"dry-run-{i}@example.invalid", password="whatsapp_user", role="participant")
+        for i in range(n)
+    ]
+
+
+def run_broadcast_dry_run(
+    users: int = 0,
+    concurrency: int = 1,
+    llm_latency_ms: float = 800,
+    llm_error_rate: float = 0.0,
+    send_latency_ms: float = 150,
+    send_error_rate: float = 0.0,
+    jitter_ms: float = 50,
+    real_llm: bool = False,
+) -> dict:
+    """
+    users=0 runs over the real users table; users=N uses N synthetic recipients.
+    Nothing is sent and nothing is committed. Must be called in an app context.
+    """
+    recipients = _synthetic_users(users) if users else User.query.all()
+
+    llm = generate_health_tip if real_llm else StubLLM(llm_latency_ms, jitter_ms, llm_error_rate)
+    sender = StubSender(send_latency_ms, jitter_ms, send_error_rate)
+
+    stages = {"llm": [], "send": [], "db": []}
+    outcomes = {"ok": 0, "failed": 0}
+    lock = threading.Lock()
+
+    def on_result(timings, ok):
+        with lock:
+            for stage, seconds in timings.items():
+                stages[stage].append(seconds)
+            outcomes["ok" if ok else "failed"] += 1
+
+    started = time.perf_counter()
+    try:
+        broadcast_tips(
+            recipients,
+            llm,
+            sender,
+            concurrency=concurrency,
+            commit=False,
+            on_result=on_result,
+        )
+    finally:
+        db.session.rollback()
+    elapsed = time.perf_counter() - started
+
+    return {
+        "dry_run": True,
+        "recipients": len(recipients),
+        "concurrency": concurrency,
+        "llm": "real" if real_llm else "stub",
+        "sent": outcomes["ok"],
+        "failed": outcomes["failed"],
+        "elapsed_s": round(elapsed, 3),
+        "messages_per_s": round(outcomes["ok"] / elapsed, 2) if elapsed else None,
+        "latency_ms": {stage: percentiles(samples) for stage, samples in stages.items()},
+        "peak_rss_mb": _peak_rss_mb(),
+    }
@@ -0,0 +1,45 @@
+# backend/app/helpers/cleanup.py
+"""
+Housekeeping job: removes rows that are no longer useful.
+Registered in app.utils.scheduler.JOB_REGISTRY as "cleanup".
+"""
+
+from datetime import datetime, timedelta
+
+from . import clinic_cache, geocache
+from ..models import db, PasswordResetToken
+from ..models.models import AdminInvite
+
+# Keep expired / used tokens around for a while for abuse investigations
+RESET_TOKEN_RETENTION_DAYS = 7
+
+
+def cleanup_expired_records() -> dict:
+    now = datetime.utcnow()
+    cutoff = now - timedelta(days=RESET_TOKEN_RETENTION_DAYS)
+    counts = {}
+
+    try:
+        counts["password_reset_tokens"] = (
+            PasswordResetToken.query.filter(PasswordResetToken.expires_at < cutoff)
+            .delete(synchronize_session=False)
+        )
+
+        counts["admin_invites"] = (
+            AdminInvite.query.filter(
+                AdminInvite.used.is_(False),
+                AdminInvite.expires_at < cutoff,
+            ).delete(synchronize_session=False)
+        )
+
+        db.session.commit()
+
+        counts["geocode_cache"] = geocache.purge_expired()
+        counts["clinic_search_cache"] = clinic_cache.purge_expired()
+    except Exception as e:
+        db.session.rollback()
+        print("Cleanup failed:", e)
+        raise
+
+    print("Cleanup done:", counts)
+    return counts
@@ -0,0 +1,124 @@
+# backend/app/helpers/clinic_cache.py
+"""
+Cache of nearby-clinic records (name/address/lat/lng/...), bucketed by
+geohash cell.
+
+Clinics within a few km of a point rarely change, so every request whose
+point falls in the same cell (and asks for the same radius) shares one entry.
+Searches for a cell are run around the cell center, which keeps the cached
+answer identical for all of its neighbours. Records are cached rather than
+reply lines so distances can be measured from each caller's own point (a
+cell is ~1.2 x 0.6 km at precision 6).
+
+Layers: in-process LRU -> clinic_search_cache table (TTL).
+"""
+
+import json
+import os
+from datetime import datetime, timedelta
+
+from sqlalchemy.exc import IntegrityError
+
+from ..models import db, ClinicSearchCache
+from ..utils import geohash, metrics
+from ..utils.cache import LRUCache
+
+CLINIC_CACHE_TTL_HOURS = int(os.getenv("CLINIC_CACHE_TTL_HOURS", "168"))
+CLINIC_CACHE_PRECISION = int(os.getenv("CLINIC_CACHE_GEOHASH_PRECISION", "6"))
+CLINIC_CACHE_LRU_SIZE = int(os.getenv("CLINIC_CACHE_LRU_SIZE", "1024"))
+
+_LRU_TTL_SECONDS = 3600
+
+_lru = LRUCache(CLINIC_CACHE_LRU_SIZE)
+
+
+def cell_for(lat: float, lng: float) -> str:
+    return geohash.encode(lat, lng, CLINIC_CACHE_PRECISION)
+
+
+def cell_center(cell: str):
+    return geohash.decode(cell)
+
+
+def get_cached(cell: str, radius_m: int):
+    """Returns the cached clinic records for (cell, radius) or None."""
+    key = (cell, radius_m)
+
+    records = _lru.get(key)
+    if records is not None:
+        metrics.incr("clinic_cache.lru_hit")
+        return list(records)
+
+    try:
+        row = ClinicSearchCache.query.filter_by(geohash=cell, radius_m=radius_m).first()
+    except Exception as e:
+        db.session.rollback()
+        print("Clinic cache read failed:", e)
+        row = None
+
+    if row is not None and row.is_valid():
+        metrics.incr("clinic_cache.db_hit")
+        records = json.loads(row.records)
+        remaining = (row.expires_at - datetime.utcnow()).total_seconds()
+        _lru.set(key, tuple(records), ttl_seconds=min(_LRU_TTL_SECONDS, max(1, remaining)))
+        return records
+
+    metrics.incr("clinic_cache.miss")
+    return None
+
+
+def store(cell: str, radius_m: int, records, provider: str):
+    """Only non-empty result sets are cached."""
+    if not records:
+        return
+
+    _lru.set((cell, radius_m), tuple(records), ttl_seconds=_LRU_TTL_SECONDS)
+
+    now = datetime.utcnow()
+    try:
+        row = ClinicSearchCache.query.filter_by(geohash=cell, radius_m=radius_m).first()
+        if row is None:
+            row = ClinicSearchCache(geohash=cell, radius_m=radius_m)
+            db.session.add(row)
+
+        row.provider = provider
+        row.records = json.dumps(list(records), ensure_ascii=False)
+        row.created_at = now
+        row.expires_at = now + timedelta(hours=CLINIC_CACHE_TTL_HOURS)
+        db.session.commit()
+    except IntegrityError:
+        db.session.rollback()
+    except Exception as e:
+        db.session.rollback()
+        print("Clinic cache write failed:", e)
+
+
+def purge_expired() -> int:
+    """Delete expired rows (called from the cleanup job)."""
+    n = ClinicSearchCache.query.filter(ClinicSearchCache.expires_at < datetime.utcnow()).delete(
+        synchronize_session=False
+    )
+    db.session.commit()
+    return n
+
+
+def cache_stats() -> dict:
+    lru_hits = metrics.get_counter("clinic_cache.lru_hit")
+    db_hits = metrics.get_counter("clinic_cache.db_hit")
+    misses = metrics.get_counter("clinic_cache.miss")
+    lookups = lru_hits + db_hits + misses
+    return {
+        "lookups": lookups,
+        "lru_hits": lru_hits,
+        "db_hits": db_hits,
+        "misses": misses,
+        "hit_rate": metrics.hit_rate(lru_hits + db_hits, lookups),
+        "lru_size": len(_lru),
+        "provider_calls": {
+            "google_places": metrics.get_counter("provider.google_places"),
+            "overpass": metrics.get_counter("provider.overpass"),
+        },
+    }
+
+
+metrics.register_collector("clinic_cache", cache_stats)
@@ -0,0 +1,240 @@
+# backend/app/helpers/clinic_index.py
+"""
+Offline clinic index built from an OpenStreetMap extract.
+
+`flask import-clinics <file>` loads amenity=clinic|hospital features from a
+GeoJSON export or a .osm.pbf extract (the latter needs the optional `osmium`
+package) into the clinics table. local_clinic_records() answers nearest-N
+queries from the in-memory NumPy ranker (helpers/clinic_ranker.py), or with
+geohash prefix range scans over the indexed geohash column when the table is
+too large to hold in memory, so clinic search keeps working with no network.
+
+Set CLINIC_EXTRACT_PATH to have the scheduler re-import the file weekly.
+"""
+
+import json
+import math
+import os
+from datetime import datetime
+
+from . import clinic_ranker
+from .clinic_ranker import ring_radii
+from ..models import db, Clinic
+from ..utils import geohash, metrics
+
+CLINIC_AMENITIES = ("clinic", "hospital")
+GEOHASH_PRECISION = 9  # ~4.8 m cells; queries use shorter prefixes
+IMPORT_BATCH_SIZE = 1000
+
+EARTH_RADIUS_M = 6_371_000.0
+
+
+# -------------------------------
+# Import
+# -------------------------------
+def _centroid(coords):
+    """Mean of a (possibly nested) GeoJSON coordinate list -> (lng, lat)."""
+    flat = []
+
+    def walk(c):
+        if c and isinstance(c[0], (int, float)):
+            flat.append(c)
+        else:
+            for part in c:
+                walk(part)
+
+    walk(coords)
+    if not flat:
+        return None
+    return (
+        sum(p[0] for p in flat) / len(flat),
+        sum(p[1] for p in flat) / len(flat),
+    )
+
+
+def _address_from_tags(tags: dict) -> str:
+    if tags.get("addr:full"):
+        return tags["addr:full"]
+    parts = [tags.get("addr:street"), tags.get("addr:city") or tags.get("addr:suburb")]
+    return ", ".join(p for p in parts if p)
+
+
+def _row(osm_id, tags, lat, lng, now):
+    return {
+        "osm_id": osm_id[:32],
+        "name": (tags.get("name") or "Unnamed Clinic")[:255],
+        "amenity": tags.get("amenity"),
+        "address": _address_from_tags(tags)[:512] or None,
+        "lat": lat,
+        "lng": lng,
+        "geohash": geohash.encode(lat, lng, GEOHASH_PRECISION),
+        "imported_at": now,
+    }
+
+
+def _iter_geojson(path: str, now):
+    with open(path, encoding="utf-8") as fh:
+        data = json.load(fh)
+
+    for i, feature in enumerate(data.get("features", [])):
+        tags = feature.get("properties") or {}
+        if tags.get("amenity") not in CLINIC_AMENITIES:
+            continue
+
+        geometry = feature.get("geometry") or {}
+        point = _centroid(geometry.get("coordinates") or [])
+        if point is None:
+            continue
+
+        osm_id = str(feature.get("id") or tags.get("@id") or tags.get("osm_id") or f"geojson/{i}")
+        lng, lat = point
+        yield _row(osm_id, tags, lat, lng, now)
+
+
+def _iter_pbf(path: str, now):
+    try:
+        import osmium
+    except ImportError:
+        raise RuntimeError("Importing .pbf extracts needs the 'osmium' package (pip install osmium)")
+
+    rows = []
+
+    class Handler(osmium.SimpleHandler):
+        def node(self, n):
+            if n.tags.get("amenity") in CLINIC_AMENITIES and n.location.valid():
+                rows.append(_row(f"node/{n.id}", dict(n.tags), n.location.lat, n.location.lon, now))
+
+        def way(self, w):
+            if w.tags.get("amenity") not in CLINIC_AMENITIES:
+                return
+            pts = [(nd.lon, nd.lat) for nd in w.nodes if nd.location.valid()]
+            point = _centroid(pts)
+            if point is not None:
+                rows.append(_row(f"way/{w.id}", dict(w.tags), point[1], point[0], now))
+
+    Handler().apply_file(path, locations=True)
+    return rows
+
+
+def import_extract(path: str) -> int:
+    """
+    Replace the clinics table with the contents of an OSM extract.
+    Runs in one transaction, so readers keep seeing the old index until commit.
+    """
+    now = datetime.utcnow()
+    if path.endswith(".pbf"):
+        rows = _iter_pbf(path, now)
+    else:
+        rows = _iter_geojson(path, now)
+
+    count = 0
+    seen = set()
+    try:
+        Clinic.query.delete(synchronize_session=False)
+
+        batch = []
+        for row in rows:
+            if row["osm_id"] in seen:
+                continue
+            seen.add(row["osm_id"])
+            batch.append(row)
+            if len(batch) >= IMPORT_BATCH_SIZE:
+                db.session.bulk_insert_mappings(Clinic, batch)
+                count += len(batch)
+                batch = []
+        if batch:
+            db.session.bulk_insert_mappings(Clinic, batch)
+            count += len(batch)
+
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+
+    clinic_ranker.invalidate()
+    print(f"Imported {count} clinics from {path}")
+    return count
+
+
+def reimport_from_env():
+    """Scheduler job: re-import CLINIC_EXTRACT_PATH if configured."""
+    path = os.getenv("CLINIC_EXTRACT_PATH")
+    if not path:
+        print("CLINIC_EXTRACT_PATH not set; skipping clinic re-import.")
+        return 0
+    return import_extract(path)
+
+
+# -------------------------------
+# Queries
+# -------------------------------
+def haversine_m(lat1, lng1, lat2, lng2) -> float:
+    p1, p2 = math.radians(lat1), math.radians(lat2)
+    dp = p2 - p1
+    dl = math.radians(lng2 - lng1)
+    a = math.sin(dp / 2) ** 2 + math.cos(p1) * math.cos(p2) * math.sin(dl / 2) ** 2
+    return 2 * EARTH_RADIUS_M * math.asin(math.sqrt(a))
+
+
+def _prefix_precision(lat: float, radius_m: int) -> int:
+    """Longest prefix whose cells are at least radius_m on each side."""
+    for precision in range(GEOHASH_PRECISION, 0, -1):
+        height, width = geohash.cell_size_m(lat, precision)
+        if height >= radius_m and width >= radius_m:
+            return precision
+    return 1
+
+
+def _candidates(lat: float, lng: float, radius_m: int):
+    """Clinics in the 3x3 block of cells around the point (covers radius_m)."""
+    center = geohash.encode(lat, lng, _prefix_precision(lat, radius_m))
+    conditions = []
+    for prefix in [center] + geohash.neighbors(center):
+        upper = geohash.next_prefix(prefix)
+        cond = Clinic.geohash >= prefix
+        if upper is not None:
+            cond = db.and_(cond, Clinic.geohash < upper)
+        conditions.append(cond)
+
+    return (
+        db.session.query(Clinic.name, Clinic.address, Clinic.lat, Clinic.lng)
+        .filter(db.or_(*conditions))
+        .all()
+    )
+
+
+def nearest_clinics(lat: float, lng: float, limit: int = 5, radius_m: int = 5000):
+    """Nearest `limit` clinics within radius_m -> [(distance_m, name, address, lat, lng)]"""
+    metrics.incr("provider.local_index")
+    found = []
+    for name, address, c_lat, c_lng in _candidates(lat, lng, radius_m):
+        d = haversine_m(lat, lng, c_lat, c_lng)
+        if d <= radius_m:
+            found.append((d, name, address, c_lat, c_lng))
+    found.sort(key=lambda r: r[0])
+    return found[:limit]
+
+
+def local_clinic_records(lat: float, lng: float, radius_m: int = 5000, limit: int = 5):
+    """
+    Nearest clinics from the local index as clinic records (name/address/
+    lat/lng), widening the radius in rings (clinic_ranker.ring_radii) when
+    the first ring is empty.
+    Uses the in-memory NumPy ranker; falls back to geohash scans in the DB
+    when the table is too large to hold in memory.
+    """
+    ranker = clinic_ranker.get_ranker()
+    if ranker is not None:
+        metrics.incr("provider.local_index")
+        results, _ring = ranker.nearest(lat, lng, k=limit, radius_m=radius_m)
+        return [rec for _d, rec in results]
+
+    for ring in ring_radii(radius_m):
+        found = nearest_clinics(lat, lng, limit=limit, radius_m=ring)
+        if found:
+            break
+
+    return [
+        {"name": name, "address": address, "lat": c_lat, "lng": c_lng}
+        for _d, name, address, c_lat, c_lng in found
+    ]
@@ -0,0 +1,247 @@
+# backend/app/helpers/clinic_ranker.py
+"""
+Vectorized nearest-clinic ranking.
+
+ClinicRanker keeps clinic coordinates in NumPy arrays sorted by latitude.
+A query slices the latitude band that can possibly be within the largest
+search ring (np.searchsorted), computes the haversine term for that band in
+one pass, and picks the nearest K with argpartition. Ring expansion (5 km ->
+10 km -> 20 km -> ...) reuses the same pass, so a sparse area never costs
+another query or network call.
+
+Ranking works on the haversine "a" term, which is monotonic in distance;
+arcsin/sqrt only run for the K winners.
+"""
+
+import math
+import os
+import threading
+import time
+from urllib.parse import quote_plus
+
+import numpy as np
+
+EARTH_RADIUS_M = 6_371_000.0
+
+# Ring expansion: base radius times each factor, capped at CLINIC_MAX_RADIUS_M
+RING_FACTORS = (1, 2, 4, 8)
+CLINIC_MAX_RADIUS_M = int(os.getenv("CLINIC_MAX_RADIUS_M", "40000"))
+
+
+def _a_threshold(radius_m: float) -> float:
+    return math.sin(radius_m / (2 * EARTH_RADIUS_M)) ** 2
+
+
+def ring_radii(radius_m: int):
+    radii = [min(radius_m * f, CLINIC_MAX_RADIUS_M) for f in RING_FACTORS]
+    return sorted(set(r for r in radii if r >= radius_m)) or [radius_m]
+
+
+def distance_label(distance_m: float) -> str:
+    if distance_m < 1000:
+        return f"📏 ~{int(round(distance_m, -1))} m away"
+    return f"📏 ~{distance_m / 1000:.1f} km away"
+
+
+def render_clinic(rec: dict, distance_m: float = None) -> str:
+    """WhatsApp reply block for one clinic record (name/address/rating/maps_url)."""
+    lines = [f"🏥 {rec.get('name') or 'Unnamed Clinic'}"]
+    if rec.get("rating") is not None:
+        lines.append(f"⭐ {rec['rating']}")
+    lines.append(f"📍 {rec.get('address') or 'Address not available'}")
+    if distance_m is not None:
+        lines.append(distance_label(distance_m))
+    maps_url = rec.get("maps_url")
+    if not maps_url and rec.get("lat") is not None and rec.get("lng") is not None:
+        coords = f"{rec['lat']},{rec['lng']}"
+        maps_url = f"https://www.google.com/maps/search/?api=1&query={quote_plus(coords)}"
+    if maps_url:
+        lines.append(f"🗺️ {maps_url}")
+    return "\n".join(lines)
+
+
+class ClinicRanker:
+    def __init__(self, lats, lngs, payloads):
+        order = np.argsort(np.asarray(lats, dtype=np.float64), kind="stable")
+        self.lat_deg = np.asarray(lats, dtype=np.float64)[order]
+        self.lat = np.radians(self.lat_deg)
+        self.lng = np.radians(np.asarray(lngs, dtype=np.float64)[order])
+        self.cos_lat = np.cos(self.lat)
+        self.payloads = [payloads[i] for i in order]
+
+    def __len__(self):
+        return len(self.payloads)
+
+    def nearest(self, lat: float, lng: float, k: int = 5, radius_m: int = 5000, min_results: int = 1):
+        """
+        Returns (results, ring_radius_m). results = [(distance_m, payload), ...]
+        nearest first, from the smallest ring holding at least min_results.
+        """
+        if not len(self):
+            return [], radius_m
+
+        radii = ring_radii(radius_m)
+        max_r = radii[-1]
+
+        # Latitude band that can hold anything within max_r
+        band = math.degrees(max_r / EARTH_RADIUS_M)
+        lo = np.searchsorted(self.lat_deg, lat - band, side="left")
+        hi = np.searchsorted(self.lat_deg, lat + band, side="right")
+        if lo >= hi:
+            return [], radius_m
+
+        a = _haversine_a(lat, lng, self.lat[lo:hi], self.lng[lo:hi], self.cos_lat[lo:hi])
+
+        chosen_r = max_r
+        for r in radii:
+            if np.count_nonzero(a <= _a_threshold(r)) >= min_results:
+                chosen_r = r
+                break
+
+        inside = np.flatnonzero(a <= _a_threshold(chosen_r))
+        if inside.size == 0:
+            return [], chosen_r
+
+        if inside.size > k:
+            top = inside[np.argpartition(a[inside], k - 1)[:k]]
+        else:
+            top = inside
+        top = top[np.argsort(a[top], kind="stable")]
+
+        dist = 2 * EARTH_RADIUS_M * np.arcsin(np.sqrt(a[top]))
+        return [(float(d), self.payloads[lo + int(i)]) for d, i in zip(dist, top)], chosen_r
+
+
+def _haversine_a(lat: float, lng: float, lat_rad, lng_rad, cos_lat):
+    lat_r = math.radians(lat)
+    s_lat = np.sin((lat_rad - lat_r) * 0.5)
+    s_lng = np.sin((lng_rad - math.radians(lng)) * 0.5)
+    return s_lat * s_lat + math.cos(lat_r) * cos_lat * s_lng * s_lng
+
+
+def rank_records(lat: float, lng: float, records, k: int):
+    """
+    Sort a provider's result list (dicts with lat/lng) by distance from the
+    point. Returns [(distance_m or None, record)]; records without
+    coordinates keep their order after the located ones.
+    """
+    located = [r for r in records if r.get("lat") is not None and r.get("lng") is not None]
+    unlocated = [r for r in records if r.get("lat") is None or r.get("lng") is None]
+    ranked = []
+
+    if located:
+        lat_rad = np.radians(np.array([r["lat"] for r in located], dtype=np.float64))
+        lng_rad = np.radians(np.array([r["lng"] for r in located], dtype=np.float64))
+        a = _haversine_a(lat, lng, lat_rad, lng_rad, np.cos(lat_rad))
+        order = np.argsort(a, kind="stable")[:k]
+        dist = 2 * EARTH_RADIUS_M * np.arcsin(np.sqrt(np.minimum(a[order], 1.0)))
+        ranked = [(float(d), located[int(i)]) for d, i in zip(dist, order)]
+
+    ranked += [(None, r) for r in unlocated]
+    return ranked[:k]
+
+
+# -------------------------------
+# Process-wide ranker over the clinics table
+# -------------------------------
+# Above this many rows the index stays in the DB (geohash scan) instead of RAM
+CLINIC_RANKER_MAX_ROWS = int(os.getenv("CLINIC_RANKER_MAX_ROWS", "500000"))
+_RELOAD_CHECK_SECONDS = 300
+
+_ranker = None
+_ranker_version = None
+_checked_at = 0.0
+_ranker_lock = threading.Lock()
+
+
+def _table_version():
+    from ..models import db, Clinic
+
+    return db.session.query(db.func.count(Clinic.id), db.func.max(Clinic.imported_at)).one()
+
+
+def _load():
+    from ..models import db, Clinic
+
+    rows = db.session.query(Clinic.name, Clinic.address, Clinic.lat, Clinic.lng).all()
+    return ClinicRanker(
+        [r.lat for r in rows],
+        [r.lng for r in rows],
+        [{"name": r.name, "address": r.address, "lat": r.lat, "lng": r.lng} for r in rows],
+    )
+
+
+def get_ranker():
+    """
+    The in-memory ranker for the clinics table, reloaded when the table
+    changes (checked every few minutes). None if the table is too big.
+    Must be called inside an app context.
+    """
+    global _ranker, _ranker_version, _checked_at
+
+    # _ranker_version is set by every check, so a "too big" result (None)
+    # is cached for _RELOAD_CHECK_SECONDS just like a loaded ranker
+    now = time.monotonic()
+    if _ranker_version is not None and now - _checked_at < _RELOAD_CHECK_SECONDS:
+        return _ranker
+
+    with _ranker_lock:
+        if _ranker_version is not None and now - _checked_at < _RELOAD_CHECK_SECONDS:
+            return _ranker
+
+        version = _table_version()
+        _checked_at = now
+        if version[0] > CLINIC_RANKER_MAX_ROWS:
+            _ranker, _ranker_version = None, version
+            return None
+
+        if _ranker is None or version != _ranker_version:
+            t0 = time.perf_counter()
+            _ranker = _load()
+            _ranker_version = version
+            print(f"Clinic ranker loaded {len(_ranker)} clinics in {time.perf_counter() - t0:.2f}s")
+        return _ranker
+
+
+def invalidate():
+    global _checked_at
+    _checked_at = 0.0
+
+
+# -------------------------------
+# Benchmark
+# -------------------------------
+def benchmark(points: int = 50_000, queries: int = 1000, k: int = 5, radius_m: int = 5000, seed: int = 42) -> dict:
+    """Synthetic clinics spread over Kenya's bounding box; no DB needed."""
+    rng = np.random.default_rng(seed)
+    lats = rng.uniform(-4.7, 5.0, points)
+    lngs = rng.uniform(33.9, 41.9, points)
+
+    t0 = time.perf_counter()
+    ranker = ClinicRanker(lats, lngs, list(range(points)))
+    build_s = time.perf_counter() - t0
+
+    q_lats = rng.uniform(-4.7, 5.0, queries)
+    q_lngs = rng.uniform(33.9, 41.9, queries)
+    timings = []
+    for qlat, qlng in zip(q_lats, q_lngs):
+        t = time.perf_counter()
+        ranker.nearest(float(qlat), float(qlng), k=k, radius_m=radius_m)
+        timings.append(time.perf_counter() - t)
+
+    timings.sort()
+
+    def pct(p):
+        return round(timings[min(len(timings) - 1, int(p / 100 * len(timings)))] * 1000, 4)
+
+    return {
+        "points": points,
+        "queries": queries,
+        "build_ms": round(build_s * 1000, 2),
+        "query_ms": {
+            "mean": round(sum(timings) / len(timings) * 1000, 4),
+            "p50": pct(50),
+            "p95": pct(95),
+            "p99": pct(99),
+        },
+    }
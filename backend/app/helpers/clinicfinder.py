@@ -1,13 +1,40 @@
 # backend/app/helpers/clinicfinder.py
 import os
-import requests
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from urllib.parse import quote_plus
+
 from dotenv import load_dotenv
 
+from . import clinic_cache, clinic_index, gazetteer, geocache
+from .clinic_ranker import rank_records, render_clinic
+from ..utils import http, metrics
+
 # Load env (preferably your app/__init__.py loads .env once; this is fine for now)
 load_dotenv()
 
 GOOGLE_API_KEY = os.getenv("GOOGLE_MAPS_API_KEY")
+OSM_HEADERS = {"User-Agent": "SheCareBot/1.0 (contact: support@shecare.ai)"}
+
+# Clinics shown per reply (plus the "Showing clinics near" header line)
+CLINIC_RESULT_LIMIT = 5
+
+# CLINIC_LOCAL_FIRST=1 answers from the offline OSM index before calling Google
+CLINIC_LOCAL_FIRST = os.getenv("CLINIC_LOCAL_FIRST") == "1"
+
+# CLINIC_PARALLEL=1 queries providers concurrently; the first acceptable
+# answer wins and the whole search is bounded by CLINIC_DEADLINE_S.
+CLINIC_PARALLEL = os.getenv("CLINIC_PARALLEL") == "1"
+CLINIC_DEADLINE_S = float(os.getenv("CLINIC_DEADLINE_S", "8"))
+# Nominatim (1 request/s usage policy) is only asked when Google has not
+# answered within this many seconds, or has failed
+CLINIC_NOMINATIM_HEDGE_S = float(os.getenv("CLINIC_NOMINATIM_HEDGE_S", "1.5"))
+# Calls in flight per provider, stragglers included; further calls skip it
+CLINIC_PROVIDER_WORKERS = int(os.getenv("CLINIC_PROVIDER_WORKERS", "2"))
+
+_provider_pools = {}  # provider name -> (executor, free slots)
+_provider_pools_lock = threading.Lock()
 
 
 def _clean_query(q: str) -> str:
@@ -21,7 +48,8 @@ def _google_geocode(location_query: str):
     url = "https://maps.googleapis.com/maps/api/geocode/json"
     params = {"address": location_query, "key": GOOGLE_API_KEY}
 
-    r = requests.get(url, params=params, timeout=10)
+    metrics.incr("provider.google_geocode")
+    r = http.get(url, params=params, timeout=10)
     data = r.json()
 
     if data.get("status") != "OK" or not data.get("results"):
@@ -35,7 +63,7 @@ def _google_geocode(location_query: str):
 def _google_nearby_clinics(lat: float, lng: float, radius_m: int = 5000):
     """
     Uses Places Nearby Search for more accurate results than textsearch.
-    Returns list of formatted strings.
+    Returns list of clinic records (see clinic_ranker.render_clinic).
     """
     url = "https://maps.googleapis.com/maps/api/place/nearbysearch/json"
 
@@ -49,7 +77,8 @@ def _google_nearby_clinics(lat: float, lng: float, radius_m: int = 5000):
         "key": GOOGLE_API_KEY,
     }
 
-    r = requests.get(url, params=params, timeout=10)
+    metrics.incr("provider.google_places")
+    r = http.get(url, params=params, timeout=10)
     data = r.json()
 
     status = data.get("status")
@@ -69,49 +98,62 @@ def _google_nearby_clinics(lat: float, lng: float, radius_m: int = 5000):
         else:
             maps_url = f"https://www.google.com/maps/search/?api=1&query={quote_plus(name + ' ' + vicinity)}"
 
-        rating = place.get("rating")
-        rating_line = f"⭐ {rating}\n" if rating is not None else ""
+        loc = (place.get("geometry") or {}).get("location") or {}
 
-        clinics.append(f"🏥 {name}\n{rating_line}📍 {vicinity}\n🗺️ {maps_url}")
+        clinics.append({
+            "name": name,
+            "address": vicinity,
+            "rating": place.get("rating"),
+            "maps_url": maps_url,
+            "lat": loc.get("lat"),
+            "lng": loc.get("lng"),
+        })
 
     return clinics
 
 
-def _osm_fallback(location_query: str):
+def _nominatim_geocode(location_query: str):
     """
-    Your existing OSM flow, kept as a fallback.
+    Returns (lat, lng, formatted_address) or (None, None, None)
     """
-    clinics = []
     geocode_url = "https://nominatim.openstreetmap.org/search"
-    headers = {"User-Agent": "SheCareBot/1.0 (contact: support@shecare.ai)"}
     geocode_params = {"q": location_query, "format": "json", "limit": 1}
 
-    geo_response = requests.get(geocode_url, params=geocode_params, headers=headers, timeout=10)
+    metrics.incr("provider.nominatim")
+    geo_response = http.get(geocode_url, params=geocode_params, headers=OSM_HEADERS, timeout=10)
     try:
         geo_data = geo_response.json()
     except ValueError:
         geo_data = []
 
     if not geo_data:
-        return []
+        return None, None, None
+
+    best = geo_data[0]
+    return float(best["lat"]), float(best["lon"]), best.get("display_name")
 
-    lat = geo_data[0]["lat"]
-    lon = geo_data[0]["lon"]
 
+def _overpass_clinics(lat: float, lon: float, radius_m: int = 5000):
+    """
+    Clinics/hospitals from OpenStreetMap (Overpass) around a point.
+    Returns list of clinic records (see clinic_ranker.render_clinic).
+    """
+    clinics = []
     overpass_url = "https://overpass-api.de/api/interpreter"
     overpass_query = f"""
     [out:json];
     (
-      node["amenity"="clinic"](around:5000,{lat},{lon});
-      node["amenity"="hospital"](around:5000,{lat},{lon});
+      node["amenity"="clinic"](around:{radius_m},{lat},{lon});
+      node["amenity"="hospital"](around:{radius_m},{lat},{lon});
     );
     out;
     """
 
-    overpass_response = requests.get(
+    metrics.incr("provider.overpass")
+    overpass_response = http.get(
         overpass_url,
         params={"data": overpass_query},
-        headers=headers,
+        headers=OSM_HEADERS,
         timeout=15
     )
 
@@ -123,49 +165,317 @@ def _osm_fallback(location_query: str):
     for element in results.get("elements", []):
         name = element.get("tags", {}).get("name", "Unnamed Clinic")
         address = element.get("tags", {}).get("addr:full") or element.get("tags", {}).get("addr:street", "")
-        clinics.append(f"🏥 {name}\n📍 {address}")
+        clinics.append({
+            "name": name,
+            "address": address,
+            "lat": element.get("lat"),
+            "lng": element.get("lon"),
+        })
 
     return clinics
 
 
-def find_nearby_clinics(location_query: str):
+def _timed_call(name, fn, *args):
+    t0 = time.perf_counter()
+    try:
+        return fn(*args)
+    finally:
+        metrics.observe(f"clinic_provider.{name}", time.perf_counter() - t0)
+
+
+def _provider_slots(name: str):
+    with _provider_pools_lock:
+        entry = _provider_pools.get(name)
+        if entry is None:
+            entry = _provider_pools[name] = (
+                ThreadPoolExecutor(max_workers=CLINIC_PROVIDER_WORKERS, thread_name_prefix=f"clinic-{name}"),
+                threading.BoundedSemaphore(CLINIC_PROVIDER_WORKERS),
+            )
+    return entry
+
+
+def _submit(name: str, fn, args):
+    """Future for fn(*args) on the provider's own pool, or None if all its slots are busy."""
+    pool, slots = _provider_slots(name)
+    if not slots.acquire(blocking=False):
+        metrics.incr(f"clinic_provider.busy.{name}")
+        return None
+
+    def call():
+        try:
+            return _timed_call(name, fn, *args)
+        finally:
+            slots.release()
+
+    try:
+        return pool.submit(call)
+    except Exception:
+        slots.release()
+        raise
+
+
+def _race(tasks, deadline: float, accept):
     """
-    Google-first clinic search:
-    1) Geocode the user's location text
-    2) Places Nearby Search around that point
-    3) Optional fallback to OSM if Google fails/unavailable
+    Runs provider calls concurrently (HTTP only: no DB / app context).
+
+    tasks: [(name, fn, args, hedge_s)]; accept(result) -> bool. A task with
+    hedge_s starts that many seconds in, or as soon as nothing else is
+    running, and never once a winner is in.
+    Returns (winner_name, result, outcomes) where outcomes maps each provider
+    to "ok" | "error" | "busy" | "pending". Each provider has its own small
+    pool, so its stragglers (which keep running after the winner returns,
+    latency still recorded) can only ever hold that provider's slots.
+    """
+    t0 = time.monotonic()
+    waiting = sorted(tasks, key=lambda t: t[3] or 0.0)
+    running = {}
+    outcomes = {name: "pending" for name, _fn, _args, _hedge in tasks}
+
+    while True:
+        now = time.monotonic()
+        while waiting and (not running or now - t0 >= (waiting[0][3] or 0.0)):
+            name, fn, args, _hedge = waiting.pop(0)
+            f = _submit(name, fn, args)
+            if f is None:
+                outcomes[name] = "busy"
+            else:
+                running[f] = name
+
+        if not running:
+            return None, None, outcomes
+
+        wake = deadline
+        if waiting:
+            wake = min(deadline, t0 + (waiting[0][3] or 0.0))
+        done, _pending = wait(list(running), timeout=max(0.0, wake - time.monotonic()), return_when=FIRST_COMPLETED)
+
+        if not done and time.monotonic() >= deadline:
+            metrics.incr("clinic_provider.deadline_exceeded")
+            print("⚠️ Clinic provider deadline exceeded; pending:", [n for n, o in outcomes.items() if o == "pending"])
+            return None, None, outcomes
+
+        for f in done:
+            name = running.pop(f)
+            try:
+                result = f.result()
+            except Exception as e:
+                outcomes[name] = "error"
+                metrics.incr(f"clinic_provider.error.{name}")
+                print(f"⚠️ {name} failed:", e)
+                continue
+
+            outcomes[name] = "ok"
+            if accept(result):
+                metrics.incr(f"clinic_provider.win.{name}")
+                return name, result, outcomes
+
+
+def _geocode_parallel(location_query: str, deadline: float):
+    tasks = [("nominatim_geocode", _nominatim_geocode, (location_query,), None)]
+    if GOOGLE_API_KEY:
+        tasks = [
+            ("google_geocode", _google_geocode, (location_query,), None),
+            ("nominatim_geocode", _nominatim_geocode, (location_query,), CLINIC_NOMINATIM_HEDGE_S),
+        ]
+
+    winner, result, outcomes = _race(tasks, deadline, lambda r: r[0] is not None and r[1] is not None)
+    if winner:
+        lat, lng, formatted = result
+        provider = "google" if winner == "google_geocode" else "nominatim"
+        geocache.store(location_query, lat, lng, formatted, provider)
+        return lat, lng, formatted, provider
+
+    # Only a clean "no result" from every provider is cached as a negative
+    if all(o == "ok" for o in outcomes.values()):
+        geocache.store(location_query, None, None, None, "none")
+    return None
+
+
+def geocode_location(location_query: str, deadline: float = None):
+    """
+    Offline gazetteer -> cached geocode (LRU -> geocode_cache table) ->
+    Google -> Nominatim.
+    Returns (lat, lng, formatted_address, provider) or None if unresolvable.
+    In CLINIC_PARALLEL mode Nominatim is hedged: it starts only if Google has
+    failed or not answered within CLINIC_NOMINATIM_HEDGE_S, and the first
+    answer before `deadline` wins.
+    """
+    place = gazetteer.resolve(location_query)
+    if place is not None:
+        return (*place, "gazetteer")
+
+    hit, cached = geocache.get_cached(location_query)
+    if hit:
+        return cached
+
+    if CLINIC_PARALLEL:
+        return _geocode_parallel(location_query, deadline or time.monotonic() + CLINIC_DEADLINE_S)
+
+    if GOOGLE_API_KEY:
+        try:
+            lat, lng, formatted = _google_geocode(location_query)
+        except Exception as e:
+            print("⚠️ Google geocode failed:", e)
+            lat = lng = formatted = None
+        if lat is not None and lng is not None:
+            geocache.store(location_query, lat, lng, formatted, "google")
+            return lat, lng, formatted, "google"
+
+    # Errors here propagate (and are not cached as a negative)
+    lat, lng, formatted = _nominatim_geocode(location_query)
+    if lat is None or lng is None:
+        geocache.store(location_query, None, None, None, "none")
+        return None
+
+    geocache.store(location_query, lat, lng, formatted, "nominatim")
+    return lat, lng, formatted, "nominatim"
+
+
+def _rendered(lat: float, lng: float, records):
+    """Nearest CLINIC_RESULT_LIMIT provider records, rendered with distance labels."""
+    return [
+        render_clinic(rec, distance_m)
+        for distance_m, rec in rank_records(lat, lng, records, CLINIC_RESULT_LIMIT)
+    ]
+
+
+def _nearest(lat: float, lng: float, records):
+    """Nearest CLINIC_RESULT_LIMIT provider records (what the cell cache keeps)."""
+    return [rec for _d, rec in rank_records(lat, lng, records, CLINIC_RESULT_LIMIT)]
+
+
+def _local_index_records(lat: float, lng: float, radius_m: int):
+    try:
+        return clinic_index.local_clinic_records(lat, lng, radius_m=radius_m, limit=CLINIC_RESULT_LIMIT)
+    except Exception as e:
+        print("⚠️ Local clinic index failed:", e)
+        return []
+
+
+def _search_parallel(lat: float, lng: float, radius_m: int, deadline: float):
+    """Google Places and Overpass race; the local index answers if both come up empty."""
+    tasks = [("overpass", _overpass_clinics, (lat, lng, radius_m), None)]
+    if GOOGLE_API_KEY:
+        tasks.insert(0, ("google_places", _google_nearby_clinics, (lat, lng, radius_m), None))
+
+    winner, records, _ = _race(tasks, deadline, bool)
+    if winner:
+        return _nearest(lat, lng, records), "google" if winner == "google_places" else "overpass"
+
+    clinics = _local_index_records(lat, lng, radius_m)
+    return clinics, "local" if clinics else None
+
+
+def _search_providers(lat: float, lng: float, radius_m: int, deadline: float = None):
+    """
+    Returns (records, provider): Google Places, then the offline OSM index
+    (helpers/clinic_index.py), then a live Overpass query.
     """
+    if CLINIC_LOCAL_FIRST:
+        clinics = _local_index_records(lat, lng, radius_m)
+        if clinics:
+            return clinics, "local"
+
+    if CLINIC_PARALLEL:
+        return _search_parallel(lat, lng, radius_m, deadline or time.monotonic() + CLINIC_DEADLINE_S)
+
+    # --- Google (recommended primary) ---
+    if GOOGLE_API_KEY:
+        try:
+            clinics = _google_nearby_clinics(lat, lng, radius_m=radius_m)
+            if clinics:
+                return _nearest(lat, lng, clinics), "google"
+        except Exception as e:
+            print("⚠️ Google Places failed:", e)
+
+    # --- Fallback to OSM only if Google didn’t return anything ---
+    if not CLINIC_LOCAL_FIRST:
+        clinics = _local_index_records(lat, lng, radius_m)
+        if clinics:
+            return clinics, "local"
+
     try:
-        q = _clean_query(location_query)
-        print(f"🔎 Searching for clinics near: {q}")
+        return _nearest(lat, lng, _overpass_clinics(lat, lng, radius_m=radius_m)), "overpass"
+    except Exception as e:
+        print("⚠️ OSM fallback failed:", e)
+        return [], None
 
-        if not q or len(q) < 2:
-            return ["⚠️ Please provide a valid location name."]
 
-        clinics = []
+def nearby_clinic_lines(lat: float, lng: float, radius_m: int = 5000, deadline: float = None):
+    """
+    Rendered clinic lines near a point. Clinic records come from the geohash
+    cell cache when possible (see helpers/clinic_cache.py); cache misses
+    search around the cell center so every point in the cell shares one
+    entry. Order and distance labels are always worked out from (lat, lng).
+    """
+    cell = clinic_cache.cell_for(lat, lng)
 
-        # --- Google (recommended primary) ---
-        if GOOGLE_API_KEY:
-            lat, lng, formatted = _google_geocode(q)
-            if lat is not None and lng is not None:
-                clinics = _google_nearby_clinics(lat, lng, radius_m=5000)
+    records = clinic_cache.get_cached(cell, radius_m)
+    if records is None:
+        center_lat, center_lng = clinic_cache.cell_center(cell)
+        records, provider = _search_providers(center_lat, center_lng, radius_m, deadline)
+        clinic_cache.store(cell, radius_m, records, provider)
 
-                # Optional: prefix with the resolved area so user trusts the match
-                if clinics and formatted:
-                    clinics.insert(0, f"📍 Showing clinics near: {formatted}")
+    return _rendered(lat, lng, records)
+
+
+def _parse_coords(lat, lng):
+    """(lat, lng) as floats from a shared location pin, or None if invalid."""
+    try:
+        lat, lng = float(lat), float(lng)
+    except (TypeError, ValueError):
+        return None
+    if not (-90 <= lat <= 90 and -180 <= lng <= 180):
+        return None
+    return lat, lng
+
+
+def find_nearby_clinics(location_query: str = None, lat=None, lng=None, label: str = None):
+    """
+    Google-first clinic search:
+    1) Geocode the user's location text (cached, see helpers/geocache.py),
+       or use the coordinates of a shared WhatsApp location pin directly
+    2) Nearby clinics for that point's geohash cell (cached), from
+       Places Nearby Search with OSM (Overpass) as fallback
+    """
+    try:
+        # Overall budget for geocode + search (used in CLINIC_PARALLEL mode)
+        deadline = time.monotonic() + CLINIC_DEADLINE_S
+
+        coords = _parse_coords(lat, lng) if lat is not None or lng is not None else None
+        if coords is not None:
+            print(f"🔎 Searching for clinics near shared pin: {coords[0]:.5f},{coords[1]:.5f}")
+            lat, lng = coords
+            formatted = _clean_query(label or "") or "your shared location"
+        else:
+            q = _clean_query(location_query or "")
+            print(f"🔎 Searching for clinics near: {q}")
+
+            if not q or len(q) < 2:
+                return ["⚠️ Please provide a valid location name."]
 
-        # --- Fallback to OSM only if Google didn’t return anything ---
-        if not clinics:
             try:
-                clinics = _osm_fallback(q)
+                geo = geocode_location(q, deadline)
             except Exception as e:
-                print("⚠️ OSM fallback failed:", e)
+                print("⚠️ Geocoding failed:", e)
+                geo = None
+
+            if geo is None:
+                return ["⚕️ Sorry, I couldn’t find any clinics near that location."]
+
+            lat, lng, formatted, _provider = geo
+
+        clinics = nearby_clinic_lines(lat, lng, radius_m=5000, deadline=deadline)
+
+        # Optional: prefix with the resolved area so user trusts the match
+        if clinics and formatted:
+            clinics.insert(0, f"📍 Showing clinics near: {formatted}")
 
         if not clinics:
             return ["⚕️ Sorry, I couldn’t find any clinics near that location."]
 
         # If we inserted the "Showing clinics near..." line, allow 1 extra line
-        return clinics[:6]
+        return clinics[:CLINIC_RESULT_LIMIT + 1]
 
     except Exception as e:
         print("Error in find_nearby_clinics:", e)
@@ -0,0 +1,141 @@
+# backend/app/helpers/export_bench.py
+"""
+Export benchmark: list endpoint vs streamed NDJSON / CSV.
+
+Builds a synthetic prescriptions-shaped table (default 1,000,000 rows) in a
+scratch database (a temp SQLite file unless --database-url points at a
+scratch Postgres), then times:
+
+  list     all rows -> list of dicts -> one json.dumps (what jsonify does)
+  ndjson   utils/export_stream.stream_select, NDJSON
+  csv      utils/export_stream.stream_select, CSV
+
+Reports rows/s, time to first byte and, in a second traced pass, peak
+Python memory. Entry point: `flask bench-export`.
+"""
+
+import json
+import os
+import random
+import shutil
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+from sqlalchemy import Column, DateTime, Integer, MetaData, String, Table, Text, create_engine, select
+from sqlalchemy.orm import Session
+
+from ..utils import export_stream
+
+TABLE = "export_bench_rows"
+INSERT_BATCH = 20_000
+
+
+def _make_table(metadata):
+    return Table(
+        TABLE, metadata,
+        Column("id", Integer, primary_key=True),
+        Column("user_id", Integer, nullable=False),
+        Column("response", Text),
+        Column("input_token", String(255)),
+        Column("output_token", String(255)),
+        Column("image_mime", String(100)),
+        Column("timestamp", DateTime),
+    )
+
+
+def _fill(engine, table, rows: int, seed: int):
+    rnd = random.Random(seed)
+    words = ["Amoxicillin", "500mg", "twice", "daily", "after", "meals", "for", "7", "days", "Paracetamol", "as", "needed"]
+    start = datetime(2024, 1, 1)
+    with engine.begin() as conn:
+        for offset in range(0, rows, INSERT_BATCH):
+            conn.execute(table.insert(), [
+                {
+                    "id": i + 1,
+                    "user_id": rnd.randint(1, 50_000),
+                    "response": " ".join(rnd.choices(words, k=rnd.randint(8, 40))),
+                    "input_token": str(rnd.randint(200, 2000)),
+                    "output_token": str(rnd.randint(50, 600)),
+                    "image_mime": rnd.choice(["image/jpeg", "image/png", "application/pdf", None]),
+                    "timestamp": start + timedelta(seconds=i * 37),
+                }
+                for i in range(offset, min(offset + INSERT_BATCH, rows))
+            ])
+
+
+def _list_body(session, stmt):
+    result = session.execute(stmt)
+    keys = list(result.keys())
+    data = [
+        {k: (v.isoformat() if isinstance(v, datetime) else v) for k, v in zip(keys, row)}
+        for row in result.all()
+    ]
+    yield json.dumps(data).encode()
+
+
+def _modes(batch_rows):
+    return {
+        "list": lambda session, stmt: _list_body(session, stmt),
+        "ndjson": lambda session, stmt: export_stream.stream_select(session, stmt, "ndjson", batch_rows),
+        "csv": lambda session, stmt: export_stream.stream_select(session, stmt, "csv", batch_rows),
+    }
+
+
+def _run(engine, stmt, make_chunks, traced: bool) -> dict:
+    if traced:
+        tracemalloc.start()
+    t0 = time.perf_counter()
+    first = None
+    size = 0
+    with Session(engine) as session:
+        for chunk in make_chunks(session, stmt):
+            if first is None:
+                first = time.perf_counter() - t0
+            size += len(chunk)
+    elapsed = time.perf_counter() - t0
+    out = {"seconds": round(elapsed, 3), "first_byte_ms": round((first or elapsed) * 1000, 1), "bytes": size}
+    if traced:
+        out["peak_mb"] = round(tracemalloc.get_traced_memory()[1] / 1e6, 1)
+        tracemalloc.stop()
+    return out
+
+
+def run_export_benchmark(rows: int = 1_000_000, database_url: str = None, batch_rows: int = None,
+                         memory: bool = True, seed: int = 42) -> dict:
+    scratch = None
+    if not database_url:
+        scratch = tempfile.mkdtemp(prefix="export_bench_")
+        database_url = f"sqlite:///{os.path.join(scratch, 'bench.db')}"
+
+    engine = create_engine(database_url)
+    metadata = MetaData()
+    table = _make_table(metadata)
+    try:
+        table.drop(engine, checkfirst=True)
+        table.create(engine)
+        t0 = time.perf_counter()
+        _fill(engine, table, rows, seed)
+        report = {
+            "rows": rows,
+            "database": engine.dialect.name,
+            "batch_rows": batch_rows or export_stream.EXPORT_BATCH_ROWS,
+            "json_encoder": "orjson" if export_stream.orjson is not None else "stdlib",
+            "fill_seconds": round(time.perf_counter() - t0, 1),
+            "modes": {},
+        }
+
+        stmt = select(*table.columns).order_by(table.c.id)
+        for name, make_chunks in _modes(batch_rows).items():
+            timed = _run(engine, stmt, make_chunks, traced=False)
+            timed["rows_per_s"] = round(rows / timed["seconds"]) if timed["seconds"] else None
+            if memory:
+                timed["peak_mb"] = _run(engine, stmt, make_chunks, traced=True)["peak_mb"]
+            report["modes"][name] = timed
+        return report
+    finally:
+        table.drop(engine, checkfirst=True)
+        engine.dispose()
+        if scratch:
+            shutil.rmtree(scratch, ignore_errors=True)
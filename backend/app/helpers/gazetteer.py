@@ -0,0 +1,266 @@
+# backend/app/helpers/gazetteer.py
+"""
+Offline gazetteer of Kenyan place names.
+
+Short location strings ("westland", "Kitengla", "Rongai") resolve to
+coordinates from an in-memory index without any network call:
+
+1) exact lookup on the normalized name (and alternate names)
+2) trigram candidates (padded 3-grams, inverted index) ranked by overlap
+3) bounded edit distance on the best candidates, weighted by population
+
+Fuzzy matching only applies to single-word names without digits: in
+"South D" or "Githurai 46" one edited character is a different place.
+A fuzzy match that another place comes close to is treated as ambiguous.
+Anything not matched confidently falls through to the geocoding providers
+in helpers/clinicfinder.py, since the gazetteer answers before the
+geocode cache and nothing downstream would correct a wrong hit.
+
+The bundled list (app/data/ke_places.tsv) covers towns and common estates.
+Set GAZETTEER_PATH to a GeoNames country dump (e.g. KE.txt) to load a
+larger list instead.
+"""
+
+import math
+import os
+import re
+import threading
+import time
+import unicodedata
+from array import array
+from collections import Counter
+
+from ..utils import metrics
+
+GAZETTEER_ENABLED = os.getenv("GAZETTEER_ENABLED", "1") == "1"
+GAZETTEER_PATH = os.getenv("GAZETTEER_PATH") or os.path.join(
+    os.path.dirname(os.path.dirname(__file__)), "data", "ke_places.tsv"
+)
+
+# Words that say nothing about *which* place (dropped from names and queries)
+_STOPWORDS = {
+    "near", "in", "at", "around", "the", "of", "kenya", "county",
+    "town", "estate", "area", "city", "centre", "center", "ward",
+}
+
+FUZZY_CANDIDATES = 20
+MIN_TRIGRAM_SCORE = 0.3
+POPULATION_WEIGHT = 0.2  # edit-distance units per decade of population
+# A runner-up place ranked within this margin of the best makes a fuzzy match ambiguous
+FUZZY_TIE_MARGIN = 0.5
+
+
+def normalize(text: str) -> str:
+    """Lowercase ASCII, no punctuation or apostrophes, stopwords dropped."""
+    text = unicodedata.normalize("NFKD", text or "").encode("ascii", "ignore").decode("ascii")
+    text = re.sub(r"['`]", "", text.lower())
+    tokens = re.sub(r"[^a-z0-9]+", " ", text).split()
+    kept = [t for t in tokens if t not in _STOPWORDS]
+    return " ".join(kept or tokens)
+
+
+def _trigrams(name: str):
+    padded = f"  {name} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def _fuzzy_ok(name: str) -> bool:
+    """Single word with no digits (multi-word / numbered names match exactly only)."""
+    return " " not in name and not any(c.isdigit() for c in name)
+
+
+def _max_distance(length: int) -> int:
+    if length <= 5:
+        return 0
+    if length <= 8:
+        return 1
+    if length <= 14:
+        return 2
+    return 3
+
+
+def _edit_distance(a: str, b: str, limit: int) -> int:
+    """Optimal string alignment distance; returns limit + 1 once it is exceeded."""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+
+    prev2 = None
+    prev = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        cur = [i] + [0] * len(b)
+        row_min = i
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            cur[j] = min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                cur[j] = min(cur[j], prev2[j - 2] + 1)
+            row_min = min(row_min, cur[j])
+        if row_min > limit:
+            return limit + 1
+        prev2, prev = prev, cur
+    return prev[-1]
+
+
+class Gazetteer:
+    """
+    Compact index: parallel arrays for places, one entry per searchable
+    name (canonical + alternates) pointing back at its place.
+    """
+
+    def __init__(self):
+        self.display = []
+        self.lat = array("d")
+        self.lng = array("d")
+        self.population = array("L")
+
+        self.names = []             # normalized searchable names
+        self.name_place = array("L")
+        self.exact = {}             # normalized name -> place id (most populous)
+        self.trigram_index = {}     # trigram -> array of name ids
+
+    def __len__(self):
+        return len(self.display)
+
+    def add(self, name: str, alt_names, county: str, population: int, lat: float, lng: float):
+        place = len(self.display)
+        self.display.append(f"{name}, {county}" if county and county != name else name)
+        self.lat.append(lat)
+        self.lng.append(lng)
+        self.population.append(max(0, population))
+
+        for n in {normalize(x) for x in [name, *alt_names] if x}:
+            if not n:
+                continue
+            current = self.exact.get(n)
+            if current is None or self.population[current] < population:
+                self.exact[n] = place
+
+            name_id = len(self.names)
+            self.names.append(n)
+            self.name_place.append(place)
+            for tri in _trigrams(n):
+                self.trigram_index.setdefault(tri, array("L")).append(name_id)
+
+    def _result(self, place: int, distance: int):
+        return self.lat[place], self.lng[place], self.display[place], distance
+
+    def _fuzzy(self, q: str):
+        q_tris = _trigrams(q)
+        overlap = Counter()
+        for tri in q_tris:
+            ids = self.trigram_index.get(tri)
+            if ids is not None:
+                overlap.update(ids)
+        if not overlap:
+            return None
+
+        limit = _max_distance(len(q))
+        ranked = {}  # place -> (rank, distance)
+        for name_id, shared in overlap.most_common(FUZZY_CANDIDATES):
+            name = self.names[name_id]
+            # Dice coefficient over trigram sets (the index holds n's trigrams)
+            score = 2 * shared / (len(q_tris) + len(name) + 1)
+            if score < MIN_TRIGRAM_SCORE:
+                break
+            if not _fuzzy_ok(name):
+                continue
+            distance = _edit_distance(q, name, limit)
+            if distance > limit:
+                continue
+            place = self.name_place[name_id]
+            rank = distance - POPULATION_WEIGHT * math.log10(self.population[place] + 10)
+            if place not in ranked or rank < ranked[place][0]:
+                ranked[place] = (rank, distance)
+
+        if not ranked:
+            return None
+        order = sorted(ranked.items(), key=lambda item: item[1][0])
+        place, (rank, distance) = order[0]
+        if len(order) > 1 and order[1][1][0] - rank < FUZZY_TIE_MARGIN:
+            return None
+        return self._result(place, distance)
+
+    def lookup(self, query: str):
+        """
+        (lat, lng, display_name, edit_distance) for the best match, or None.
+        Tries the whole string, then the part before the first comma
+        ("Westlands, Nairobi" -> "Westlands").
+        """
+        candidates = [normalize(query)]
+        if "," in query:
+            candidates.append(normalize(query.split(",", 1)[0]))
+
+        for q in candidates:
+            if q in self.exact:
+                return self._result(self.exact[q], 0)
+        for q in candidates:
+            if len(q) >= 3 and _fuzzy_ok(q):
+                found = self._fuzzy(q)
+                if found is not None:
+                    return found
+        return None
+
+
+# -------------------------------
+# Loading
+# -------------------------------
+def _load_tsv(gz: Gazetteer, path: str):
+    with open(path, encoding="utf-8") as fh:
+        for line in fh:
+            if not line.strip() or line.startswith("#"):
+                continue
+            cols = line.rstrip("\n").split("\t")
+
+            if len(cols) >= 15:
+                # GeoNames: id, name, asciiname, alternatenames, lat, lng,
+                # feature class, feature code, country, ..., population (14)
+                if cols[6] != "P":
+                    continue
+                alts = [cols[2]] + [a for a in cols[3].split(",") if a.isascii()]
+                gz.add(cols[1], alts, None, int(cols[14] or 0), float(cols[4]), float(cols[5]))
+            else:
+                name, alts, county, _kind, population, lat, lng = cols[:7]
+                gz.add(name, alts.split("|") if alts else [], county, int(population), float(lat), float(lng))
+
+
+_gazetteer = None
+_load_lock = threading.Lock()
+
+
+def get_gazetteer():
+    """The process-wide index, loaded on first use (None if disabled or unreadable)."""
+    global _gazetteer
+    if _gazetteer is not None or not GAZETTEER_ENABLED:
+        return _gazetteer
+
+    with _load_lock:
+        if _gazetteer is None:
+            gz = Gazetteer()
+            t0 = time.perf_counter()
+            try:
+                _load_tsv(gz, GAZETTEER_PATH)
+            except (OSError, ValueError) as e:
+                print("⚠️ Gazetteer load failed:", e)
+                return None
+            print(f"Gazetteer loaded {len(gz)} places in {time.perf_counter() - t0:.2f}s")
+            _gazetteer = gz
+    return _gazetteer
+
+
+def resolve(location_query: str):
+    """(lat, lng, display_name) for a place name, or None to use the providers."""
+    gz = get_gazetteer()
+    if gz is None:
+        return None
+
+    t0 = time.perf_counter()
+    found = gz.lookup(location_query)
+    metrics.observe("gazetteer.lookup", time.perf_counter() - t0)
+
+    if found is None:
+        metrics.incr("gazetteer.miss")
+        return None
+
+    lat, lng, display, distance = found
+    metrics.incr("gazetteer.exact_hit" if distance == 0 else "gazetteer.fuzzy_hit")
+    return lat, lng, display
@@ -0,0 +1,137 @@
+# backend/app/helpers/geocache.py
+"""
+Geocode cache for clinic search location text.
+
+Two layers, both keyed by normalize_location(text):
+1) in-process LRU (per worker, no I/O)
+2) geocode_cache table with TTL (shared by all workers)
+
+Entries store lat/lng, formatted address and the provider that answered.
+Negative entries (text nobody could resolve) are kept for a shorter TTL so
+junk input doesn't hit the providers on every retry.
+"""
+
+import os
+import re
+import unicodedata
+from datetime import datetime, timedelta
+
+from sqlalchemy.exc import IntegrityError
+
+from ..models import db, GeocodeCache
+from ..utils.cache import LRUCache
+from ..utils import metrics
+
+GEOCODE_TTL_DAYS = int(os.getenv("GEOCODE_CACHE_TTL_DAYS", "90"))
+GEOCODE_NEGATIVE_TTL_HOURS = int(os.getenv("GEOCODE_CACHE_NEGATIVE_TTL_HOURS", "24"))
+GEOCODE_LRU_SIZE = int(os.getenv("GEOCODE_LRU_SIZE", "2048"))
+
+# Cap LRU lifetime so rows refreshed/purged in the DB are picked up eventually
+_LRU_TTL_SECONDS = 6 * 3600
+
+_lru = LRUCache(GEOCODE_LRU_SIZE)
+
+
+def normalize_location(text: str) -> str:
+    """'  Westlands, Nairobi!! ' -> 'westlands nairobi'"""
+    s = unicodedata.normalize("NFKC", text or "").lower()
+    s = re.sub(r"[^\w\s]", " ", s)
+    s = re.sub(r"\s+", " ", s).strip()
+    return s[:255]
+
+
+def get_cached(text: str):
+    """
+    Returns (hit, result). result is (lat, lng, formatted_address, provider),
+    or None for a cached negative. hit is False when the text is not cached.
+    """
+    key = normalize_location(text)
+    if not key:
+        return False, None
+
+    cached = _lru.get(key)
+    if cached is not None:
+        metrics.incr("geocode.lru_hit")
+        return True, cached[1]
+
+    try:
+        row = GeocodeCache.query.filter_by(query_key=key).first()
+    except Exception as e:
+        db.session.rollback()
+        print("Geocode cache read failed:", e)
+        row = None
+
+    if row is not None and row.is_valid():
+        metrics.incr("geocode.db_hit")
+        result = None if row.lat is None else (row.lat, row.lng, row.formatted_address, row.provider)
+        remaining = (row.expires_at - datetime.utcnow()).total_seconds()
+        _lru.set(key, (True, result), ttl_seconds=min(_LRU_TTL_SECONDS, max(1, remaining)))
+        return True, result
+
+    metrics.incr("geocode.miss")
+    return False, None
+
+
+def store(text: str, lat, lng, formatted_address, provider: str):
+    """Upsert a geocode result. Pass lat=None (provider='none') for a negative entry."""
+    key = normalize_location(text)
+    if not key:
+        return
+
+    if lat is None:
+        ttl = timedelta(hours=GEOCODE_NEGATIVE_TTL_HOURS)
+        result = None
+    else:
+        ttl = timedelta(days=GEOCODE_TTL_DAYS)
+        result = (lat, lng, formatted_address, provider)
+
+    _lru.set(key, (True, result), ttl_seconds=min(_LRU_TTL_SECONDS, ttl.total_seconds()))
+    metrics.incr("geocode.store")
+
+    now = datetime.utcnow()
+    try:
+        row = GeocodeCache.query.filter_by(query_key=key).first()
+        if row is None:
+            row = GeocodeCache(query_key=key)
+            db.session.add(row)
+
+        row.lat = lat
+        row.lng = lng
+        row.formatted_address = (formatted_address or "")[:512] or None
+        row.provider = provider
+        row.created_at = now
+        row.expires_at = now + ttl
+        db.session.commit()
+    except IntegrityError:
+        # Another worker inserted the same key first; theirs is just as good.
+        db.session.rollback()
+    except Exception as e:
+        db.session.rollback()
+        print("Geocode cache write failed:", e)
+
+
+def purge_expired() -> int:
+    """Delete expired rows (called from the cleanup job)."""
+    n = GeocodeCache.query.filter(GeocodeCache.expires_at < datetime.utcnow()).delete(
+        synchronize_session=False
+    )
+    db.session.commit()
+    return n
+
+
+def cache_stats() -> dict:
+    lru_hits = metrics.get_counter("geocode.lru_hit")
+    db_hits = metrics.get_counter("geocode.db_hit")
+    misses = metrics.get_counter("geocode.miss")
+    lookups = lru_hits + db_hits + misses
+    return {
+        "lookups": lookups,
+        "lru_hits": lru_hits,
+        "db_hits": db_hits,
+        "misses": misses,
+        "hit_rate": metrics.hit_rate(lru_hits + db_hits, lookups),
+        "lru_size": len(_lru),
+    }
+
+
+metrics.register_collector("geocode_cache", cache_stats)
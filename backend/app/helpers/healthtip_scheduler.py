@@ -1,56 +1,186 @@
+# backend/app/helpers/healthtip_scheduler.py
+"""
+Daily health tip broadcast.
+
+This is the job body only. Scheduling (and making sure exactly one worker
+runs it) is handled by app.utils.scheduler; the cron endpoint in
+tasks_routes goes through the same path.
+
+The pipeline (generate tip -> send -> record) takes its LLM and sender as
+arguments so helpers/broadcast_bench.py can run it against stub providers.
+"""
+
 import os
-from apscheduler.schedulers.background import BackgroundScheduler
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from twilio.rest import Client
+
+from twilio.rest import Client as TwilioClient
+
 from .healthtip_agent import generate_health_tip
 from ..models import db, User, HealthTip
 
-def send_daily_health_tips():
-    print("💌 Sending daily health tips...")
+FALLBACK_POOL = [
+    "Drink plenty of water throughout the day.",
+    "Aim for at least 30 minutes of activity daily.",
+    "Get enough sleep — your body needs it to recover.",
+    "Eat more fruits and vegetables for balanced nutrition.",
+    "Take time to relax and breathe deeply each day.",
+]
 
+# Generate + send run in worker threads; DB writes stay on the calling thread.
+BROADCAST_CONCURRENCY = int(os.getenv("TIP_BROADCAST_CONCURRENCY", "1"))
+
+
+def _already_sent_today() -> set:
+    """User ids that already got a tip today (UTC), so re-runs don't double-send."""
+    start_of_day = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
+    rows = (
+        db.session.query(HealthTip.user_id)
+        .filter(HealthTip.sent.is_(True), HealthTip.date_sent >= start_of_day)
+        .distinct()
+        .all()
+    )
+    return {r[0] for r in rows}
+
+
+def _twilio_sender():
+    """Returns send(to_phone, body) backed by Twilio, or None without credentials."""
     account_sid = os.getenv("TWILIO_ACCOUNT_SID")
     auth_token = os.getenv("TWILIO_AUTH_TOKEN")
 
     if not account_sid or not auth_token:
-        print("⚠️ Missing Twilio credentials in environment.")
-        return
+        return None
 
-    client = Client(account_sid, auth_token)
-    users = User.query.all()
-    
-    
-    for user in users:
-        tip_text = generate_health_tip(user)
-        # send via Twilio or other API
-        print(f"✅ Sent tip to {user.phone}: {tip_text}")
+    twilio_client = TwilioClient(account_sid, auth_token)
+    from_phone = os.getenv("TWILIO_WHATSAPP_FROM", "whatsapp:+14155238886")
 
-    if not users:
-        print("⚠️ No users found.")
-        return
+    def send(to_phone: str, body: str):
+        twilio_client.messages.create(
+            from_=from_phone,
+            to=f"whatsapp:{to_phone}",
+            body=body,
+        )
 
-    for user in users:
-        tip_text = generate_health_tip()
+    return send
+
+
+def _tip_and_send(user_id, phone, user, generate_tip, send):
+    """Worker body: returns (user_id, phone, tip_text, error, timings)."""
+    timings = {}
+
+    # generate_health_tip already falls back OpenAI -> Gemini -> static tip,
+    # so one call per user is enough.
+    t0 = time.perf_counter()
+    try:
+        tip_text = generate_tip(user)
+    except Exception as e:
+        print("Error generating personalized tip:", e)
+        tip_text = ""
+    timings["llm"] = time.perf_counter() - t0
+
+    if not (tip_text or "").strip():
+        tip_text = random.choice(FALLBACK_POOL)
+
+    t1 = time.perf_counter()
+    try:
+        send(phone, f"*Daily Health Tip*\n{tip_text}")
+        error = None
+    except Exception as e:
+        error = e
+    timings["send"] = time.perf_counter() - t1
+
+    return user_id, phone, tip_text, error, timings
 
-        try:
-            client.messages.create(
-                from_="whatsapp:+14155238886",
-                to=f"whatsapp:{user.phone}",
-                body=f"🌿 *Daily Health Tip*\n{tip_text}"
-            )
 
-            new_tip = HealthTip(user_id=user.id, tip_text=tip_text, sent=True, date_sent=datetime.utcnow())
-            db.session.add(new_tip)
-            print(f"✅ Sent tip to {user.phone}")
+def broadcast_tips(users, generate_tip, send, concurrency=None, commit=True, on_result=None):
+    """
+    Runs the tip pipeline for `users`.
 
+    - generate_tip(user) -> str and send(phone, body) are pluggable
+    - commit=False flushes HealthTip rows but never commits (dry runs)
+    - on_result(stage_timings, ok) is called once per user (benchmarks)
+
+    Returns (sent, failed).
+    """
+    concurrency = max(1, concurrency or BROADCAST_CONCURRENCY)
+    sent = failed = 0
+
+    # Read id/phone up front so worker threads never lazy-load from the
+    # session; generate_tip gets the instance but must not query through it.
+    jobs = [(u.id, u.phone, u) for u in users]
+
+    def _record(result):
+        nonlocal sent, failed
+        user_id, phone, tip_text, error, timings = result
+
+        if error is not None:
+            failed += 1
+            print("Failed to send tip to", phone, ":", error)
+            if on_result:
+                on_result(timings, False)
+            return
+
+        t0 = time.perf_counter()
+        try:
+            db.session.add(HealthTip(
+                user_id=user_id,
+                tip_text=tip_text,
+                sent=True,
+                date_sent=datetime.utcnow(),
+            ))
+            if commit:
+                db.session.commit()
+            else:
+                db.session.flush()
+            sent += 1
+            ok = True
+            if commit:
+                print("Sent tip to", phone)
         except Exception as e:
-            print(f"⚠️ Failed to send tip to {user.phone}: {e}")
+            db.session.rollback()
+            failed += 1
+            ok = False
+            print("Failed to record tip for", phone, ":", e)
+        timings["db"] = time.perf_counter() - t0
+
+        if on_result:
+            on_result(timings, ok)
+
+    if concurrency == 1:
+        for user_id, phone, user in jobs:
+            _record(_tip_and_send(user_id, phone, user, generate_tip, send))
+    else:
+        with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="tips") as pool:
+            futures = [
+                pool.submit(_tip_and_send, user_id, phone, user, generate_tip, send)
+                for user_id, phone, user in jobs
+            ]
+            for f in futures:
+                _record(f.result())
+
+    return sent, failed
+
+
+def send_daily_health_tips():
+    print("Sending daily health tips...")
+
+    send = _twilio_sender()
+    if send is None:
+        print("Missing Twilio credentials in environment.")
+        return
+
+    users = User.query.all()
+
+    if not users:
+        print("No users found.")
+        return
+
+    skip_ids = _already_sent_today()
+    pending = [u for u in users if u.id not in skip_ids]
 
-    db.session.commit()
-    print("🎯 All health tips sent successfully!")
+    sent, failed = broadcast_tips(pending, generate_health_tip, send)
 
-def start_healthtip_scheduler(app):
-    """Starts the scheduler with Flask app context."""
-    scheduler = BackgroundScheduler()
-    scheduler.add_job(func=lambda: app.app_context().push() or send_daily_health_tips(), trigger='interval', hours=24)
-    scheduler.start()
-    print("🕒 Daily Health Tip Scheduler started!")
+    print(f"Daily health tips done. sent={sent} failed={failed} skipped={len(skip_ids)}")
+    return sent
@@ -0,0 +1,160 @@
+# backend/app/helpers/list_bench.py
+"""
+List endpoint benchmark: full ORM entities vs column projection.
+
+Fills a scratch SQLite database with synthetic users and prescriptions
+(a share of them legacy rows with inline `uploaded` image bytes), then
+walks every page of /api/users and /api/prescriptions through
+utils/pagination.paginate, one session per page like a request, in
+three ways:
+
+  entities            Model.query                        (before projection)
+  entities_undeferred Model.query + undefer(uploaded)    (before `uploaded` was deferred)
+  columns             db.session.query(*..._LIST_COLUMNS) (what the routes run now)
+
+Reports ms per page (p50 / p95), total seconds and, in a second traced
+pass, peak Python memory for one page. Entry point: `flask bench-list`.
+"""
+
+import json
+import os
+import random
+import shutil
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+from flask import current_app
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session, undefer
+
+from ..models import db, Prescription, User
+from ..routes.api_routes import PRESCRIPTION_LIST_COLUMNS, USER_LIST_COLUMNS
+from ..utils.metrics import percentiles
+from ..utils.pagination import paginate
+
+INSERT_BATCH = 5_000
+
+
+def _fill(engine, users: int, prescriptions: int, legacy_fraction: float, blob_kb: int, seed: int):
+    rnd = random.Random(seed)
+    start = datetime(2024, 1, 1)
+    blob = os.urandom(blob_kb * 1024)
+    words = ["Amoxicillin", "500mg", "twice", "daily", "after", "meals", "for", "7", "days", "Paracetamol", "as", "needed"]
+    with engine.begin() as conn:
+        conn.execute(User.__table__.insert(), [
+            {
+                "id": i + 1, "phone": f"07{i:08d}", "email": f"user{i}@example.com",
+                "password": "whatsapp_user", "role": "participant",
+                "created_at": start + timedelta(minutes=i),
+            }
+            for i in range(users)
+        ])
+        for offset in range(0, prescriptions, INSERT_BATCH):
+            conn.execute(Prescription.__table__.insert(), [
+                {
+                    "id": i + 1,
+                    "user_id": rnd.randint(1, users),
+                    "uploaded": blob if rnd.random() < legacy_fraction else None,
+                    "image_sha256": f"{i:064x}",
+                    "image_size": blob_kb * 1024,
+                    "image_mime": "image/jpeg",
+                    "response": " ".join(rnd.choices(words, k=rnd.randint(20, 120))),
+                    "input_token": str(rnd.randint(200, 2000)),
+                    "output_token": str(rnd.randint(50, 600)),
+                    "timestamp": start + timedelta(seconds=i * 37),
+                }
+                for i in range(offset, min(offset + INSERT_BATCH, prescriptions))
+            ])
+
+
+def _user_dict(u):
+    return {
+        "id": u.id, "phone": u.phone, "email": u.email, "role": u.role,
+        "created_at": u.created_at.isoformat() if u.created_at else None,
+    }
+
+
+def _prescription_dict(p):
+    return {
+        "id": p.id, "user_id": p.user_id, "response": p.response,
+        "timestamp": p.timestamp.isoformat() if p.timestamp else None,
+        "thumbnail_url": f"/api/prescriptions/{p.id}/thumbnail" if p.image_sha256 else None,
+    }
+
+
+# endpoint -> (sort col, id col, row -> dict, {mode: session -> query})
+ENDPOINTS = {
+    "/api/users": (User.created_at, User.id, _user_dict, {
+        "entities": lambda s: s.query(User),
+        "columns": lambda s: s.query(*USER_LIST_COLUMNS),
+    }),
+    "/api/prescriptions": (Prescription.timestamp, Prescription.id, _prescription_dict, {
+        "entities": lambda s: s.query(Prescription),
+        "entities_undeferred": lambda s: s.query(Prescription).options(undefer(Prescription.uploaded)),
+        "columns": lambda s: s.query(*PRESCRIPTION_LIST_COLUMNS),
+    }),
+}
+
+
+def _page(engine, make_query, sort_col, id_col, to_dict, page_size, cursor):
+    path = f"/?limit={page_size}" + (f"&cursor={cursor}" if cursor else "")
+    with current_app.test_request_context(path), Session(engine) as session:
+        rows, next_cursor = paginate(make_query(session), sort_col, id_col)
+        body = json.dumps([to_dict(r) for r in rows])
+    return len(body), next_cursor
+
+
+def _walk(engine, make_query, sort_col, id_col, to_dict, page_size) -> dict:
+    times = []
+    cursor = None
+    t0 = time.perf_counter()
+    while True:
+        t = time.perf_counter()
+        _size, cursor = _page(engine, make_query, sort_col, id_col, to_dict, page_size, cursor)
+        times.append(time.perf_counter() - t)
+        if not cursor:
+            break
+    return {
+        "pages": len(times),
+        "seconds": round(time.perf_counter() - t0, 3),
+        "page_ms": percentiles(times, points=(50, 95)),
+    }
+
+
+def _page_peak_mb(engine, make_query, sort_col, id_col, to_dict, page_size) -> float:
+    tracemalloc.start()
+    try:
+        _page(engine, make_query, sort_col, id_col, to_dict, page_size, None)
+        return round(tracemalloc.get_traced_memory()[1] / 1e6, 2)
+    finally:
+        tracemalloc.stop()
+
+
+def run_list_benchmark(prescriptions: int = 50_000, users: int = 20_000, page_size: int = 1000,
+                       legacy_fraction: float = 0.05, blob_kb: int = 50, seed: int = 42) -> dict:
+    scratch = tempfile.mkdtemp(prefix="list_bench_")
+    engine = create_engine(f"sqlite:///{os.path.join(scratch, 'bench.db')}")
+    try:
+        db.metadata.create_all(engine, tables=[User.__table__, Prescription.__table__])
+        t0 = time.perf_counter()
+        _fill(engine, users, prescriptions, legacy_fraction, blob_kb, seed)
+        report = {
+            "users": users,
+            "prescriptions": prescriptions,
+            "legacy_inline_images": f"{legacy_fraction:.0%} x {blob_kb} KB",
+            "page_size": page_size,
+            "fill_seconds": round(time.perf_counter() - t0, 1),
+            "endpoints": {},
+        }
+        for endpoint, (sort_col, id_col, to_dict, modes) in ENDPOINTS.items():
+            results = report["endpoints"][endpoint] = {}
+            for mode, make_query in modes.items():
+                walked = _walk(engine, make_query, sort_col, id_col, to_dict, page_size)
+                walked["page_peak_mb"] = _page_peak_mb(engine, make_query, sort_col, id_col, to_dict, page_size)
+                results[mode] = walked
+        return report
+    finally:
+        engine.dispose()
+        shutil.rmtree(scratch, ignore_errors=True)
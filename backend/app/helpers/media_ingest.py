@@ -0,0 +1,131 @@
+# backend/app/helpers/media_ingest.py
+"""
+Bounded media download and PDF OCR for prescription uploads.
+
+download_media() streams the Twilio media response in chunks. It rejects
+the file from the Content-Length header or the first chunk's magic bytes
+before reading the rest, and stops once PRESCRIPTION_MAX_BYTES is passed.
+
+ocr_pdf() rasterizes pages one at a time under PDFIUM_LOCK and OCRs them
+in parallel. At most PDF_OCR_CONCURRENCY page bitmaps are alive
+at once, so memory stays bounded however many pages the file has. Page
+texts are merged in page order.
+"""
+
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from . import ocr_preprocess
+from ..utils import http
+from ..utils.blobstore import sniff_mime
+
+PRESCRIPTION_MAX_BYTES = int(os.getenv("PRESCRIPTION_MAX_BYTES", str(15 * 1024 * 1024)))
+PDF_MAX_PAGES = int(os.getenv("PDF_MAX_PAGES", "10"))
+PDF_OCR_CONCURRENCY = int(os.getenv("PDF_OCR_CONCURRENCY", "3"))
+DOWNLOAD_CHUNK_BYTES = 64 * 1024
+
+PDF_MIME = "application/pdf"
+
+# pdfium is not thread-safe: every pypdfium2 call in the process (open,
+# render, close; here and in prescription_store) runs under this lock
+PDFIUM_LOCK = threading.Lock()
+
+# Rendered pages are already at OCR_TARGET_DPI and upright
+_PDF_SKIP_STAGES = {"exif", "downscale"}
+
+
+class MediaRejected(ValueError):
+    """Upload refused before processing; .user_message is safe to send back."""
+
+    def __init__(self, reason: str, user_message: str):
+        super().__init__(reason)
+        self.user_message = user_message
+
+
+def _too_large():
+    return MediaRejected(
+        "media too large",
+        f"⚠️ That file is too large (max {PRESCRIPTION_MAX_BYTES // (1024 * 1024)} MB). "
+        "Please send a photo of the prescription instead.",
+    )
+
+
+def is_supported(mime: str) -> bool:
+    return mime.startswith("image/") or mime == PDF_MIME
+
+
+def download_media(media_url: str, auth=None, timeout: float = 25):
+    """
+    Streams media into memory, capped at PRESCRIPTION_MAX_BYTES.
+    Returns (bytes, sniffed_mime). Raises MediaRejected for oversized or
+    unsupported files (checked as early as possible).
+    """
+    with http.get(media_url, auth=auth, timeout=timeout, stream=True) as res:
+        res.raise_for_status()
+
+        declared = res.headers.get("Content-Length")
+        if declared and declared.isdigit() and int(declared) > PRESCRIPTION_MAX_BYTES:
+            raise _too_large()
+
+        buf = bytearray()
+        mime = "application/octet-stream"
+        for chunk in res.iter_content(chunk_size=DOWNLOAD_CHUNK_BYTES):
+            if not chunk:
+                continue
+            if not buf:
+                mime = sniff_mime(chunk, default=(res.headers.get("Content-Type") or "").split(";")[0].strip())
+                if not is_supported(mime):
+                    raise MediaRejected(
+                        f"unsupported media type {mime!r}",
+                        "⚠️ I can only read photos (JPG/PNG) or PDF files of a prescription.",
+                    )
+            buf += chunk
+            if len(buf) > PRESCRIPTION_MAX_BYTES:
+                raise _too_large()
+
+    data = bytes(buf)
+    return data, sniff_mime(data, default=mime)
+
+
+def ocr_pdf(data: bytes, max_pages: int = PDF_MAX_PAGES) -> str:
+    """OCR text of the first max_pages pages, in page order."""
+    import pypdfium2 as pdfium
+
+    stages = [s for s in ocr_preprocess.OCR_STAGES if s not in _PDF_SKIP_STAGES]
+    scale = ocr_preprocess.OCR_TARGET_DPI / 72.0
+    in_flight = threading.BoundedSemaphore(PDF_OCR_CONCURRENCY)
+
+    def ocr_page(img):
+        try:
+            img, _ = ocr_preprocess.preprocess(img, stages=stages)
+            return ocr_preprocess.ocr_text(img)
+        finally:
+            in_flight.release()
+
+    with PDFIUM_LOCK:
+        doc = pdfium.PdfDocument(data)
+        pages = min(len(doc), max_pages)
+    futures = []
+    try:
+        with ThreadPoolExecutor(max_workers=PDF_OCR_CONCURRENCY, thread_name_prefix="pdf-ocr") as ex:
+            for i in range(pages):
+                in_flight.acquire()  # wait for an OCR slot before taking the lock
+                try:
+                    with PDFIUM_LOCK:
+                        page = doc[i]
+                        try:
+                            img = page.render(scale=scale, grayscale=True).to_pil()
+                        finally:
+                            page.close()
+                except Exception:
+                    in_flight.release()
+                    raise
+                futures.append(ex.submit(ocr_page, img))
+            texts = [f.result() for f in futures]
+    finally:
+        with PDFIUM_LOCK:
+            doc.close()
+
+    parts = [f"--- Page {i + 1} ---\n{t}" for i, t in enumerate(texts) if t]
+    return "\n\n".join(parts)
@@ -0,0 +1,192 @@
+# backend/app/helpers/ocr_bench.py
+"""
+OCR benchmark over a fixture directory of prescription photos.
+
+For every stage combination it reports preprocessing time, Tesseract time
+and text quality. If a fixture `rx1.jpg` has a sibling `rx1.txt` with the
+expected text, quality includes character accuracy against it; otherwise
+it falls back to Tesseract's mean word confidence and the share of
+word-like tokens.
+
+run_ocr_pool_benchmark() compares the subprocess-per-call path with the
+persistent worker pool (helpers/ocr_workers.py) on the same images.
+"""
+
+import difflib
+import itertools
+import os
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytesseract
+from PIL import Image
+
+from . import ocr_preprocess, ocr_workers
+from ..utils import metrics
+
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".webp", ".tif", ".tiff", ".bmp")
+
+# Default ladder: each row adds one stage to the previous one
+DEFAULT_COMBOS = (
+    (),
+    ("exif",),
+    ("exif", "downscale"),
+    ("exif", "downscale", "grayscale"),
+    ("exif", "downscale", "grayscale", "contrast"),
+    ("exif", "downscale", "grayscale", "contrast", "deskew"),
+    ("exif", "downscale", "grayscale", "contrast", "deskew", "binarize"),
+)
+
+_WORDLIKE = re.compile(r"^[A-Za-z][A-Za-z\-]{2,}$")
+
+
+def load_fixtures(fixture_dir: str):
+    """[(name, PIL image, expected text or None)] sorted by file name."""
+    fixtures = []
+    for fname in sorted(os.listdir(fixture_dir)):
+        if not fname.lower().endswith(IMAGE_EXTENSIONS):
+            continue
+        path = os.path.join(fixture_dir, fname)
+        truth_path = os.path.splitext(path)[0] + ".txt"
+        truth = None
+        if os.path.exists(truth_path):
+            with open(truth_path, encoding="utf-8") as fh:
+                truth = fh.read()
+        img = Image.open(path)
+        img.load()
+        fixtures.append((fname, img, truth))
+    return fixtures
+
+
+def _squash(text: str) -> str:
+    return " ".join((text or "").lower().split())
+
+
+def text_quality(data: dict, truth: str = None) -> dict:
+    """Quality numbers from pytesseract.image_to_data output."""
+    words = [w for w, c in zip(data["text"], data["conf"]) if w.strip() and float(c) >= 0]
+    confs = [float(c) for w, c in zip(data["text"], data["conf"]) if w.strip() and float(c) >= 0]
+    text = " ".join(words)
+
+    quality = {
+        "chars": len(text),
+        "mean_conf": round(sum(confs) / len(confs), 1) if confs else None,
+        "wordlike_ratio": round(sum(1 for w in words if _WORDLIKE.match(w)) / len(words), 3) if words else 0.0,
+    }
+    if truth is not None:
+        quality["char_accuracy"] = round(
+            difflib.SequenceMatcher(None, _squash(text), _squash(truth), autojunk=False).ratio(), 3
+        )
+    return quality
+
+
+def _mean(values):
+    values = [v for v in values if v is not None]
+    return round(sum(values) / len(values), 3) if values else None
+
+
+def run_ocr_benchmark(fixture_dir: str, all_combos: bool = False) -> dict:
+    fixtures = load_fixtures(fixture_dir)
+    if not fixtures:
+        raise ValueError(f"No images found in {fixture_dir}")
+
+    if all_combos:
+        combos = [
+            tuple(c)
+            for n in range(len(ocr_preprocess.STAGE_ORDER) + 1)
+            for c in itertools.combinations(ocr_preprocess.STAGE_ORDER, n)
+        ]
+    else:
+        combos = list(DEFAULT_COMBOS)
+
+    results = []
+    for combo in combos:
+        pre_s, ocr_s, rows = [], [], []
+        for _name, img, truth in fixtures:
+            t0 = time.perf_counter()
+            processed, _ = ocr_preprocess.preprocess(img.copy(), stages=combo)
+            t1 = time.perf_counter()
+            data = pytesseract.image_to_data(
+                processed,
+                lang=ocr_preprocess.OCR_LANG,
+                config=ocr_preprocess.OCR_TESSERACT_CONFIG,
+                output_type=pytesseract.Output.DICT,
+            )
+            t2 = time.perf_counter()
+
+            pre_s.append(t1 - t0)
+            ocr_s.append(t2 - t1)
+            rows.append(text_quality(data, truth))
+
+        results.append({
+            "stages": ",".join(combo) or "(none)",
+            "preprocess_ms": metrics.percentiles(pre_s, points=(50, 95)),
+            "ocr_ms": metrics.percentiles(ocr_s, points=(50, 95)),
+            "total_s": round(sum(pre_s) + sum(ocr_s), 2),
+            "mean_chars": _mean([r["chars"] for r in rows]),
+            "mean_conf": _mean([r["mean_conf"] for r in rows]),
+            "wordlike_ratio": _mean([r["wordlike_ratio"] for r in rows]),
+            "char_accuracy": _mean([r.get("char_accuracy") for r in rows]),
+        })
+
+    return {
+        "fixtures": len(fixtures),
+        "with_expected_text": sum(1 for f in fixtures if f[2] is not None),
+        "tesseract_config": ocr_preprocess.OCR_TESSERACT_CONFIG,
+        "results": results,
+    }
+
+
+def _timed_run(images, fn, concurrency: int, rounds: int) -> dict:
+    jobs = [img for _ in range(rounds) for img in images]
+    latencies = []
+
+    def one(img):
+        t = time.perf_counter()
+        fn(img)
+        latencies.append(time.perf_counter() - t)
+
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as ex:
+        list(ex.map(one, jobs))
+    wall = time.perf_counter() - t0
+
+    return {
+        "images": len(jobs),
+        "wall_s": round(wall, 2),
+        "images_per_s": round(len(jobs) / wall, 2),
+        "latency_ms": metrics.percentiles(latencies),
+    }
+
+
+def run_ocr_pool_benchmark(fixture_dir: str, workers: int = 2, concurrency: int = 2, rounds: int = 3) -> dict:
+    """
+    Throughput / latency of pytesseract in the calling threads vs the
+    worker pool, on images preprocessed once with the default stages.
+    The pool is started before timing, so start-up cost is reported apart.
+    """
+    images = [ocr_preprocess.preprocess(img)[0] for _name, img, _truth in load_fixtures(fixture_dir)]
+    if not images:
+        raise ValueError(f"No images found in {fixture_dir}")
+
+    report = {
+        "fixtures": len(images),
+        "rounds": rounds,
+        "concurrency": concurrency,
+        "subprocess": _timed_run(images, ocr_preprocess.recognize, concurrency, rounds),
+    }
+
+    t0 = time.perf_counter()
+    pool = ocr_workers.OCRWorkerPool(workers)
+    try:
+        report["pool"] = {
+            "workers": workers,
+            "engine": pool.engine,
+            "startup_s": round(time.perf_counter() - t0, 2),
+            **_timed_run(images, pool.ocr, concurrency, rounds),
+        }
+    finally:
+        pool.close()
+
+    return report
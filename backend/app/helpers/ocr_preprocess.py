@@ -0,0 +1,190 @@
+# backend/app/helpers/ocr_preprocess.py
+"""
+Image preprocessing + tuned Tesseract call for prescription OCR.
+
+Phone photos arrive at 12+ MP in colour, often rotated or slightly
+skewed. Tesseract time grows with pixel count, and its accuracy drops on
+low-contrast, skewed input, so preprocess() runs a configurable set of
+Pillow stages first:
+
+  exif       apply the EXIF orientation tag
+  downscale  shrink to OCR_TARGET_DPI for an OCR_PAGE_LONG_EDGE_IN page
+  grayscale  single channel
+  contrast   autocontrast (1% clip)
+  deskew     projection-profile skew estimate on a thumbnail, then rotate
+  binarize   Otsu threshold (off by default; hurts faint handwriting)
+
+OCR_STAGES picks the stages (comma-separated, applied in the order above).
+`flask bench-ocr <dir>` compares stage combinations on a fixture set.
+"""
+
+import os
+import time
+
+import numpy as np
+import pytesseract
+from PIL import Image, ImageOps
+
+from . import ocr_workers
+
+STAGE_ORDER = ("exif", "downscale", "grayscale", "contrast", "deskew", "binarize")
+DEFAULT_STAGES = "exif,downscale,grayscale,contrast,deskew"
+
+OCR_STAGES = tuple(
+    s.strip() for s in os.getenv("OCR_STAGES", DEFAULT_STAGES).split(",") if s.strip()
+)
+OCR_TARGET_DPI = int(os.getenv("OCR_TARGET_DPI", "300"))
+# Long edge of the paper being photographed (A5 prescription pad = 8.3 in)
+OCR_PAGE_LONG_EDGE_IN = float(os.getenv("OCR_PAGE_LONG_EDGE_IN", "8.3"))
+OCR_MAX_SKEW_DEG = float(os.getenv("OCR_MAX_SKEW_DEG", "10"))
+
+# --oem 1: LSTM engine only. --psm 6: one uniform block (printed labels,
+# typed prescriptions). If that yields almost nothing, retry with --psm 11
+# (sparse text), which copes better with scattered handwriting.
+OCR_TESSERACT_CONFIG = os.getenv(
+    "OCR_TESSERACT_CONFIG", f"--oem 1 --psm 6 --dpi {OCR_TARGET_DPI} -c preserve_interword_spaces=1"
+)
+OCR_SPARSE_CONFIG = os.getenv("OCR_SPARSE_CONFIG", f"--oem 1 --psm 11 --dpi {OCR_TARGET_DPI}")
+OCR_MIN_CHARS = int(os.getenv("OCR_MIN_CHARS", "20"))
+OCR_LANG = os.getenv("OCR_LANG", "eng")
+
+
+# -------------------------------
+# Stages
+# -------------------------------
+def _exif(img):
+    return ImageOps.exif_transpose(img)
+
+
+def _downscale(img):
+    scale = (OCR_TARGET_DPI * OCR_PAGE_LONG_EDGE_IN) / max(img.size)
+    dpi = img.info.get("dpi")
+    if dpi and dpi[0] and dpi[0] > OCR_TARGET_DPI:
+        scale = min(scale, OCR_TARGET_DPI / float(dpi[0]))
+    if scale >= 1:
+        return img
+    size = (max(1, round(img.width * scale)), max(1, round(img.height * scale)))
+    return img.resize(size, Image.LANCZOS, reducing_gap=3.0)
+
+
+def _grayscale(img):
+    if img.mode in ("RGBA", "LA", "P"):
+        img = img.convert("RGBA")
+        background = Image.new("RGBA", img.size, (255, 255, 255, 255))
+        img = Image.alpha_composite(background, img)
+    return img.convert("L")
+
+
+def _contrast(img):
+    return ImageOps.autocontrast(img, cutoff=1)
+
+
+def otsu_threshold(gray) -> int:
+    """Otsu's threshold from the 256-bin histogram of an L image."""
+    hist = gray.histogram()[:256]
+    total = sum(hist)
+    sum_all = sum(i * h for i, h in enumerate(hist))
+
+    best_t, best_var = 127, -1.0
+    weight_bg = sum_bg = 0
+    for t in range(256):
+        weight_bg += hist[t]
+        if weight_bg == 0:
+            continue
+        weight_fg = total - weight_bg
+        if weight_fg == 0:
+            break
+        sum_bg += t * hist[t]
+        mean_bg = sum_bg / weight_bg
+        mean_fg = (sum_all - sum_bg) / weight_fg
+        between = weight_bg * weight_fg * (mean_bg - mean_fg) ** 2
+        if between > best_var:
+            best_t, best_var = t, between
+    return best_t
+
+
+def estimate_skew(gray, max_deg: float = OCR_MAX_SKEW_DEG, step: float = 0.5) -> float:
+    """
+    Angle (degrees, counter-clockwise) that best aligns text rows: the
+    rotation whose horizontal ink profile has the sharpest row transitions.
+    """
+    small = gray.copy()
+    small.thumbnail((800, 800))
+    t = otsu_threshold(small)
+    ink = small.point(lambda p: 255 if p <= t else 0)
+
+    best_angle, best_score = 0.0, -1.0
+    # Smallest rotations first, so ties (e.g. a blank page) keep 0
+    for angle in sorted(np.arange(-max_deg, max_deg + step / 2, step), key=abs):
+        rotated = ink.rotate(float(angle), resample=Image.NEAREST, fillcolor=0)
+        rows = np.asarray(rotated, dtype=np.float32).sum(axis=1)
+        score = float(np.sum(np.diff(rows) ** 2))
+        if score > best_score:
+            best_angle, best_score = float(angle), score
+    return best_angle
+
+
+def _deskew(img):
+    gray = img if img.mode == "L" else img.convert("L")
+    angle = estimate_skew(gray)
+    if abs(angle) < 0.3:
+        return img
+    fill = 255 if img.mode == "L" else (255,) * len(img.getbands())
+    return img.rotate(angle, resample=Image.BICUBIC, expand=True, fillcolor=fill)
+
+
+def _binarize(img):
+    gray = img if img.mode == "L" else img.convert("L")
+    t = otsu_threshold(gray)
+    return gray.point(lambda p: 255 if p > t else 0)
+
+
+_STAGES = {
+    "exif": _exif,
+    "downscale": _downscale,
+    "grayscale": _grayscale,
+    "contrast": _contrast,
+    "deskew": _deskew,
+    "binarize": _binarize,
+}
+
+
+def preprocess(img, stages=None):
+    """
+    Runs the enabled stages in STAGE_ORDER.
+    Returns (image, {stage: seconds}).
+    """
+    enabled = set(OCR_STAGES if stages is None else stages)
+    unknown = enabled - set(STAGE_ORDER)
+    if unknown:
+        raise ValueError(f"Unknown OCR stages: {sorted(unknown)}")
+
+    timings = {}
+    for name in STAGE_ORDER:
+        if name in enabled:
+            t0 = time.perf_counter()
+            img = _STAGES[name](img)
+            timings[name] = time.perf_counter() - t0
+    return img, timings
+
+
+def _pytesseract_text(img, config: str) -> str:
+    return pytesseract.image_to_string(img, lang=OCR_LANG, config=config)
+
+
+def recognize(img, text_fn=_pytesseract_text) -> str:
+    """Block config first, retrying sparse-text mode on near-empty output."""
+    text = (text_fn(img, OCR_TESSERACT_CONFIG) or "").strip()
+    if len(text) >= OCR_MIN_CHARS:
+        return text
+
+    sparse = (text_fn(img, OCR_SPARSE_CONFIG) or "").strip()
+    return sparse if len(sparse) > len(text) else text
+
+
+def ocr_text(img) -> str:
+    """OCR in the worker pool when OCR_WORKERS > 0 (helpers/ocr_workers.py), else in this thread."""
+    pool = ocr_workers.get_pool()
+    if pool is not None:
+        return pool.ocr(img)
+    return recognize(img)
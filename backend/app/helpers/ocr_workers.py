@@ -0,0 +1,298 @@
+# backend/app/helpers/ocr_workers.py
+"""
+Long-lived OCR worker processes.
+
+pytesseract starts a `tesseract` process per image, writes temp files and
+reloads the language data every time, inside the web worker's thread.
+With OCR_WORKERS=N, ocr_preprocess.ocr_text() hands images to N spawned
+processes instead. Each one keeps a warm engine:
+
+- tesserocr (native API binding, optional dependency): one PyTessBaseAPI
+  per config, language data loaded once
+- pytesseract otherwise, so OCR still works off the request thread
+
+Images go over a pipe as raw pixel bytes (mode + size header, no
+encoding or temp files). A job that runs past OCR_TIMEOUT_S gets its
+worker killed and replaced. Replacements start on a background thread
+(the caller gets its error right away) and are retried until one comes
+up, so the pool never shrinks.
+"""
+
+import atexit
+import multiprocessing
+import os
+import queue
+import shlex
+import threading
+import time
+
+from PIL import Image
+
+from ..utils import metrics
+
+OCR_WORKERS = int(os.getenv("OCR_WORKERS", "0"))
+OCR_TIMEOUT_S = float(os.getenv("OCR_TIMEOUT_S", "60"))
+OCR_WORKER_START_TIMEOUT_S = 60
+OCR_RESPAWN_BACKOFF_S = (1, 2, 5, 10, 30)
+
+_PIPE_MODES = ("1", "L", "RGB", "RGBA")
+
+
+# -------------------------------
+# Engines (run inside the worker process)
+# -------------------------------
+def parse_tesseract_config(config: str):
+    """'--oem 1 --psm 6 --dpi 300 -c k=v' -> (psm, oem, {variable: value})"""
+    psm, oem, variables = None, None, {}
+    args = shlex.split(config or "")
+    i = 0
+    while i < len(args):
+        arg = args[i]
+        value = args[i + 1] if i + 1 < len(args) else None
+        if arg == "--psm":
+            psm, i = int(value), i + 2
+        elif arg == "--oem":
+            oem, i = int(value), i + 2
+        elif arg == "--dpi":
+            variables["user_defined_dpi"], i = value, i + 2
+        elif arg == "-c" and value and "=" in value:
+            k, v = value.split("=", 1)
+            variables[k], i = v, i + 2
+        else:
+            i += 1
+    return psm, oem, variables
+
+
+class _TesserocrEngine:
+    name = "tesserocr"
+
+    def __init__(self, lang: str):
+        import tesserocr
+
+        self._tesserocr = tesserocr
+        self._lang = lang
+        self._apis = {}
+
+    def _api(self, config: str):
+        api = self._apis.get(config)
+        if api is None:
+            psm, oem, variables = parse_tesseract_config(config)
+            kwargs = {"lang": self._lang}
+            if psm is not None:
+                kwargs["psm"] = psm
+            if oem is not None:
+                kwargs["oem"] = oem
+            api = self._tesserocr.PyTessBaseAPI(**kwargs)
+            for k, v in variables.items():
+                api.SetVariable(k, v)
+            self._apis[config] = api
+        return api
+
+    def text(self, img, config: str) -> str:
+        api = self._api(config)
+        api.SetImage(img)
+        return api.GetUTF8Text()
+
+
+class _PytesseractEngine:
+    name = "pytesseract"
+
+    def __init__(self, lang: str):
+        import pytesseract
+
+        self._pytesseract = pytesseract
+        self._lang = lang
+
+    def text(self, img, config: str) -> str:
+        return self._pytesseract.image_to_string(img, lang=self._lang, config=config)
+
+
+def _make_engine(lang: str):
+    try:
+        return _TesserocrEngine(lang)
+    except ImportError:
+        return _PytesseractEngine(lang)
+
+
+def _worker_main(conn):
+    from .ocr_preprocess import OCR_LANG, recognize
+
+    engine = _make_engine(OCR_LANG)
+    conn.send(("ready", engine.name))
+
+    while True:
+        try:
+            header = conn.recv()
+        except (EOFError, OSError):
+            break
+        if header is None:
+            break
+
+        mode, size = header
+        raw = conn.recv_bytes()
+        t0 = time.perf_counter()
+        try:
+            text = recognize(Image.frombytes(mode, size, raw), engine.text)
+            conn.send(("ok", text, time.perf_counter() - t0))
+        except Exception as e:
+            conn.send(("error", repr(e), time.perf_counter() - t0))
+
+
+# -------------------------------
+# Pool (runs in the web process)
+# -------------------------------
+class _Worker:
+    def __init__(self, ctx):
+        self.conn, child = ctx.Pipe()
+        self.proc = ctx.Process(target=_worker_main, args=(child,), daemon=True, name="ocr-worker")
+        self.proc.start()
+        child.close()
+
+        if not self.conn.poll(OCR_WORKER_START_TIMEOUT_S):
+            self.kill()
+            raise RuntimeError("OCR worker did not start in time")
+        _status, self.engine = self.conn.recv()
+
+    def kill(self):
+        try:
+            self.conn.close()
+        finally:
+            if self.proc.is_alive():
+                self.proc.kill()
+            self.proc.join(timeout=5)
+
+    def stop(self):
+        try:
+            self.conn.send(None)
+        except (OSError, ValueError):
+            pass
+        self.proc.join(timeout=5)
+        if self.proc.is_alive():
+            self.kill()
+
+
+class OCRWorkerPool:
+    def __init__(self, size: int, timeout_s: float = OCR_TIMEOUT_S):
+        # spawn, not fork: the web process has threads and open DB sockets
+        self._ctx = multiprocessing.get_context("spawn")
+        self.size = size
+        self.timeout_s = timeout_s
+        self._idle = queue.Queue()
+        self._workers = []
+        self._respawning = 0
+        self._closed = threading.Event()
+        self._lock = threading.Lock()
+        for _ in range(size):
+            self._add_worker()
+
+    @property
+    def engine(self):
+        return self._workers[0].engine if self._workers else None
+
+    def _add_worker(self):
+        worker = _Worker(self._ctx)
+        with self._lock:
+            self._workers.append(worker)
+        self._idle.put(worker)
+
+    def _replace(self, worker):
+        """Takes the worker out of the pool; a background thread kills it and starts its successor."""
+        with self._lock:
+            self._workers.remove(worker)
+            self._respawning += 1
+        metrics.incr("ocr_pool.restart")
+        threading.Thread(target=self._respawn, args=(worker,), daemon=True, name="ocr-respawn").start()
+
+    def _respawn(self, dead):
+        dead.kill()
+        attempt = 0
+        try:
+            while not self._closed.is_set():
+                try:
+                    worker = _Worker(self._ctx)
+                except Exception as e:
+                    metrics.incr("ocr_pool.respawn_error")
+                    delay = OCR_RESPAWN_BACKOFF_S[min(attempt, len(OCR_RESPAWN_BACKOFF_S) - 1)]
+                    print(f"⚠️ OCR worker respawn failed (retrying in {delay}s):", e)
+                    attempt += 1
+                    self._closed.wait(delay)
+                    continue
+
+                with self._lock:
+                    if not self._closed.is_set():
+                        self._workers.append(worker)
+                        self._idle.put(worker)
+                        return
+                worker.stop()
+                return
+        finally:
+            with self._lock:
+                self._respawning -= 1
+
+    def ocr(self, img, timeout_s: float = None) -> str:
+        """Text for a (preprocessed) PIL image. Raises TimeoutError / RuntimeError."""
+        timeout_s = timeout_s or self.timeout_s
+        if img.mode not in _PIPE_MODES:
+            img = img.convert("RGB")
+        raw = img.tobytes()
+
+        t_wait = time.perf_counter()
+        worker = self._idle.get(timeout=timeout_s)
+        metrics.observe("ocr_pool.queue_wait", time.perf_counter() - t_wait)
+        metrics.incr("ocr_pool.jobs")
+
+        t0 = time.perf_counter()
+        try:
+            worker.conn.send((img.mode, img.size))
+            worker.conn.send_bytes(raw)
+            if not worker.conn.poll(timeout_s):
+                metrics.incr("ocr_pool.timeout")
+                self._replace(worker)
+                raise TimeoutError(f"OCR took longer than {timeout_s:.0f}s")
+            status, payload, _worker_s = worker.conn.recv()
+        except (EOFError, OSError) as e:
+            metrics.incr("ocr_pool.error")
+            self._replace(worker)
+            raise RuntimeError(f"OCR worker died: {e!r}")
+
+        self._idle.put(worker)
+        metrics.observe("ocr_pool.ocr", time.perf_counter() - t0)
+        if status != "ok":
+            metrics.incr("ocr_pool.error")
+            raise RuntimeError(f"OCR failed in worker: {payload}")
+        return payload
+
+    def close(self):
+        self._closed.set()
+        with self._lock:
+            workers, self._workers = self._workers, []
+        for worker in workers:
+            worker.stop()
+
+    def stats(self) -> dict:
+        return {
+            "workers": len(self._workers),
+            "idle": self._idle.qsize(),
+            "respawning": self._respawning,
+            "engine": self.engine,
+        }
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pool():
+    """The process-wide pool (started on first use), or None if OCR_WORKERS=0."""
+    global _pool
+    if OCR_WORKERS <= 0:
+        return None
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                t0 = time.perf_counter()
+                _pool = OCRWorkerPool(OCR_WORKERS)
+                atexit.register(_pool.close)
+                metrics.register_collector("ocr_pool", _pool.stats)
+                print(f"OCR worker pool started: {OCR_WORKERS} x {_pool.engine} in {time.perf_counter() - t0:.2f}s")
+    return _pool
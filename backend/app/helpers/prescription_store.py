@@ -0,0 +1,301 @@
+# backend/app/helpers/prescription_store.py
+"""
+Prescription images in the content-addressed blob store.
+
+The prescriptions table keeps image_sha256 / image_size / image_mime; the
+bytes live in utils/blobstore.py. Rows written before the move still carry
+their bytes in the (deferred) `uploaded` column until
+`flask migrate-prescription-blobs` copies them out.
+
+A re-sent prescription is answered from the same user's stored
+interpretation: the identical file before OCR (find_duplicate, by content
+hash), or a re-taken photo after OCR but before the LLM call
+(find_near_duplicate). A 64-bit perceptual hash (dHash) picks near-identical
+photos and their OCR text has to agree too, because two different
+prescriptions written on the same pre-printed pad can look almost the same.
+
+Thumbnails (THUMB_MAX_EDGE px, WebP or JPEG) are blobs too, keyed by
+thumb_sha256. New photos get one at ingest; PDFs and older rows get one on
+the first GET /api/prescriptions/<id>/thumbnail (get_thumbnail).
+"""
+
+import io
+import os
+import re
+import time
+from datetime import datetime, timedelta
+from difflib import SequenceMatcher
+
+from PIL import Image, ImageOps, features
+
+from .media_ingest import PDFIUM_LOCK
+from ..models import db, Prescription
+from ..utils import metrics
+from ..utils.blobstore import get_store, sniff_mime
+
+MIGRATE_BATCH_SIZE = 50
+
+# Near-duplicate = same user, within the window, dHash Hamming distance <= max,
+# and OCR texts at least this similar (difflib ratio, 0..1)
+PHASH_MAX_DISTANCE = int(os.getenv("PRESCRIPTION_PHASH_MAX_DISTANCE", "6"))
+NEAR_MIN_TEXT_RATIO = float(os.getenv("PRESCRIPTION_NEAR_MIN_TEXT_RATIO", "0.9"))
+DEDUP_WINDOW_DAYS = int(os.getenv("PRESCRIPTION_DEDUP_WINDOW_DAYS", "30"))
+DEDUP_LOOKBACK = 50
+
+# Stored when the LLM returned nothing usable; never served as a duplicate answer
+UNINTERPRETED_RESPONSE = (
+    "⚠️ I extracted some text but couldn't interpret it confidently. "
+    "Please upload a clearer photo, or type out the medicine names and instructions."
+)
+
+THUMB_MAX_EDGE = int(os.getenv("THUMB_MAX_EDGE", "256"))
+THUMB_QUALITY = int(os.getenv("THUMB_QUALITY", "70"))
+THUMB_FORMAT = "WEBP" if features.check("webp") else "JPEG"
+
+def perceptual_hash(img) -> str:
+    """64-bit difference hash of a PIL image as 16 hex chars."""
+    small = ImageOps.exif_transpose(img).convert("L").resize((9, 8), Image.LANCZOS)
+    px = small.tobytes()
+    bits = 0
+    for row in range(8):
+        for col in range(8):
+            bits = (bits << 1) | (px[row * 9 + col] > px[row * 9 + col + 1])
+    return f"{bits:016x}"
+
+
+def hamming(a: str, b: str) -> int:
+    return bin(int(a, 16) ^ int(b, 16)).count("1")
+
+
+def _normalized_text(text: str) -> str:
+    return " ".join(re.sub(r"[^a-z0-9]+", " ", (text or "").lower()).split())
+
+
+def text_similarity(a: str, b: str) -> float:
+    """difflib ratio of two OCR texts, ignoring case, punctuation and spacing."""
+    a, b = _normalized_text(a), _normalized_text(b)
+    if not a or not b:
+        return 0.0
+    matcher = SequenceMatcher(None, a, b, autojunk=False)
+    if matcher.real_quick_ratio() < NEAR_MIN_TEXT_RATIO or matcher.quick_ratio() < NEAR_MIN_TEXT_RATIO:
+        return 0.0  # upper bounds already too low
+    return matcher.ratio()
+
+
+def _interpreted(user_id: int):
+    """This user's rows with a successful interpretation (other users' answers are theirs)."""
+    return (
+        Prescription.user_id == user_id,
+        Prescription.response.isnot(None),
+        Prescription.response != "",
+        Prescription.response != UNINTERPRETED_RESPONSE,
+    )
+
+
+def find_duplicate(user_id: int, sha256: str):
+    """The same user's previous interpreted prescription for the identical file, or None."""
+    t0 = time.perf_counter()
+    metrics.incr("prescription_dedup.lookup")
+    try:
+        row = (
+            Prescription.query
+            .filter(Prescription.image_sha256 == sha256, *_interpreted(user_id))
+            .order_by(Prescription.id.desc())
+            .first()
+        )
+        metrics.incr("prescription_dedup.exact_hit" if row is not None else "prescription_dedup.miss")
+        return row
+    finally:
+        metrics.observe("prescription_dedup.lookup", time.perf_counter() - t0)
+
+
+def find_near_duplicate(user_id: int, phash: str, text: str):
+    """
+    The same user's recent interpreted prescription whose photo is
+    near-identical (dHash) AND whose OCR text matches this one's, or None.
+    """
+    if not phash or not _normalized_text(text):
+        return None
+
+    t0 = time.perf_counter()
+    try:
+        since = datetime.utcnow() - timedelta(days=DEDUP_WINDOW_DAYS)
+        recent = (
+            db.session.query(Prescription.id, Prescription.image_phash)
+            .filter(Prescription.timestamp >= since, Prescription.image_phash.isnot(None), *_interpreted(user_id))
+            .order_by(Prescription.timestamp.desc())
+            .limit(DEDUP_LOOKBACK)
+            .all()
+        )
+        close = sorted(
+            (hamming(phash, r.image_phash), r.id) for r in recent
+            if hamming(phash, r.image_phash) <= PHASH_MAX_DISTANCE
+        )
+        for _distance, pid in close:
+            row = db.session.get(Prescription, pid)
+            if text_similarity(text, row.ocr_text) >= NEAR_MIN_TEXT_RATIO:
+                metrics.incr("prescription_dedup.near_hit")
+                return row
+            metrics.incr("prescription_dedup.near_rejected")
+        return None
+    finally:
+        metrics.observe("prescription_dedup.near_lookup", time.perf_counter() - t0)
+
+
+def dedup_stats() -> dict:
+    exact = metrics.get_counter("prescription_dedup.exact_hit")
+    near = metrics.get_counter("prescription_dedup.near_hit")
+    lookups = metrics.get_counter("prescription_dedup.lookup")
+    return {
+        "lookups": lookups,
+        "exact_hits": exact,
+        "near_hits": near,
+        "near_rejected": metrics.get_counter("prescription_dedup.near_rejected"),
+        "hit_rate": metrics.hit_rate(exact + near, lookups),
+    }
+
+
+metrics.register_collector("prescription_dedup", dedup_stats)
+
+
+def store_image(data: bytes, media_type: str = None):
+    """Writes the bytes to the blob store -> (sha256, size, mime)."""
+    mime = media_type if media_type and media_type != "application/octet-stream" else sniff_mime(data)
+    key = get_store().put(data)
+    return key, len(data), mime
+
+
+def load_image(prescription: Prescription):
+    """Image bytes for a prescription, or None (blob store first, then the legacy column)."""
+    if prescription.image_sha256:
+        try:
+            return get_store().get(prescription.image_sha256)
+        except KeyError:
+            print(f"⚠️ Blob missing for prescription {prescription.id}: {prescription.image_sha256}")
+            return None
+    return prescription.uploaded
+
+
+def make_thumbnail(img) -> bytes:
+    """Encoded preview of a PIL image (upright, long edge <= THUMB_MAX_EDGE)."""
+    if hasattr(img, "draft"):
+        img.draft("RGB", (THUMB_MAX_EDGE, THUMB_MAX_EDGE))  # JPEG: decode at reduced scale
+    thumb = ImageOps.exif_transpose(img)
+    thumb = thumb.convert("RGB") if thumb.mode not in ("RGB", "L") else thumb.copy()
+    thumb.thumbnail((THUMB_MAX_EDGE, THUMB_MAX_EDGE), Image.LANCZOS)
+
+    buf = io.BytesIO()
+    thumb.save(buf, THUMB_FORMAT, quality=THUMB_QUALITY)
+    return buf.getvalue()
+
+
+def _pdf_first_page(data: bytes):
+    import pypdfium2 as pdfium
+
+    with PDFIUM_LOCK:
+        doc = pdfium.PdfDocument(data)
+        try:
+            page = doc[0]
+            width, height = page.get_size()
+            img = page.render(scale=THUMB_MAX_EDGE / max(width, height, 1)).to_pil()
+            page.close()
+            return img
+        finally:
+            doc.close()
+
+
+def get_thumbnail(prescription: Prescription):
+    """
+    (bytes, mime, key) of the prescription's thumbnail, or None without an
+    image. Generated and saved on first use when the row has none yet.
+    """
+    store = get_store()
+    if prescription.thumb_sha256:
+        try:
+            data = store.get(prescription.thumb_sha256)
+            metrics.incr("prescription_thumb.hit")
+            return data, sniff_mime(data), prescription.thumb_sha256
+        except KeyError:
+            pass
+
+    data = load_image(prescription)
+    if not data:
+        return None
+
+    t0 = time.perf_counter()
+    try:
+        if sniff_mime(data, default=prescription.image_mime or "") == "application/pdf":
+            img = _pdf_first_page(data)
+        else:
+            img = Image.open(io.BytesIO(data))
+        thumb = make_thumbnail(img)
+    except Exception as e:
+        print(f"⚠️ Thumbnail failed for prescription {prescription.id}:", e)
+        metrics.incr("prescription_thumb.error")
+        return None
+    metrics.observe("prescription_thumb.generate", time.perf_counter() - t0)
+    metrics.incr("prescription_thumb.generated")
+
+    key = store.put(thumb)
+    try:
+        Prescription.query.filter_by(id=prescription.id).update({"thumb_sha256": key}, synchronize_session=False)
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        print(f"⚠️ Could not save thumbnail key for prescription {prescription.id}:", e)
+    return thumb, sniff_mime(thumb), key
+
+
+def migrate_legacy_blobs(batch_size: int = MIGRATE_BATCH_SIZE, limit: int = None) -> dict:
+    """
+    Moves inline `uploaded` bytes into the blob store, batch_size rows per
+    transaction (keyset on id), so only one batch of images is in memory.
+    Safe to stop and re-run: finished rows have image_sha256 set and
+    `uploaded` cleared.
+    """
+    moved = bytes_moved = 0
+    last_id = 0
+
+    while limit is None or moved < limit:
+        take = batch_size if limit is None else min(batch_size, limit - moved)
+        ids = [
+            row.id
+            for row in db.session.query(Prescription.id)
+            .filter(Prescription.id > last_id)
+            .filter(Prescription.uploaded.isnot(None))
+            .filter(Prescription.image_sha256.is_(None))
+            .order_by(Prescription.id)
+            .limit(take)
+        ]
+        if not ids:
+            break
+
+        try:
+            rows = db.session.query(Prescription.id, Prescription.uploaded).filter(Prescription.id.in_(ids)).all()
+            for pid, data in rows:
+                key, size, mime = store_image(data)
+                try:
+                    phash = perceptual_hash(Image.open(io.BytesIO(data)))
+                except Exception:
+                    phash = None
+                Prescription.query.filter_by(id=pid).update(
+                    {
+                        "image_sha256": key,
+                        "image_phash": phash,
+                        "image_size": size,
+                        "image_mime": mime,
+                        "uploaded": None,
+                    },
+                    synchronize_session=False,
+                )
+                bytes_moved += size
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+
+        moved += len(ids)
+        last_id = ids[-1]
+        print(f"Moved {moved} prescription images to the blob store (last id {last_id})")
+
+    return {"moved": moved, "bytes": bytes_moved}
@@ -1,17 +1,29 @@
 # backend/app/helpers/prescriptionuploader.py
+"""
+Prescription pipeline. Every stage is timed into metrics as
+"prescription.<stage>" (download, decode, thumbnail, dedup, preprocess,
+ocr, dedup_near, llm, db_write; queue_wait / send / total are recorded in whatsapp/bot.py), with
+bucketed image_size / ocr_chars dimensions, see GET /tasks/metrics?prefix=prescription.
+"""
 
 import io
 import os
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
-import requests
 from PIL import Image
-import pytesseract
 from dotenv import load_dotenv
 from openai import OpenAI
 
 from .gemini_client import gemini_generate
+from .media_ingest import PDF_MIME, MediaRejected, download_media, ocr_pdf
+from .ocr_preprocess import ocr_text, preprocess
+from .prescription_store import (
+    UNINTERPRETED_RESPONSE, find_duplicate, find_near_duplicate, make_thumbnail, perceptual_hash, store_image,
+)
+from ..utils import metrics
+from ..utils.blobstore import get_store, sha256_hex
 from ..models import Prescription, db
 
 load_dotenv()
@@ -19,6 +31,32 @@ load_dotenv()
 # ✅ Same OpenAI client style (explicit key for reliability)
 client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
 
+# WhatsApp allows up to 10 attachments per message
+MAX_MEDIA_ITEMS = 10
+MEDIA_CONCURRENCY = int(os.getenv("PRESCRIPTION_MEDIA_CONCURRENCY", "4"))
+
+# Dimension buckets (upper bound, label); fixed so series count stays small
+_SIZE_BUCKETS = ((500 * 1024, "<500KB"), (2 * 1024 * 1024, "0.5-2MB"), (5 * 1024 * 1024, "2-5MB"))
+_CHAR_BUCKETS = ((0, "0"), (200, "1-200"), (1000, "200-1000"))
+
+
+def size_bucket(nbytes: int) -> str:
+    for limit, label in _SIZE_BUCKETS:
+        if nbytes < limit:
+            return label
+    return ">5MB"
+
+
+def chars_bucket(chars: int) -> str:
+    for limit, label in _CHAR_BUCKETS:
+        if chars <= limit:
+            return label
+    return ">1000"
+
+
+def _observe(stage: str, t0: float, **dims):
+    metrics.observe(f"prescription.{stage}", time.perf_counter() - t0, **dims)
+
 
 def _is_openai_quota_or_rate_limit_error(e: Exception) -> bool:
     msg = str(e).lower()
@@ -31,12 +69,100 @@ def _is_openai_quota_or_rate_limit_error(e: Exception) -> bool:
     )
 
 
-def prescription_uploader(user_id, media_url, media_type):
+def _reply(ai_interpretation: str, repeat: bool = False) -> str:
+    header = (
+        "✅ I’ve already read this prescription. Here’s the interpretation again:\n\n"
+        if repeat
+        else "✅ Prescription uploaded successfully!\nHere’s what I could read and interpret:\n\n"
+    )
+    return f"{header}{ai_interpretation[:1200]}{'...' if len(ai_interpretation) > 1200 else ''}"
+
+
+def _fetch(item: dict, auth):
+    """Download + decode + hash one media item (no DB access; runs in a worker thread)."""
+    t0 = time.perf_counter()
+    try:
+        data, mime = download_media(item["url"], auth=auth)
+    except MediaRejected as e:
+        print("Prescription media rejected:", e)
+        metrics.incr("prescription.rejected")
+        item["error"] = e.user_message
+        return item
+    item["size_bucket"] = size_bucket(len(data))
+    _observe("download", t0, image_size=item["size_bucket"])
+
+    item.update(data=data, mime=mime, sha256=sha256_hex(data), phash=None, image=None, thumb=None)
+    if mime == PDF_MIME:
+        return item
+
+    t1 = time.perf_counter()
+    try:
+        item["image"] = Image.open(io.BytesIO(data))
+        item["phash"] = perceptual_hash(item["image"])  # forces the full decode
+        _observe("decode", t1, image_size=item["size_bucket"])
+    except Exception as e:
+        print(f"Prescription media #{item['index']} is not a readable image:", e)
+        item["error"] = "⚠️ I couldn't open that file as an image. Please upload a clear photo of the prescription."
+        return item
+
+    # PDFs get theirs lazily (prescription_store.get_thumbnail)
+    t2 = time.perf_counter()
+    try:
+        item["thumb"] = make_thumbnail(item["image"])
+        _observe("thumbnail", t2, image_size=item["size_bucket"])
+    except Exception as e:
+        print(f"Prescription thumbnail #{item['index']} failed:", e)
+    return item
+
+
+def _ocr(item: dict):
+    """OCR text for one fetched item; failures leave text empty so other attachments still count."""
+    try:
+        return _ocr_one(item)
+    except Exception as e:
+        print(f"Prescription OCR failed for #{item['index']}:", e)
+        metrics.incr("prescription.ocr_error")
+        item["text"] = ""
+        return item
+
+
+def _ocr_one(item: dict):
+    """PDF pages run in parallel, see media_ingest.ocr_pdf."""
+    t1 = time.perf_counter()
+    if item["mime"] == PDF_MIME:
+        item["text"] = ocr_pdf(item["data"])
+        _observe("ocr_pdf", t1, image_size=item["size_bucket"], ocr_chars=chars_bucket(len(item["text"])))
+        return item
+
+    image, _stage_times = preprocess(item.pop("image"))
+    _observe("preprocess", t1, image_size=item["size_bucket"])
+    t2 = time.perf_counter()
+    item["text"] = ocr_text(image)
+    _observe("ocr", t2, image_size=item["size_bucket"], ocr_chars=chars_bucket(len(item["text"])))
+    return item
+
+
+def _run_all(fn, items):
+    """fn over items concurrently; wall time ~ the slowest item."""
+    if len(items) == 1:
+        return [fn(items[0])]
+    with ThreadPoolExecutor(max_workers=min(len(items), MEDIA_CONCURRENCY), thread_name_prefix="rx-media") as ex:
+        return list(ex.map(fn, items))
+
+
+def prescription_uploader(user_id, media):
     """
-    1) Downloads WhatsApp media from Twilio
-    2) OCR extracts text
-    3) Interprets with OpenAI, falls back to Gemini on quota/rate-limit
-    4) Stores the prescription + AI response
+    media: [(media_url, media_type), ...] from one WhatsApp message.
+
+    1) Downloads every attachment from Twilio concurrently (a single re-sent
+       file is answered from the stored interpretation, see
+       prescription_store.find_duplicate)
+    2) OCR extracts text from all of them concurrently (a single re-taken
+       photo with matching text is answered from the stored interpretation,
+       see prescription_store.find_near_duplicate)
+    3) Interprets the merged text with one OpenAI call, falls back to
+       Gemini on quota/rate-limit
+    4) Stores one prescription row per image, sharing the AI response
     """
     try:
         # --- 1) Download media securely from Twilio ---
@@ -45,33 +171,53 @@ def prescription_uploader(user_id, media_url, media_type):
         if not account_sid or not auth_token:
             return False, "⚠️ Server is missing Twilio credentials. Please try again later."
 
-        t0 = time.time()
-        res = requests.get(media_url, auth=(account_sid, auth_token), timeout=25)
-        res.raise_for_status()
-        image_data = res.content
-        print(f"⏱ prescription download: {time.time() - t0:.2f}s")
+        items = [
+            {"index": i + 1, "url": url, "media_type": media_type, "error": None}
+            for i, (url, media_type) in enumerate(media[:MAX_MEDIA_ITEMS])
+        ]
+        auth = (account_sid, auth_token)
+        items = _run_all(lambda item: _fetch(item, auth), items)
 
-        # --- 2) OCR ---
-        try:
-            image = Image.open(io.BytesIO(image_data))
-        except Exception:
-            return False, "⚠️ I couldn't open that file as an image. Please upload a clear photo of the prescription."
+        ok_items = [item for item in items if not item["error"]]
+        if not ok_items:
+            return False, items[0]["error"]
 
-        t1 = time.time()
-        extracted_text = (pytesseract.image_to_string(image) or "").strip()
-        print(f"⏱ prescription OCR: {time.time() - t1:.2f}s")
+        # --- 1b) Re-sent photo? Answer from the stored interpretation ---
+        if len(items) == 1:
+            item = ok_items[0]
+            t0 = time.perf_counter()
+            previous = find_duplicate(user_id, item["sha256"])
+            _observe("dedup", t0)
+            if previous is not None:
+                print(f"♻️ prescription duplicate (exact) of id={previous.id}; skipping OCR/AI")
+                return True, _reply(previous.response, repeat=True)
 
-        if not extracted_text:
+        # --- 2) OCR ---
+        ok_items = _run_all(_ocr, ok_items)
+        read = [item for item in ok_items if item["text"]]
+        if not read:
             return False, (
                 "⚠️ I couldn't read any text from the prescription image. "
                 "Please try again with a clearer photo (good lighting, focused, straight-on)."
             )
 
+        if len(items) == 1:
+            extracted_text = read[0]["text"]
+
+            t0 = time.perf_counter()
+            previous = find_near_duplicate(user_id, read[0]["phash"], extracted_text)
+            _observe("dedup_near", t0)
+            if previous is not None:
+                print(f"♻️ prescription duplicate (near) of id={previous.id}; skipping AI")
+                return True, _reply(previous.response, repeat=True)
+        else:
+            extracted_text = "\n\n".join(f"=== Attachment {item['index']} ===\n{item['text']}" for item in read)
+
         # --- 3) AI Interpretation prompt (used by both providers) ---
         prompt = f"""
 You are a healthcare assistant helping users understand medical prescriptions.
 
-The following is text extracted from an image of a prescription:
+The following is text extracted from the image(s) of a prescription:
 
 \"\"\"{extracted_text}\"\"\"
 
@@ -88,7 +234,7 @@ Do not claim certainty if the OCR looks messy.
         ai_interpretation = ""
 
         # --- 4) Try OpenAI first ---
-        t2 = time.time()
+        t2 = time.perf_counter()
         try:
             completion = client.chat.completions.create(
                 model="gpt-4o-mini",
@@ -112,30 +258,35 @@ Do not claim certainty if the OCR looks messy.
             else:
                 raise
 
-        print(f"⏱ prescription AI: {time.time() - t2:.2f}s")
+        _observe("llm", t2, ocr_chars=chars_bucket(len(extracted_text)))
 
         if not (ai_interpretation or "").strip():
-            ai_interpretation = (
-                "⚠️ I extracted some text but couldn't interpret it confidently. "
-                "Please upload a clearer photo, or type out the medicine names and instructions."
-            )
+            ai_interpretation = UNINTERPRETED_RESPONSE
 
-        # --- 5) Save to DB ---
-        new_prescription = Prescription(
-            user_id=user_id,
-            uploaded=image_data,  # raw bytes
-            response=ai_interpretation,  # interpreted result
-            timestamp=datetime.utcnow(),
-        )
-        db.session.add(new_prescription)
+        # --- 5) Save images to the blob store, metadata + response to DB ---
+        t3 = time.perf_counter()
+        now = datetime.utcnow()
+        for item in ok_items:
+            image_key, image_size, image_mime = store_image(item["data"], item["mime"])
+            db.session.add(Prescription(
+                user_id=user_id,
+                image_sha256=image_key,
+                image_phash=item["phash"],
+                image_size=image_size,
+                image_mime=image_mime,
+                thumb_sha256=get_store().put(item["thumb"]) if item["thumb"] else None,
+                response=ai_interpretation,  # interpreted result
+                ocr_text=item.get("text") or None,
+                timestamp=now,
+            ))
         db.session.commit()
+        _observe("db_write", t3)
 
         # --- 6) WhatsApp reply ---
-        ai_reply = (
-            "✅ Prescription uploaded successfully!\n"
-            "Here’s what I could read and interpret:\n\n"
-            f"{ai_interpretation[:1200]}{'...' if len(ai_interpretation) > 1200 else ''}"
-        )
+        ai_reply = _reply(ai_interpretation)
+        unread = [str(item["index"]) for item in items if not item.get("text")]
+        if unread:
+            ai_reply += f"\n\n⚠️ I couldn’t read attachment(s) {', '.join(unread)}. Please resend a clearer photo if they matter."
         return True, ai_reply
 
     except Exception as e:
@@ -17,6 +17,12 @@ from app.models.models import (
     HealthTip,      
     ChatMemory,     
     PasswordResetToken,      
+    GeocodeCache,
+    ClinicSearchCache,
+    Clinic,
+    DailyStat,
+    RollupWatermark,
+    TableVersion,
 )
 
 __all__ = [
@@ -35,4 +41,10 @@ __all__ = [
     "HealthTip",     
     "ChatMemory",
     "PasswordResetToken",   
+    "GeocodeCache",
+    "ClinicSearchCache",
+    "Clinic",
+    "DailyStat",
+    "RollupWatermark",
+    "TableVersion",
 ]
@@ -1,15 +1,36 @@
 import secrets
 from datetime import datetime, timedelta
+from sqlalchemy import DDL, event
 from sqlalchemy.orm import validates
 from sqlalchemy_serializer import SerializerMixin
 from app.utils.db import db
 import hashlib
 
+# Trigram indexes back the ILIKE '%word%' searches of utils/query_filters.py
+event.listen(
+    db.metadata, "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql"),
+)
+
+
+def trigram_index(name, column):
+    """GIN pg_trgm index on PostgreSQL; skipped on other databases."""
+    return db.Index(
+        name, column, postgresql_using="gin", postgresql_ops={column: "gin_trgm_ops"},
+    ).ddl_if(dialect="postgresql")
+
 ##############################################################
 # USERS TABLE — Base identity for all user roles
 ##############################################################
 class User(db.Model, SerializerMixin):
     __tablename__ = 'users'
+    # Keyset pagination order + admin filters / search (utils/pagination.py, utils/query_filters.py)
+    __table_args__ = (
+        db.Index("ix_users_created_at_id", "created_at", "id"),
+        db.Index("ix_users_role_created_at_id", "role", "created_at", "id"),
+        trigram_index("ix_users_email_trgm", "email"),
+        trigram_index("ix_users_phone_trgm", "phone"),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     phone = db.Column(db.String(20), unique=True, nullable=False)
@@ -68,6 +89,8 @@ class User(db.Model, SerializerMixin):
 ##############################################################
 class Admin(db.Model, SerializerMixin):
     __tablename__ = 'admins'
+    # (sort column, id) for keyset pagination, see utils/pagination.py
+    __table_args__ = (db.Index("ix_admins_created_at_id", "created_at", "id"),)
 
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'))
@@ -114,6 +137,8 @@ class AdminInvite(db.Model):
 ##############################################################
 class MedicalPractitioner(db.Model, SerializerMixin):
     __tablename__ = 'medical_practitioners'
+    # (sort column, id) for keyset pagination, see utils/pagination.py
+    __table_args__ = (db.Index("ix_medical_practitioners_created_at_id", "created_at", "id"),)
 
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'))
@@ -136,6 +161,8 @@ class MedicalPractitioner(db.Model, SerializerMixin):
 ##############################################################
 class Associate(db.Model, SerializerMixin):
     __tablename__ = 'associates'
+    # (sort column, id) for keyset pagination, see utils/pagination.py
+    __table_args__ = (db.Index("ix_associates_created_at_id", "created_at", "id"),)
 
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'))
@@ -156,6 +183,13 @@ class Associate(db.Model, SerializerMixin):
 ##############################################################
 class Participant(db.Model, SerializerMixin):
     __tablename__ = 'participants'
+    # Keyset pagination order + admin filters / search (utils/pagination.py, utils/query_filters.py)
+    __table_args__ = (
+        db.Index("ix_participants_created_at_id", "created_at", "id"),
+        db.Index("ix_participants_user_id", "user_id"),
+        trigram_index("ix_participants_first_name_trgm", "first_name"),
+        trigram_index("ix_participants_last_name_trgm", "last_name"),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
@@ -176,6 +210,8 @@ class Participant(db.Model, SerializerMixin):
 ##############################################################
 class Message(db.Model, SerializerMixin):
     __tablename__ = 'messages'
+    # (sort column, id) for keyset pagination, see utils/pagination.py
+    __table_args__ = (db.Index("ix_messages_timestamp_id", "timestamp", "message_id"),)
 
     message_id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'))
@@ -188,6 +224,8 @@ class Message(db.Model, SerializerMixin):
 
 class UserMessage(db.Model, SerializerMixin):
     __tablename__ = 'user_message'
+    # (sort column, id) for keyset pagination, see utils/pagination.py
+    __table_args__ = (db.Index("ix_user_message_timestamp_id", "timestamp", "id"),)
 
     id = db.Column(db.Integer, primary_key=True)
     message = db.Column(db.Text)
@@ -201,6 +239,8 @@ class UserMessage(db.Model, SerializerMixin):
 
 class ResponseMessage(db.Model, SerializerMixin):
     __tablename__ = 'response_message'
+    # (sort column, id) for keyset pagination, see utils/pagination.py
+    __table_args__ = (db.Index("ix_response_message_timestamp_id", "timestamp", "id"),)
 
     id = db.Column(db.Integer, primary_key=True)
     response = db.Column(db.Text)
@@ -220,7 +260,16 @@ class Prescription(db.Model, SerializerMixin):
 
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
-    uploaded = db.Column(db.LargeBinary)
+    # Legacy inline image bytes; new uploads live in the blob store (utils/blobstore.py).
+    # Deferred so list queries never load it; emptied by `flask migrate-prescription-blobs`.
+    uploaded = db.deferred(db.Column(db.LargeBinary))
+    image_sha256 = db.Column(db.String(64), index=True)
+    image_phash = db.Column(db.String(16))  # 64-bit dHash, hex (compared in Python, not indexed)
+    image_size = db.Column(db.Integer)
+    image_mime = db.Column(db.String(100))
+    thumb_sha256 = db.Column(db.String(64))  # small WebP/JPEG preview in the blob store
+    # OCR text the response was generated from (confirms near-duplicate photos)
+    ocr_text = db.deferred(db.Column(db.Text))
     response = db.Column(db.Text)
     input_token = db.Column(db.String(255))
     output_token = db.Column(db.String(255))
@@ -228,6 +277,12 @@ class Prescription(db.Model, SerializerMixin):
 
     user = db.relationship('User', back_populates='prescriptions')
 
+    __table_args__ = (
+        db.Index("ix_prescriptions_user_timestamp", "user_id", "timestamp"),
+        db.Index("ix_prescriptions_timestamp_id", "timestamp", "id"),
+        trigram_index("ix_prescriptions_response_trgm", "response"),
+    )
+
     def __repr__(self):
         return f"<Prescription id={self.id} user_id={self.user_id}>"
 
@@ -255,6 +310,8 @@ class HealthTip(db.Model):
 ##############################################################
 class Tip(db.Model, SerializerMixin):
     __tablename__ = 'tips'
+    # (sort column, id) for keyset pagination, see utils/pagination.py
+    __table_args__ = (db.Index("ix_tips_timestamp_id", "timestamp", "id"),)
 
     id = db.Column(db.Integer, primary_key=True)
     title = db.Column(db.String(255), nullable=False)
@@ -271,11 +328,13 @@ class Tip(db.Model, SerializerMixin):
 ##############################################################
 class ChatSession(db.Model, SerializerMixin):
     __tablename__ = 'chat_sessions'
+    # (sort column, id) for keyset pagination, see utils/pagination.py
+    __table_args__ = (db.Index("ix_chat_sessions_started_at_id", "started_at", "id"),)
 
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
     session_state = db.Column(db.String(255))
-    context = db.Column(db.Text)
+    context = db.deferred(db.Column(db.Text))  # only the /api/chats list reads it
     started_at = db.Column(db.DateTime, default=datetime.utcnow)
     last_activity = db.Column(db.DateTime)
     is_active = db.Column(db.Boolean, default=True)
@@ -291,6 +350,8 @@ class ChatSession(db.Model, SerializerMixin):
 ##############################################################
 class ChatMemory(db.Model, SerializerMixin):
     __tablename__ = 'chat_memory'
+    # Per-day distinct-user counts (routes/stats_routes.py) read only this index
+    __table_args__ = (db.Index("ix_chat_memory_timestamp_user_id", "timestamp", "user_id"),)
 
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
@@ -350,4 +411,129 @@ class PasswordResetToken(db.Model):
             return False
         if datetime.utcnow() > self.expires_at:
             return False
-        return True
\ No newline at end of file
+        return True
+
+##############################################################
+# GEOCODE CACHE — clinic finder location text -> coordinates
+##############################################################
+class GeocodeCache(db.Model):
+    __tablename__ = "geocode_cache"
+
+    id = db.Column(db.Integer, primary_key=True)
+
+    # Normalized location text (see helpers/geocache.normalize_location)
+    query_key = db.Column(db.String(255), nullable=False, unique=True, index=True)
+
+    # lat/lng are NULL for negative entries (nobody could resolve the text)
+    lat = db.Column(db.Float, nullable=True)
+    lng = db.Column(db.Float, nullable=True)
+    formatted_address = db.Column(db.String(512), nullable=True)
+    provider = db.Column(db.String(20), nullable=False)  # google | nominatim | none
+
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    expires_at = db.Column(db.DateTime, nullable=False, index=True)
+
+    def is_valid(self) -> bool:
+        return datetime.utcnow() <= self.expires_at
+
+    def __repr__(self):
+        return f"<GeocodeCache {self.query_key!r} provider={self.provider}>"
+
+
+##############################################################
+# CLINIC SEARCH CACHE — nearby results per geohash cell + radius
+##############################################################
+class ClinicSearchCache(db.Model):
+    __tablename__ = "clinic_search_cache"
+    __table_args__ = (
+        db.UniqueConstraint("geohash", "radius_m", name="uq_clinic_search_cache_cell_radius"),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    geohash = db.Column(db.String(12), nullable=False)
+    radius_m = db.Column(db.Integer, nullable=False)
+    provider = db.Column(db.String(20), nullable=False)  # google | overpass
+
+    # JSON list of clinic records (name/address/lat/lng/rating/maps_url)
+    records = db.Column(db.Text, nullable=False)
+
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    expires_at = db.Column(db.DateTime, nullable=False, index=True)
+
+    def is_valid(self) -> bool:
+        return datetime.utcnow() <= self.expires_at
+
+    def __repr__(self):
+        return f"<ClinicSearchCache {self.geohash}/{self.radius_m} provider={self.provider}>"
+
+
+##############################################################
+# DAILY STATS — analytics rollup (helpers/analytics_rollup.py)
+##############################################################
+class DailyStat(db.Model):
+    __tablename__ = "daily_stats"
+    __table_args__ = (
+        # Also the read index: one metric over a day range
+        db.UniqueConstraint("metric", "day", "dimension", name="uq_daily_stats_metric_day_dimension"),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    day = db.Column(db.Date, nullable=False)
+    metric = db.Column(db.String(40), nullable=False)  # e.g. new_users, messages_in
+    dimension = db.Column(db.String(40), nullable=False, default="")  # e.g. role for new_users
+    value = db.Column(db.BigInteger, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+
+    def __repr__(self):
+        return f"<DailyStat {self.day} {self.metric}[{self.dimension}]={self.value}>"
+
+
+class RollupWatermark(db.Model):
+    __tablename__ = "rollup_watermarks"
+
+    name = db.Column(db.String(40), primary_key=True)
+    # daily_stats rows for first_day..last_day (inclusive) are complete and final;
+    # later days are re-computed on every run
+    first_day = db.Column(db.Date, nullable=False)
+    last_day = db.Column(db.Date, nullable=False)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+
+    def __repr__(self):
+        return f"<RollupWatermark {self.name} {self.first_day}..{self.last_day}>"
+
+
+##############################################################
+# TABLE VERSIONS — HTTP cache validators (utils/http_cache.py)
+##############################################################
+class TableVersion(db.Model):
+    __tablename__ = "table_versions"
+
+    name = db.Column(db.String(64), primary_key=True)  # table name
+    # Bumped in the same transaction as every insert / update / delete of the table
+    version = db.Column(db.BigInteger, nullable=False, default=0)
+
+    def __repr__(self):
+        return f"<TableVersion {self.name}={self.version}>"
+
+
+##############################################################
+# CLINICS — offline index imported from an OpenStreetMap extract
+##############################################################
+class Clinic(db.Model):
+    __tablename__ = "clinics"
+
+    id = db.Column(db.Integer, primary_key=True)
+    osm_id = db.Column(db.String(32), nullable=False, unique=True)  # e.g. "node/123"
+    name = db.Column(db.String(255), nullable=False)
+    amenity = db.Column(db.String(32))  # clinic | hospital
+    address = db.Column(db.String(512))
+    lat = db.Column(db.Float, nullable=False)
+    lng = db.Column(db.Float, nullable=False)
+
+    # Sorted geohash column = the spatial index (prefix range scans)
+    geohash = db.Column(db.String(12), nullable=False, index=True)
+
+    imported_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+
+    def __repr__(self):
+        return f"<Clinic {self.osm_id} {self.name!r}>"
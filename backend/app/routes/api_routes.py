@@ -1,15 +1,20 @@
 # backend/app/routes/api_routes.py
+from sqlalchemy import or_
 from sqlalchemy.exc import IntegrityError
 import traceback
 from werkzeug.exceptions import BadRequest
-from flask import Blueprint, jsonify, request
+from flask import Blueprint, Response, jsonify, request
 from werkzeug.security import generate_password_hash, check_password_hash
 from flask_jwt_extended import create_access_token, jwt_required, get_jwt_identity
 import os
 import hashlib
 from app.utils.mailer import send_email
 from datetime import timedelta, datetime
+from app.utils.auth import admin_required
 from app.utils.db import db
+from app.utils.http_cache import cached_list
+from app.utils.pagination import PageError, page_response, paginate
+from app.utils.query_filters import FilterError, date_range, ilike_any, int_arg, text_search
 from app.models.models import (
     User,
     MedicalPractitioner,
@@ -28,10 +33,51 @@ from app.models.models import (
 api_bp = Blueprint("api", __name__, url_prefix="/api")
 
 
+@api_bp.errorhandler(PageError)
+@api_bp.errorhandler(FilterError)
+def handle_query_arg_error(e):
+    return jsonify({"error": str(e)}), 400
+
+
 # 🧍 USERS
+def _user_matches(pattern, _word):
+    """Email / phone / role, or a first or last name on any of the user's profiles."""
+    return or_(
+        ilike_any(pattern, User.email, User.phone, User.role),
+        *[
+            relationship.any(ilike_any(pattern, profile.first_name, profile.last_name))
+            for relationship, profile in (
+                (User.participants, Participant),
+                (User.medical_practitioners, MedicalPractitioner),
+                (User.admins, Admin),
+                (User.associates, Associate),
+            )
+        ],
+    )
+
+
+# List endpoints select just the columns they return: rows come back as
+# plain tuples, with no ORM entities, identity map or deferred-column loads.
+USER_LIST_COLUMNS = (
+    User.id,
+    User.phone,
+    User.email,
+    User.role,
+    User.created_at,
+)
+
+
 @api_bp.route("/users", methods=["GET"])
 def get_users():
-    users = User.query.all()
+    """Filters: ?role=participant[,practitioner] &since= &until= (created_at) &q= (email, phone, name)"""
+    query = db.session.query(*USER_LIST_COLUMNS)
+    roles = [r for r in (request.args.get("role") or "").split(",") if r]
+    if roles:
+        query = query.filter(User.role.in_(roles))
+    query = date_range(query, User.created_at)
+    query = text_search(query, _user_matches)
+
+    users, next_cursor = paginate(query, User.created_at, User.id)
     data = [
         {
             "id": u.id,
@@ -42,7 +88,7 @@ def get_users():
         }
         for u in users
     ]
-    return jsonify(data), 200
+    return page_response(data, next_cursor)
 
 
 
@@ -488,25 +534,90 @@ def reset_password():
 
 
 # 💊 PRESCRIPTIONS
+def _prescription_matches(pattern, word):
+    clauses = [
+        ilike_any(pattern, Prescription.response),
+        Prescription.user.has(ilike_any(pattern, User.email, User.phone)),
+    ]
+    if word.isdigit():
+        clauses.append(Prescription.user_id == int(word))
+    return or_(*clauses)
+
+
+PRESCRIPTION_LIST_COLUMNS = (
+    Prescription.id,
+    Prescription.user_id,
+    Prescription.response,
+    Prescription.timestamp,
+    Prescription.image_sha256,
+)
+
+
 @api_bp.route("/prescriptions", methods=["GET"])
 def get_prescriptions():
-    prescriptions = Prescription.query.all()
+    """Filters: ?user_id= &since= &until= (timestamp) &q= (response text, user email/phone, numeric user id)"""
+    query = db.session.query(*PRESCRIPTION_LIST_COLUMNS)
+    user_id = int_arg("user_id")
+    if user_id is not None:
+        query = query.filter(Prescription.user_id == user_id)
+    query = date_range(query, Prescription.timestamp)
+    query = text_search(query, _prescription_matches)
+
+    prescriptions, next_cursor = paginate(query, Prescription.timestamp, Prescription.id)
     data = [
         {
             "id": p.id,
             "user_id": p.user_id,
             "response": p.response,
-            "timestamp": p.timestamp.isoformat() if p.timestamp else None
+            "timestamp": p.timestamp.isoformat() if p.timestamp else None,
+            "thumbnail_url": f"/api/prescriptions/{p.id}/thumbnail" if p.image_sha256 else None,
         }
         for p in prescriptions
     ]
-    return jsonify(data), 200
+    return page_response(data, next_cursor)
+
+
+# Browsers keep the thumbnail but revalidate on every use: the ETag is the
+# thumbnail's blob hash, so an unchanged image costs a 304, while a replaced
+# or deleted prescription is never served from a stale cache.
+THUMBNAIL_CACHE_CONTROL = "private, no-cache"
+
+
+@api_bp.route("/prescriptions/<int:prescription_id>/thumbnail", methods=["GET"])
+@admin_required
+def get_prescription_thumbnail(prescription_id):
+    from app.helpers.prescription_store import get_thumbnail
+
+    prescription = db.session.get(Prescription, prescription_id)
+    if not prescription:
+        return jsonify({"error": "Prescription not found"}), 404
+
+    thumb = get_thumbnail(prescription)
+    if thumb is None:
+        return jsonify({"error": "No image for this prescription"}), 404
+
+    data, mime, key = thumb
+    response = Response(data, mimetype=mime)
+    response.headers["Cache-Control"] = THUMBNAIL_CACHE_CONTROL
+    response.set_etag(key)
+    return response.make_conditional(request)
 
 
 # 💡 TIPS
+TIP_LIST_COLUMNS = (
+    Tip.id,
+    Tip.title,
+    Tip.description,
+    Tip.status,
+    Tip.practitioner,
+    Tip.timestamp,
+)
+
+
 @api_bp.route("/tips", methods=["GET"])
+@cached_list(Tip)
 def get_tips():
-    tips = Tip.query.all()
+    tips, next_cursor = paginate(db.session.query(*TIP_LIST_COLUMNS), Tip.timestamp, Tip.id)
     data = [
         {
             "id": t.id,
@@ -518,13 +629,21 @@ def get_tips():
         }
         for t in tips
     ]
-    return jsonify(data), 200
+    return page_response(data, next_cursor)
 
 
 # 💬 MESSAGES
+MESSAGE_LIST_COLUMNS = (
+    Message.message_id,
+    Message.user_id,
+    Message.response_id,
+    Message.timestamp,
+)
+
+
 @api_bp.route("/messages", methods=["GET"])
 def get_messages():
-    messages = Message.query.all()
+    messages, next_cursor = paginate(db.session.query(*MESSAGE_LIST_COLUMNS), Message.timestamp, Message.message_id)
     data = [
         {
             "id": m.message_id,
@@ -534,13 +653,22 @@ def get_messages():
         }
         for m in messages
     ]
-    return jsonify(data), 200
+    return page_response(data, next_cursor)
 
 
 # 📥 USER MESSAGES
+USER_MESSAGE_LIST_COLUMNS = (
+    UserMessage.id,
+    UserMessage.message,
+    UserMessage.user_id,
+    UserMessage.response_id,
+    UserMessage.timestamp,
+)
+
+
 @api_bp.route("/user_messages", methods=["GET"])
 def get_user_messages():
-    messages = UserMessage.query.all()
+    messages, next_cursor = paginate(db.session.query(*USER_MESSAGE_LIST_COLUMNS), UserMessage.timestamp, UserMessage.id)
     data = [
         {
             "id": m.id,
@@ -551,13 +679,22 @@ def get_user_messages():
         }
         for m in messages
     ]
-    return jsonify(data), 200
+    return page_response(data, next_cursor)
 
 
 # 💬 RESPONSES
+RESPONSE_LIST_COLUMNS = (
+    ResponseMessage.id,
+    ResponseMessage.response,
+    ResponseMessage.input_token,
+    ResponseMessage.output_token,
+    ResponseMessage.timestamp,
+)
+
+
 @api_bp.route("/responses", methods=["GET"])
 def get_responses():
-    responses = ResponseMessage.query.all()
+    responses, next_cursor = paginate(db.session.query(*RESPONSE_LIST_COLUMNS), ResponseMessage.timestamp, ResponseMessage.id)
     data = [
         {
             "id": r.id,
@@ -568,13 +705,26 @@ def get_responses():
         }
         for r in responses
     ]
-    return jsonify(data), 200
+    return page_response(data, next_cursor)
 
 
 # 🩺 PRACTITIONERS
+PRACTITIONER_LIST_COLUMNS = (
+    MedicalPractitioner.id,
+    MedicalPractitioner.first_name,
+    MedicalPractitioner.last_name,
+    MedicalPractitioner.speciality,
+    MedicalPractitioner.title,
+    MedicalPractitioner.location,
+    MedicalPractitioner.description,
+    MedicalPractitioner.created_at,
+)
+
+
 @api_bp.route("/practitioners", methods=["GET"])
+@cached_list(MedicalPractitioner)
 def get_practitioners():
-    practitioners = MedicalPractitioner.query.all()
+    practitioners, next_cursor = paginate(db.session.query(*PRACTITIONER_LIST_COLUMNS), MedicalPractitioner.created_at, MedicalPractitioner.id)
     data = [
         {
             "id": m.id,
@@ -587,13 +737,23 @@ def get_practitioners():
         }
         for m in practitioners
     ]
-    return jsonify(data), 200
+    return page_response(data, next_cursor)
 
 
 # 👩‍⚕️ ADMINS
+ADMIN_LIST_COLUMNS = (
+    Admin.id,
+    Admin.first_name,
+    Admin.last_name,
+    Admin.designation,
+    Admin.created_at,
+)
+
+
 @api_bp.route("/admins", methods=["GET"])
+@cached_list(Admin)
 def get_admins():
-    admins = Admin.query.all()
+    admins, next_cursor = paginate(db.session.query(*ADMIN_LIST_COLUMNS), Admin.created_at, Admin.id)
     data = [
         {
             "id": a.id,
@@ -603,13 +763,24 @@ def get_admins():
         }
         for a in admins
     ]
-    return jsonify(data), 200
+    return page_response(data, next_cursor)
 
 
 # 🤝 ASSOCIATES
+ASSOCIATE_LIST_COLUMNS = (
+    Associate.id,
+    Associate.first_name,
+    Associate.last_name,
+    Associate.designation,
+    Associate.description,
+    Associate.created_at,
+)
+
+
 @api_bp.route("/associates", methods=["GET"])
+@cached_list(Associate)
 def get_associates():
-    associates = Associate.query.all()
+    associates, next_cursor = paginate(db.session.query(*ASSOCIATE_LIST_COLUMNS), Associate.created_at, Associate.id)
     data = [
         {
             "id": a.id,
@@ -620,13 +791,24 @@ def get_associates():
         }
         for a in associates
     ]
-    return jsonify(data), 200
+    return page_response(data, next_cursor)
 
 
 # 👩 PARTICIPANTS
+PARTICIPANT_LIST_COLUMNS = (
+    Participant.id,
+    Participant.user_id,
+    Participant.first_name,
+    Participant.last_name,
+    Participant.location,
+    Participant.age,
+    Participant.created_at,
+)
+
+
 @api_bp.route("/participants", methods=["GET"])
 def get_participants():
-    participants = Participant.query.all()
+    participants, next_cursor = paginate(db.session.query(*PARTICIPANT_LIST_COLUMNS), Participant.created_at, Participant.id)
     data = [
         {
             "id": p.id,
@@ -638,13 +820,24 @@ def get_participants():
         }
         for p in participants
     ]
-    return jsonify(data), 200
+    return page_response(data, next_cursor)
 
 
 # 💬 CHAT SESSIONS
+CHAT_SESSION_LIST_COLUMNS = (
+    ChatSession.id,
+    ChatSession.user_id,
+    ChatSession.session_state,
+    ChatSession.context,
+    ChatSession.started_at,
+    ChatSession.last_activity,
+    ChatSession.is_active,
+)
+
+
 @api_bp.route("/chats", methods=["GET"])
 def get_chat_sessions():
-    sessions = ChatSession.query.all()
+    sessions, next_cursor = paginate(db.session.query(*CHAT_SESSION_LIST_COLUMNS), ChatSession.started_at, ChatSession.id)
     data = [
         {
             "id": s.id,
@@ -657,4 +850,4 @@ def get_chat_sessions():
         }
         for s in sessions
     ]
-    return jsonify(data), 200
\ No newline at end of file
+    return page_response(data, next_cursor)
\ No newline at end of file
@@ -0,0 +1,72 @@
+# backend/app/routes/export_routes.py
+"""
+Bulk exports for admins, streamed instead of paged:
+
+    GET /api/export/prescriptions?format=ndjson|csv&user_id=&since=&until=
+    GET /api/export/conversations?format=ndjson|csv&user_id=&since=&until=
+
+Admins only (JWT of a user with an admins row, see utils/auth.py).
+Rows go out in id order as they are read (utils/export_stream.py), so a
+full-table export neither builds the list in memory nor waits for the
+query to finish before the download starts.
+"""
+
+from flask import Blueprint, jsonify, request
+from sqlalchemy import select
+
+from app.utils.auth import require_admin
+from app.utils.db import db
+from app.utils.export_stream import FORMATS, export_response
+from app.utils.query_filters import FilterError, date_range, int_arg
+from app.models.models import ChatMemory, Prescription
+
+export_bp = Blueprint("export", __name__, url_prefix="/api/export")
+export_bp.before_request(require_admin)
+
+
+@export_bp.errorhandler(FilterError)
+def handle_filter_error(e):
+    return jsonify({"error": str(e)}), 400
+
+
+def _format() -> str:
+    fmt = request.args.get("format", "ndjson")
+    if fmt not in FORMATS:
+        raise FilterError(f"format must be one of: {', '.join(FORMATS)}")
+    return fmt
+
+
+def _filtered(stmt, model, ts_col):
+    user_id = int_arg("user_id")
+    if user_id is not None:
+        stmt = stmt.filter(model.user_id == user_id)
+    return date_range(stmt, ts_col).order_by(model.id)
+
+
+@export_bp.route("/prescriptions", methods=["GET"])
+def export_prescriptions():
+    fmt = _format()
+    stmt = _filtered(
+        select(
+            Prescription.id,
+            Prescription.user_id,
+            Prescription.response,
+            Prescription.input_token,
+            Prescription.output_token,
+            Prescription.image_mime,
+            Prescription.timestamp,
+        ),
+        Prescription, Prescription.timestamp,
+    )
+    return export_response(db.session, stmt, fmt, "prescriptions")
+
+
+@export_bp.route("/conversations", methods=["GET"])
+def export_conversations():
+    """WhatsApp chat history (chat_memory): one row per user / bot message."""
+    fmt = _format()
+    stmt = _filtered(
+        select(ChatMemory.id, ChatMemory.user_id, ChatMemory.sender, ChatMemory.message, ChatMemory.timestamp),
+        ChatMemory, ChatMemory.timestamp,
+    )
+    return export_response(db.session, stmt, fmt, "conversations")
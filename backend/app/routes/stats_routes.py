@@ -0,0 +1,292 @@
+# backend/app/routes/stats_routes.py
+"""
+Pre-bucketed time series for the admin dashboard charts.
+
+Each series is one GROUP BY over an indexed timestamp range, bucketed with
+date_trunc('day' | 'week', ...) on PostgreSQL (date() on SQLite
+for local dev). Responses are a few hundred bytes, whatever the table size:
+
+    GET /api/stats/signups?interval=day|week&since=&until=
+    GET /api/stats/prescriptions?...
+    GET /api/stats/messages?...
+    GET /api/stats/sessions?...
+    GET /api/stats/roles
+    GET /api/stats/daily?metric=tips_sent|llm_tokens|...
+
+Empty buckets are filled with zeros so charts get a continuous axis.
+
+Days inside the analytics rollup's final range (helpers/analytics_rollup.py)
+are read from daily_stats instead of the source tables, so only the days
+after it (normally today) hit the big tables. GET /api/stats/daily serves
+any rolled-up metric (tips_sent, llm_tokens, ...) straight from daily_stats.
+"""
+
+from datetime import datetime, time, timedelta
+
+from flask import Blueprint, jsonify, request
+from sqlalchemy import func
+
+from app.helpers import analytics_rollup
+from app.utils.db import db
+from app.utils.query_filters import FilterError
+from app.models.models import (
+    DailyStat,
+    User,
+    UserMessage,
+    ResponseMessage,
+    Prescription,
+    ChatSession,
+    ChatMemory,
+)
+
+stats_bp = Blueprint("stats", __name__, url_prefix="/api/stats")
+
+INTERVALS = {"day": timedelta(days=1), "week": timedelta(weeks=1)}
+DEFAULT_BUCKETS = {"day": 30, "week": 26}
+MAX_BUCKETS = 400
+ROLES = ("participant", "practitioner", "admin")
+
+
+@stats_bp.errorhandler(FilterError)
+def handle_filter_error(e):
+    return jsonify({"error": str(e)}), 400
+
+
+# -------------------------------
+# Range + bucketing
+# -------------------------------
+def _bucket_start(when: datetime, interval: str) -> datetime:
+    start = when.replace(hour=0, minute=0, second=0, microsecond=0)
+    if interval == "week":
+        start -= timedelta(days=start.weekday())  # ISO weeks start on Monday, like date_trunc
+    return start
+
+
+def _parse_date(name: str):
+    raw = (request.args.get(name) or "").strip()
+    if not raw:
+        return None
+    try:
+        return datetime.fromisoformat(raw)
+    except ValueError:
+        raise FilterError(f"{name} must be an ISO date (YYYY-MM-DD)")
+
+
+def _window():
+    """(interval, first bucket start, end exclusive) from ?interval / ?since / ?until."""
+    interval = request.args.get("interval", "day")
+    if interval not in INTERVALS:
+        raise FilterError("interval must be 'day' or 'week'")
+    step = INTERVALS[interval]
+
+    until = _parse_date("until") or datetime.utcnow()
+    end = _bucket_start(until, interval) + step
+    since = _parse_date("since")
+    start = _bucket_start(since, interval) if since else end - step * DEFAULT_BUCKETS[interval]
+
+    if start >= end:
+        raise FilterError("since must be before until")
+    if (end - start) / step > MAX_BUCKETS:
+        raise FilterError(f"At most {MAX_BUCKETS} buckets per request")
+    return interval, start, end
+
+
+def bucket(col, interval: str):
+    """SQL expression truncating col to its day / week, as a sortable value."""
+    if db.engine.dialect.name == "postgresql":
+        return func.date_trunc(interval, col)
+    if interval == "week":
+        return func.date(col, "weekday 0", "-6 days")
+    return func.date(col)
+
+
+def _key(value) -> str:
+    """Bucket value from either dialect -> 'YYYY-MM-DD'."""
+    if isinstance(value, datetime):
+        return value.date().isoformat()
+    return str(value)[:10]
+
+
+def _series(interval, start, end, columns, *grouped):
+    """
+    Zero-filled [{"date": ..., **columns}] for the window. grouped are
+    iterables of (bucket, column, count) rows merged in.
+    """
+    step = INTERVALS[interval]
+    rows = {}
+    cursor = start
+    while cursor < end:
+        rows[cursor.date().isoformat()] = {"date": cursor.date().isoformat(), **{c: 0 for c in columns}}
+        cursor += step
+
+    for result in grouped:
+        for bucket_value, column, count in result:
+            row = rows.get(_key(bucket_value))
+            if row is not None and column in row:
+                row[column] += int(count or 0)
+    return list(rows.values())
+
+
+def _count_by_bucket(col, interval, start, end, label, *extra_filters):
+    b = bucket(col, interval)
+    return (
+        (bucket_value, label, count)
+        for bucket_value, count in db.session.query(b, func.count())
+        .filter(col >= start, col < end, *extra_filters)
+        .group_by(b)
+    )
+
+
+def _parts(start, end):
+    """
+    Splits [start, end) into the piece covered by final daily_stats rows
+    (or None) and the live pieces before / after it.
+    """
+    final = analytics_rollup.final_range()
+    if final:
+        lo = max(start, datetime.combine(final[0], time.min))
+        hi = min(end, datetime.combine(final[1] + timedelta(days=1), time.min))
+        if lo < hi:
+            return (lo, hi), [(a, b) for a, b in ((start, lo), (hi, end)) if a < b]
+    return None, [(start, end)]
+
+
+def _rolled(metric, interval, rolled, label=None):
+    """(bucket, dimension or label, value) rows summed from daily_stats."""
+    if rolled is None:
+        return []
+    b = bucket(DailyStat.day, interval)
+    rows = (
+        db.session.query(b, DailyStat.dimension, func.sum(DailyStat.value))
+        .filter(DailyStat.metric == metric, DailyStat.day >= rolled[0].date(), DailyStat.day < rolled[1].date())
+        .group_by(b, DailyStat.dimension)
+    )
+    return [(bucket_value, label or dimension, value) for bucket_value, dimension, value in rows]
+
+
+def _counts(metric, col, interval, start, end, label):
+    """Count series for one table: daily_stats where final, live GROUP BY elsewhere."""
+    rolled, live = _parts(start, end)
+    return [_rolled(metric, interval, rolled, label)] + [
+        _count_by_bucket(col, interval, a, b, label) for a, b in live
+    ]
+
+
+def _envelope(interval, start, end, series, **extra):
+    return jsonify({
+        "interval": interval,
+        "since": start.date().isoformat(),
+        "until": (end - timedelta(days=1)).date().isoformat(),
+        "series": series,
+        **extra,
+    }), 200
+
+
+# -------------------------------
+# Endpoints
+# -------------------------------
+@stats_bp.route("/signups", methods=["GET"])
+def signups():
+    """New users per bucket by role, plus per-role totals before the window (for cumulative lines)."""
+    interval, start, end = _window()
+    b = bucket(User.created_at, interval)
+    rolled, live = _parts(start, end)
+    per_role = _rolled("new_users", interval, rolled)
+    for a, z in live:
+        per_role += (
+            db.session.query(b, User.role, func.count())
+            .filter(User.created_at >= a, User.created_at < z)
+            .group_by(b, User.role)
+            .all()
+        )
+    series = _series(interval, start, end, ROLES + ("total",), per_role, ((v, "total", n) for v, _r, n in per_role))
+
+    # Signups before the window, per role (daily_stats + live for uncovered days)
+    before = {}
+    rolled, live = _parts(datetime.min, start)
+    pieces = []
+    if rolled:
+        pieces.append(
+            db.session.query(DailyStat.dimension, func.sum(DailyStat.value))
+            .filter(DailyStat.metric == "new_users", DailyStat.day >= rolled[0].date(), DailyStat.day < rolled[1].date())
+            .group_by(DailyStat.dimension)
+        )
+    for a, z in live:
+        pieces.append(
+            db.session.query(User.role, func.count())
+            .filter(User.created_at >= a, User.created_at < z)
+            .group_by(User.role)
+        )
+    for piece in pieces:
+        for role, count in piece:
+            before[role] = before.get(role, 0) + int(count or 0)
+    before_counts = {role: before.get(role, 0) for role in ROLES}
+    before_counts["total"] = sum(before.values())
+    return _envelope(interval, start, end, series, before=before_counts)
+
+
+@stats_bp.route("/prescriptions", methods=["GET"])
+def prescriptions():
+    interval, start, end = _window()
+    series = _series(
+        interval, start, end, ("count",),
+        *_counts("prescriptions", Prescription.timestamp, interval, start, end, "count"),
+    )
+    return _envelope(interval, start, end, series)
+
+
+@stats_bp.route("/messages", methods=["GET"])
+def messages():
+    """Inbound (user_message) and outbound (response_message) WhatsApp messages."""
+    interval, start, end = _window()
+    series = _series(
+        interval, start, end, ("inbound", "outbound"),
+        *_counts("messages_in", UserMessage.timestamp, interval, start, end, "inbound"),
+        *_counts("messages_out", ResponseMessage.timestamp, interval, start, end, "outbound"),
+    )
+    return _envelope(interval, start, end, series)
+
+
+@stats_bp.route("/sessions", methods=["GET"])
+def sessions():
+    """Chat sessions started and distinct users chatting per bucket, plus sessions active now."""
+    interval, start, end = _window()
+    b = bucket(ChatMemory.timestamp, interval)
+    active_users = (
+        (bucket_value, "active_users", count)
+        for bucket_value, count in db.session.query(b, func.count(func.distinct(ChatMemory.user_id)))
+        .filter(ChatMemory.timestamp >= start, ChatMemory.timestamp < end)
+        .group_by(b)
+    )
+    series = _series(
+        interval, start, end, ("started", "active_users"),
+        _count_by_bucket(ChatSession.started_at, interval, start, end, "started"),
+        active_users,
+    )
+    active_now = db.session.query(func.count(ChatSession.id)).filter(ChatSession.is_active.is_(True)).scalar()
+    return _envelope(interval, start, end, series, active_now=active_now)
+
+
+@stats_bp.route("/roles", methods=["GET"])
+def roles():
+    """Users per role: {"participant": n, ...}"""
+    counts = dict(db.session.query(User.role, func.count()).group_by(User.role).all())
+    return jsonify({role: counts.get(role, 0) for role in sorted(set(ROLES) | set(counts))}), 200
+
+
+@stats_bp.route("/daily", methods=["GET"])
+def daily():
+    """
+    ?metric=tips_sent|llm_tokens|... from daily_stats only (today is as fresh
+    as the last rollup run). Columns are the metric's dimensions.
+    """
+    metric = request.args.get("metric")
+    if metric not in analytics_rollup.SOURCES:
+        raise FilterError(f"metric must be one of: {', '.join(sorted(analytics_rollup.SOURCES))}")
+    interval, start, end = _window()
+
+    rows = _rolled(metric, interval, (start, end))
+    columns = sorted({dimension or "value" for _b, dimension, _v in rows}) or ["value"]
+    series = _series(interval, start, end, columns, [(b, dimension or "value", v) for b, dimension, v in rows])
+    final = analytics_rollup.final_range()
+    return _envelope(interval, start, end, series, metric=metric, final_range=[str(d) for d in final] if final else None)
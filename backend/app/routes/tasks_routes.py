@@ -2,17 +2,88 @@
 
 import os
 from flask import Blueprint, request, jsonify, abort
-from app import send_daily_health_tips
+from app.models.models import User
+from app.utils import metrics
+from app.utils.scheduler import JOB_REGISTRY, run_job
 
 tasks_bp = Blueprint("tasks", __name__, url_prefix="/tasks")
 
+# ?dry_run=1 runs inside the request: keep it short (`flask tips-dry-run` for big runs)
+DRY_RUN_MAX_USERS = int(os.getenv("DRY_RUN_MAX_USERS", "200"))
+DRY_RUN_MAX_CONCURRENCY = int(os.getenv("DRY_RUN_MAX_CONCURRENCY", "16"))
+DRY_RUN_MAX_SECONDS = float(os.getenv("DRY_RUN_MAX_SECONDS", "30"))
 
-@tasks_bp.route("/send-daily-tips", methods=["POST"])
-def send_daily_tips():
+
+def _require_cron_key():
     # Simple shared-secret auth (cron protection)
     cron_key = request.headers.get("X-CRON-KEY")
     if cron_key != os.getenv("CRON_SECRET"):
         abort(403)
 
-    send_daily_health_tips()
+
+@tasks_bp.route("/send-daily-tips", methods=["POST"])
+def send_daily_tips():
+    _require_cron_key()
+
+    # ?dry_run=1 -> benchmark against stub providers; nothing is sent or saved.
+    # Optional JSON body: users, concurrency, llm_latency_ms, llm_error_rate,
+    # send_latency_ms, send_error_rate, jitter_ms (capped, see DRY_RUN_MAX_*)
+    if request.args.get("dry_run") in ("1", "true"):
+        from app.helpers.broadcast_bench import run_broadcast_dry_run
+
+        data = request.get_json(silent=True) or {}
+        allowed = {
+            "users": int,
+            "concurrency": int,
+            "llm_latency_ms": float,
+            "llm_error_rate": float,
+            "send_latency_ms": float,
+            "send_error_rate": float,
+            "jitter_ms": float,
+        }
+        try:
+            options = {k: cast(data[k]) for k, cast in allowed.items() if k in data}
+        except (TypeError, ValueError):
+            return jsonify({"error": "Invalid dry-run parameters"}), 400
+
+        users = options.get("users") or User.query.count()
+        concurrency = options.get("concurrency", 1)
+        per_user_s = (options.get("llm_latency_ms", 800) + options.get("send_latency_ms", 150)) / 1000
+        if users < 0 or per_user_s < 0:
+            return jsonify({"error": "Invalid dry-run parameters"}), 400
+        if not 1 <= concurrency <= DRY_RUN_MAX_CONCURRENCY:
+            return jsonify({"error": f"concurrency must be 1-{DRY_RUN_MAX_CONCURRENCY}"}), 400
+        if users > DRY_RUN_MAX_USERS or users * per_user_s / concurrency > DRY_RUN_MAX_SECONDS:
+            return jsonify({
+                "error": f"Dry run too large for a request (max {DRY_RUN_MAX_USERS} users, "
+                         f"~{DRY_RUN_MAX_SECONDS:.0f}s); use `flask tips-dry-run` instead",
+            }), 400
+
+        return jsonify(run_broadcast_dry_run(**options)), 200
+
+    ran, _ = run_job("daily_health_tips")
+    if not ran:
+        return jsonify({"status": "daily health tips already running"}), 409
     return jsonify({"status": "daily health tips sent"}), 200
+
+
+@tasks_bp.route("/run/<job_name>", methods=["POST"])
+def run_named_job(job_name):
+    _require_cron_key()
+
+    if job_name not in JOB_REGISTRY:
+        return jsonify({"error": f"Unknown job: {job_name}"}), 404
+
+    ran, _ = run_job(job_name)
+    if not ran:
+        return jsonify({"status": f"{job_name} already running"}), 409
+    return jsonify({"status": f"{job_name} done"}), 200
+
+
+@tasks_bp.route("/metrics", methods=["GET"])
+def get_metrics():
+    # Per-process numbers (each worker reports its own).
+    # ?prefix=prescription. narrows to one family of counters/latency series.
+    _require_cron_key()
+    prefix = request.args.get("prefix") or None
+    return jsonify({"pid": os.getpid(), **metrics.snapshot(prefix)}), 200
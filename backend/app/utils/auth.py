@@ -0,0 +1,43 @@
+# backend/app/utils/auth.py
+"""
+Admin-only access for routes that expose patient data.
+
+A valid JWT alone is not enough (participants get one from /api/login), so
+the token's user must also have an admins row. Missing / bad token -> 401
+(flask_jwt_extended), authenticated non-admin -> 403.
+"""
+
+from functools import wraps
+
+from flask import jsonify
+from flask_jwt_extended import get_jwt_identity, verify_jwt_in_request
+
+from app.models.models import Admin
+
+
+def current_admin():
+    """Admin row for the request's JWT identity, or None."""
+    identity = get_jwt_identity()
+    user_id = identity.get("user_id") if isinstance(identity, dict) else None
+    if user_id is None:
+        return None
+    return Admin.query.filter_by(user_id=user_id).first()
+
+
+def require_admin():
+    """For Blueprint.before_request: returns a 403 response unless the caller is an admin."""
+    verify_jwt_in_request()
+    if current_admin() is None:
+        return jsonify({"error": "Access denied: Admins only"}), 403
+    return None
+
+
+def admin_required(view):
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        denied = require_admin()
+        if denied is not None:
+            return denied
+        return view(*args, **kwargs)
+
+    return wrapper
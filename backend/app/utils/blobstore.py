@@ -0,0 +1,135 @@
+# backend/app/utils/blobstore.py
+"""
+Content-addressed blob store for uploaded media (prescription photos).
+
+Blobs are keyed by the SHA-256 of their bytes, so identical uploads are
+stored once and a key never changes meaning. The database keeps only the
+key, size and MIME type.
+
+Backends implement put/get/exists/delete. "local" (the default) writes to
+BLOB_STORE_DIR as <root>/<ab>/<cd>/<sha256>; an object-storage backend only
+needs the same four methods and an entry in _BACKENDS.
+"""
+
+import hashlib
+import os
+import tempfile
+import threading
+from abc import ABC, abstractmethod
+
+BLOB_STORE_BACKEND = os.getenv("BLOB_STORE_BACKEND", "local")
+BLOB_STORE_DIR = os.getenv("BLOB_STORE_DIR") or os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "instance", "blobs"
+)
+
+# Magic bytes -> MIME, for uploads that arrive without a usable content type
+_SIGNATURES = (
+    (b"\xff\xd8\xff", "image/jpeg"),
+    (b"\x89PNG\r\n\x1a\n", "image/png"),
+    (b"GIF87a", "image/gif"),
+    (b"GIF89a", "image/gif"),
+    (b"%PDF-", "application/pdf"),
+    (b"II*\x00", "image/tiff"),
+    (b"MM\x00*", "image/tiff"),
+)
+
+
+def sha256_hex(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def sniff_mime(data: bytes, default: str = "application/octet-stream") -> str:
+    head = data[:16]
+    for magic, mime in _SIGNATURES:
+        if head.startswith(magic):
+            return mime
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return "image/webp"
+    return default
+
+
+class BlobStore(ABC):
+    """Interface every backend implements. Keys are lowercase SHA-256 hex."""
+
+    @abstractmethod
+    def put(self, data: bytes) -> str:
+        ...
+
+    @abstractmethod
+    def get(self, key: str) -> bytes:
+        """Raises KeyError if the blob is missing."""
+
+    @abstractmethod
+    def exists(self, key: str) -> bool:
+        ...
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        ...
+
+
+class LocalBlobStore(BlobStore):
+    def __init__(self, root: str):
+        self.root = root
+
+    def _path(self, key: str) -> str:
+        if len(key) != 64 or any(c not in "0123456789abcdef" for c in key):
+            raise ValueError(f"Invalid blob key: {key!r}")
+        return os.path.join(self.root, key[:2], key[2:4], key)
+
+    def put(self, data: bytes) -> str:
+        key = sha256_hex(data)
+        path = self._path(key)
+        if os.path.exists(path):
+            return key
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Write to a temp file in the same directory, then rename: readers
+        # never see a partial blob and concurrent writers of the same key
+        # just replace identical bytes.
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as fh:
+                fh.write(data)
+            os.replace(tmp, path)
+        except BaseException:
+            if os.path.exists(tmp):
+                os.unlink(tmp)
+            raise
+        return key
+
+    def get(self, key: str) -> bytes:
+        try:
+            with open(self._path(key), "rb") as fh:
+                return fh.read()
+        except FileNotFoundError:
+            raise KeyError(key)
+
+    def exists(self, key: str) -> bool:
+        return os.path.exists(self._path(key))
+
+    def delete(self, key: str) -> None:
+        try:
+            os.unlink(self._path(key))
+        except FileNotFoundError:
+            pass
+
+
+_BACKENDS = {
+    "local": lambda: LocalBlobStore(BLOB_STORE_DIR),
+}
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_store() -> BlobStore:
+    """The configured process-wide store (BLOB_STORE_BACKEND)."""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                if BLOB_STORE_BACKEND not in _BACKENDS:
+                    raise RuntimeError(f"Unknown BLOB_STORE_BACKEND: {BLOB_STORE_BACKEND}")
+                _store = _BACKENDS[BLOB_STORE_BACKEND]()
+    return _store
@@ -0,0 +1,125 @@
+# backend/app/utils/geohash.py
+"""
+Minimal geohash encode/decode (no external dependency).
+
+Precision guide (cell size near the equator):
+  5 -> ~4.9 km x 4.9 km
+  6 -> ~1.2 km x 0.6 km
+  7 -> ~153 m x 153 m
+"""
+
+import math
+
+_BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+_DECODE = {c: i for i, c in enumerate(_BASE32)}
+
+
+def encode(lat: float, lng: float, precision: int = 6) -> str:
+    lat_lo, lat_hi = -90.0, 90.0
+    lng_lo, lng_hi = -180.0, 180.0
+    chars = []
+    bit = 0
+    ch = 0
+    even = True  # even bits encode longitude
+
+    while len(chars) < precision:
+        if even:
+            mid = (lng_lo + lng_hi) / 2
+            if lng >= mid:
+                ch = (ch << 1) | 1
+                lng_lo = mid
+            else:
+                ch <<= 1
+                lng_hi = mid
+        else:
+            mid = (lat_lo + lat_hi) / 2
+            if lat >= mid:
+                ch = (ch << 1) | 1
+                lat_lo = mid
+            else:
+                ch <<= 1
+                lat_hi = mid
+        even = not even
+
+        bit += 1
+        if bit == 5:
+            chars.append(_BASE32[ch])
+            bit = 0
+            ch = 0
+
+    return "".join(chars)
+
+
+def bounds(geohash: str):
+    """Returns (lat_lo, lat_hi, lng_lo, lng_hi) of the cell."""
+    lat_lo, lat_hi = -90.0, 90.0
+    lng_lo, lng_hi = -180.0, 180.0
+    even = True
+
+    for c in geohash:
+        cd = _DECODE[c]
+        for mask in (16, 8, 4, 2, 1):
+            if even:
+                mid = (lng_lo + lng_hi) / 2
+                if cd & mask:
+                    lng_lo = mid
+                else:
+                    lng_hi = mid
+            else:
+                mid = (lat_lo + lat_hi) / 2
+                if cd & mask:
+                    lat_lo = mid
+                else:
+                    lat_hi = mid
+            even = not even
+
+    return lat_lo, lat_hi, lng_lo, lng_hi
+
+
+def decode(geohash: str):
+    """Center (lat, lng) of the cell."""
+    lat_lo, lat_hi, lng_lo, lng_hi = bounds(geohash)
+    return (lat_lo + lat_hi) / 2, (lng_lo + lng_hi) / 2
+
+
+def neighbors(geohash: str):
+    """The 8 cells surrounding `geohash` (same precision)."""
+    lat_lo, lat_hi, lng_lo, lng_hi = bounds(geohash)
+    lat_c = (lat_lo + lat_hi) / 2
+    lng_c = (lng_lo + lng_hi) / 2
+    d_lat = lat_hi - lat_lo
+    d_lng = lng_hi - lng_lo
+    precision = len(geohash)
+
+    out = []
+    for dy in (-1, 0, 1):
+        for dx in (-1, 0, 1):
+            if dx == 0 and dy == 0:
+                continue
+            lat = max(-89.999999, min(89.999999, lat_c + dy * d_lat))
+            lng = (lng_c + dx * d_lng + 180.0) % 360.0 - 180.0
+            out.append(encode(lat, lng, precision))
+    return out
+
+
+def cell_size_m(lat: float, precision: int):
+    """Approximate (height_m, width_m) of a cell at this latitude."""
+    lat_lo, lat_hi, lng_lo, lng_hi = bounds(encode(lat, 0.0, precision))
+    height = (lat_hi - lat_lo) * 111_320.0
+    width = (lng_hi - lng_lo) * 111_320.0 * math.cos(math.radians(lat))
+    return height, width
+
+
+def next_prefix(prefix: str):
+    """
+    Smallest string greater than every string starting with `prefix`
+    (for index range scans). None if there is no upper bound.
+    """
+    chars = list(prefix)
+    while chars:
+        i = _DECODE[chars[-1]]
+        if i + 1 < len(_BASE32):
+            chars[-1] = _BASE32[i + 1]
+            return "".join(chars)
+        chars.pop()
+    return None
@@ -0,0 +1,222 @@
+# backend/app/utils/http.py
+"""
+Shared outbound HTTP layer.
+
+One requests.Session for the process: urllib3 keeps a keep-alive
+connection pool per host, idempotent requests get a small number of
+retries (exponential backoff with jitter) on connection errors and
+429/5xx, and every call has a connect timeout plus the caller's read
+timeout. Use http.get(...) instead of requests.get(...) in helpers.
+
+Read timeouts are not retried: a provider that took the whole read
+timeout once would likely do it again, and the webhook is waiting. A
+retry is also only started if it can finish (backoff + connect + read
+timeout) within HTTP_TOTAL_TIMEOUT_S of the start of the call.
+
+Connection reuse per host is exposed through the "http" metrics
+collector (GET /tasks/metrics).
+"""
+
+import os
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import MaxRetryError, ResponseError
+from urllib3.util.retry import Retry
+
+from . import metrics
+
+HTTP_POOL_HOSTS = int(os.getenv("HTTP_POOL_HOSTS", "16"))
+HTTP_POOL_SIZE = int(os.getenv("HTTP_POOL_SIZE", "10"))
+HTTP_RETRIES = int(os.getenv("HTTP_RETRIES", "2"))
+HTTP_BACKOFF_S = float(os.getenv("HTTP_BACKOFF_S", "0.3"))
+HTTP_CONNECT_TIMEOUT_S = float(os.getenv("HTTP_CONNECT_TIMEOUT_S", "3.05"))
+HTTP_READ_TIMEOUT_S = float(os.getenv("HTTP_READ_TIMEOUT_S", "10"))
+# No retry is started that could run past this many seconds into the call
+HTTP_TOTAL_TIMEOUT_S = float(os.getenv("HTTP_TOTAL_TIMEOUT_S", "20"))
+
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+_call = threading.local()  # (deadline, seconds per attempt) of this thread's call in flight
+
+
+class _BudgetRetry(Retry):
+    """Retry that gives up when the next attempt would not finish before the call's deadline."""
+
+    def increment(self, method=None, url=None, response=None, error=None, _pool=None, _stacktrace=None):
+        new = super().increment(method, url, response, error, _pool, _stacktrace)
+        budget = getattr(_call, "budget", None)
+        if budget is not None:
+            deadline, attempt_s = budget
+            if time.monotonic() + new.get_backoff_time() + attempt_s > deadline:
+                metrics.incr("http.retry_budget_exhausted")
+                raise MaxRetryError(_pool, url, error or ResponseError("retry time budget exhausted"))
+        return new
+
+
+def _retry_policy() -> Retry:
+    return _BudgetRetry(
+        total=HTTP_RETRIES,
+        connect=HTTP_RETRIES,
+        read=0,
+        status=HTTP_RETRIES,
+        backoff_factor=HTTP_BACKOFF_S,
+        backoff_jitter=HTTP_BACKOFF_S,
+        backoff_max=5,
+        status_forcelist=RETRY_STATUSES,
+        allowed_methods=frozenset({"GET", "HEAD"}),
+        # Retry-After from Nominatim/Overpass can be minutes; keep latency bounded
+        respect_retry_after_header=False,
+        raise_on_status=False,
+    )
+
+
+def _new_session() -> requests.Session:
+    s = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=HTTP_POOL_HOSTS,
+        pool_maxsize=HTTP_POOL_SIZE,
+        max_retries=_retry_policy(),
+    )
+    s.mount("https://", adapter)
+    s.mount("http://", adapter)
+    return s
+
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def session() -> requests.Session:
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = _new_session()
+    return _session
+
+
+def _timeout(timeout):
+    if timeout is None:
+        return HTTP_CONNECT_TIMEOUT_S, HTTP_READ_TIMEOUT_S
+    if isinstance(timeout, (int, float)):
+        return HTTP_CONNECT_TIMEOUT_S, timeout
+    return timeout
+
+
+def _send(method: str, url: str, timeout, **kwargs) -> requests.Response:
+    metrics.incr("http.requests")
+    connect_s, read_s = _timeout(timeout)
+    _call.budget = (time.monotonic() + HTTP_TOTAL_TIMEOUT_S, connect_s + read_s)
+    try:
+        return session().request(method, url, timeout=(connect_s, read_s), **kwargs)
+    finally:
+        _call.budget = None
+
+
+def get(url: str, timeout=None, **kwargs) -> requests.Response:
+    """requests.get through the shared pool. timeout = read timeout (s) or (connect, read)."""
+    return _send("GET", url, timeout, **kwargs)
+
+
+def post(url: str, timeout=None, **kwargs) -> requests.Response:
+    """POST through the shared pool (never retried once the request was sent)."""
+    return _send("POST", url, timeout, **kwargs)
+
+
+def pool_stats(sess: requests.Session = None) -> dict:
+    """Per-host connections opened vs requests served (reuse = 1 - opened/requests)."""
+    sess = sess or _session
+    if sess is None:
+        return {}
+
+    hosts = {}
+    seen = set()
+    for adapter in sess.adapters.values():
+        if id(adapter) in seen:
+            continue
+        seen.add(id(adapter))
+
+        pools = adapter.poolmanager.pools
+        for key in list(pools.keys()):
+            pool = pools.get(key)
+            if pool is None:
+                continue
+            opened, served = pool.num_connections, pool.num_requests
+            hosts[f"{pool.scheme}://{pool.host}:{pool.port}"] = {
+                "connections_opened": opened,
+                "requests": served,
+                "reuse_rate": round(1 - opened / served, 4) if served else None,
+            }
+    return hosts
+
+
+metrics.register_collector("http", pool_stats)
+
+
+# -------------------------------
+# Benchmark
+# -------------------------------
+def benchmark(requests_count: int = 200, latency_ms: float = 0.0) -> dict:
+    """
+    Cold (new connection per request) vs pooled latency against a local
+    keep-alive HTTP stub on 127.0.0.1. Plain HTTP, so the cold numbers
+    leave out the TLS handshake real providers add on top.
+    """
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class StubHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        disable_nagle_algorithm = True  # avoid delayed-ACK stalls on keep-alive
+
+        def do_GET(self):
+            if latency_ms:
+                time.sleep(latency_ms / 1000)
+            body = b'{"status": "OK", "results": []}'
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    url = f"http://127.0.0.1:{server.server_port}/stub"
+
+    def run(fetch):
+        timings = []
+        for _ in range(requests_count):
+            t = time.perf_counter()
+            fetch().raise_for_status()
+            timings.append(time.perf_counter() - t)
+        return {
+            "total_s": round(sum(timings), 3),
+            "latency_ms": metrics.percentiles(timings),
+            "requests_per_s": round(requests_count / sum(timings), 1),
+        }
+
+    def cold():
+        with requests.Session() as s:
+            return s.get(url, timeout=(HTTP_CONNECT_TIMEOUT_S, HTTP_READ_TIMEOUT_S))
+
+    pooled_session = _new_session()
+    try:
+        report = {
+            "requests": requests_count,
+            "stub_latency_ms": latency_ms,
+            "cold": run(cold),
+            "pooled": run(lambda: pooled_session.get(url, timeout=(HTTP_CONNECT_TIMEOUT_S, HTTP_READ_TIMEOUT_S))),
+        }
+        report["pooled"]["pool"] = pool_stats(pooled_session)
+    finally:
+        pooled_session.close()
+        server.shutdown()
+        server.server_close()
+
+    return report
@@ -0,0 +1,163 @@
+# backend/app/utils/http_cache.py
+"""
+HTTP caching for slow-changing list endpoints (practitioners, admins, ...).
+
+Every insert / update / delete of a tracked table bumps its row in
+table_versions, in the same transaction (ORM flushes and bulk
+Query.update / .delete alike). The counter is shared by all workers, so:
+
+- the ETag is a hash of (endpoint, table versions, query string), and a
+  matching If-None-Match is answered 304 after a single primary-key read
+- the serialized body is memoized per process under the same key; a
+  commit that bumps a table also drops this process's entries for it
+  (other workers just stop hitting theirs, since the version moved on)
+
+Writes made outside SQLAlchemy (psql, raw SQL) do not bump versions.
+"""
+
+import hashlib
+import os
+from functools import wraps
+
+from flask import Response, make_response, request
+from sqlalchemy import event
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from app.models.models import TableVersion
+from app.utils import metrics
+from app.utils.cache import LRUCache
+from app.utils.db import db
+
+# Browsers revalidate after this many seconds (0 = every time, answered with a 304)
+HTTP_CACHE_MAX_AGE = int(os.getenv("HTTP_CACHE_MAX_AGE", "0"))
+# Memoized bodies per endpoint (one per distinct query string / version)
+HTTP_CACHE_ENTRIES = int(os.getenv("HTTP_CACHE_ENTRIES", "64"))
+# Response headers kept with a memoized body
+KEPT_HEADERS = ("X-Next-Cursor", "Link")
+
+_tracked = set()   # table names with a version counter
+_memos = {}        # tables tuple -> LRUCache of memoized bodies
+
+
+# -------------------------------
+# Version counters
+# -------------------------------
+def _bump(connection, tables):
+    versions = TableVersion.__table__
+    dialect = connection.dialect.name
+    for name in sorted(tables):  # fixed order so concurrent writers lock rows alike
+        if dialect in ("postgresql", "sqlite"):
+            insert = pg_insert if dialect == "postgresql" else sqlite_insert
+            stmt = insert(versions).values(name=name, version=1).on_conflict_do_update(
+                index_elements=[versions.c.name], set_={"version": versions.c.version + 1},
+            )
+            connection.execute(stmt)
+        elif not connection.execute(
+            versions.update().where(versions.c.name == name).values(version=versions.c.version + 1)
+        ).rowcount:
+            connection.execute(versions.insert().values(name=name, version=1))
+
+
+def _changed_tables(session):
+    tables = set()
+    for obj in list(session.new) + list(session.deleted):
+        tables.add(obj.__table__.name)
+    for obj in session.dirty:
+        if session.is_modified(obj, include_collections=False):
+            tables.add(obj.__table__.name)
+    return tables & _tracked
+
+
+@event.listens_for(Session, "after_flush")
+def _after_flush(session, _flush_context):
+    tables = _changed_tables(session)
+    if tables:
+        _bump(session.connection(), tables)
+        session.info.setdefault("http_cache_bumped", set()).update(tables)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _after_bulk_write(state):
+    if not (state.is_update or state.is_delete) or state.bind_mapper is None:
+        return None
+    table = state.bind_mapper.local_table.name
+    if table not in _tracked:
+        return None
+    result = state.invoke_statement()
+    _bump(state.session.connection(), {table})
+    state.session.info.setdefault("http_cache_bumped", set()).add(table)
+    return result
+
+
+@event.listens_for(Session, "after_commit")
+def _after_commit(session):
+    bumped = session.info.pop("http_cache_bumped", None)
+    if bumped:
+        for tables, memo in _memos.items():
+            if bumped & set(tables):
+                memo.clear()
+
+
+@event.listens_for(Session, "after_rollback")
+def _after_rollback(session):
+    session.info.pop("http_cache_bumped", None)
+
+
+def table_versions(tables) -> tuple:
+    """Current committed version of each table (0 before its first write)."""
+    rows = dict(
+        db.session.query(TableVersion.name, TableVersion.version).filter(TableVersion.name.in_(tables)).all()
+    )
+    return tuple(rows.get(name, 0) for name in tables)
+
+
+# -------------------------------
+# View decorator
+# -------------------------------
+def _with_validators(response, etag):
+    response.set_etag(etag)
+    response.headers["Cache-Control"] = f"private, max-age={HTTP_CACHE_MAX_AGE}, must-revalidate"
+    return response
+
+
+def cached_list(*models):
+    """
+    Caches a GET view whose output depends only on models' tables and the
+    query string: strong ETag, If-None-Match -> 304, memoized body.
+    Non-200 responses pass through uncached.
+    """
+    tables = tuple(sorted(model.__tablename__ for model in models))
+    _tracked.update(tables)
+    memo = _memos.setdefault(tables, LRUCache(maxsize=HTTP_CACHE_ENTRIES))
+
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            versions = table_versions(tables)
+            key = f"{request.endpoint}|{versions}|{request.query_string.decode('latin-1')}"
+            etag = hashlib.sha1(key.encode()).hexdigest()[:20]
+
+            if request.if_none_match.contains(etag):
+                metrics.incr("http_cache.not_modified")
+                return _with_validators(Response(status=304), etag)
+
+            entry = memo.get(key)
+            if entry is None:
+                metrics.incr("http_cache.miss")
+                response = make_response(view(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+                headers = {h: response.headers[h] for h in KEPT_HEADERS if h in response.headers}
+                entry = (response.get_data(), response.mimetype, headers)
+                memo.set(key, entry)
+            else:
+                metrics.incr("http_cache.hit")
+
+            body, mimetype, headers = entry
+            return _with_validators(Response(body, mimetype=mimetype, headers=headers), etag)
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,87 @@
+# backend/app/utils/metrics.py
+"""
+Tiny in-process metrics registry (per worker process).
+
+- incr("geocode.lru_hit") bumps a counter
+- observe("webhook.clinic_finder", seconds) records a latency sample
+  (bounded reservoir; snapshot() reports p50/p95/p99). Keyword dimensions,
+  e.g. observe("prescription.ocr", s, image_size="2-5MB"), also record the
+  sample under "prescription.ocr{image_size=2-5MB}" (one series per
+  dimension value, so keep values bucketed)
+- register_collector("geocode", fn) adds a callable whose dict is merged
+  into snapshot() under that name (e.g. derived hit rates)
+
+Exposed through GET /tasks/metrics.
+"""
+
+import threading
+from collections import defaultdict, deque
+
+RESERVOIR_SIZE = 2048
+
+_lock = threading.Lock()
+_counters = defaultdict(int)
+_samples = defaultdict(lambda: deque(maxlen=RESERVOIR_SIZE))
+_sample_counts = defaultdict(int)
+_collectors = {}
+
+
+def incr(name: str, value: int = 1):
+    with _lock:
+        _counters[name] += value
+
+
+def get_counter(name: str) -> int:
+    with _lock:
+        return _counters.get(name, 0)
+
+
+def observe(name: str, seconds: float, **dims):
+    keys = [name] + [f"{name}{{{k}={v}}}" for k, v in sorted(dims.items()) if v is not None]
+    with _lock:
+        for key in keys:
+            _samples[key].append(seconds)
+            _sample_counts[key] += 1
+
+
+def percentiles(samples, points=(50, 95, 99)) -> dict:
+    """Nearest-rank percentiles in milliseconds."""
+    if not samples:
+        return {f"p{p}": None for p in points}
+    ordered = sorted(samples)
+    out = {}
+    for p in points:
+        idx = min(len(ordered) - 1, int(round(p / 100.0 * (len(ordered) - 1))))
+        out[f"p{p}"] = round(ordered[idx] * 1000, 2)
+    return out
+
+
+def register_collector(name: str, fn):
+    _collectors[name] = fn
+
+
+def hit_rate(hits: int, total: int):
+    return round(hits / total, 4) if total else None
+
+
+def snapshot(prefix: str = None) -> dict:
+    """All metrics; with prefix, only counters/latency series starting with it (no collectors)."""
+    with _lock:
+        data = {"counters": {k: v for k, v in sorted(_counters.items()) if not prefix or k.startswith(prefix)}}
+        samples = {name: list(values) for name, values in _samples.items() if not prefix or name.startswith(prefix)}
+        counts = dict(_sample_counts)
+
+    data["latency_ms"] = {
+        name: {"count": counts[name], **percentiles(values)}
+        for name, values in sorted(samples.items())
+    }
+
+    if prefix:
+        return data
+
+    for name, fn in _collectors.items():
+        try:
+            data[name] = fn()
+        except Exception as e:
+            data[name] = {"error": repr(e)}
+    return data
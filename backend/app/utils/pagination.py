@@ -0,0 +1,107 @@
+# backend/app/utils/pagination.py
+"""
+Keyset (cursor) pagination for the /api list endpoints.
+
+Pages are newest first on (sort column, id). The next page starts right
+after the last row of the current one:
+
+    WHERE (ts, id) < (:last_ts, :last_id) ORDER BY ts DESC, id DESC LIMIT n
+
+A (ts, id) index serves that as one range scan however deep the page is
+(no OFFSET). Rows with a NULL sort value come after every dated row,
+newest id first.
+
+Clients pass ?limit=N (default API_PAGE_SIZE, max API_MAX_PAGE_SIZE) and
+?cursor=<X-Next-Cursor of the previous page>. The body stays a plain JSON
+array; the last page has no X-Next-Cursor / Link header.
+"""
+
+import base64
+import json
+import os
+from datetime import datetime
+from urllib.parse import urlencode
+
+from flask import jsonify, request
+from sqlalchemy import tuple_
+
+API_PAGE_SIZE = int(os.getenv("API_PAGE_SIZE", "100"))
+API_MAX_PAGE_SIZE = int(os.getenv("API_MAX_PAGE_SIZE", "1000"))
+
+
+class PageError(ValueError):
+    """Bad ?limit / ?cursor; api_routes answers 400."""
+
+
+def encode_cursor(sort_value, row_id) -> str:
+    if isinstance(sort_value, datetime):
+        sort_value = sort_value.isoformat()
+    raw = json.dumps([sort_value, row_id], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str):
+    """-> (datetime or None, id)"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        sort_value, row_id = json.loads(raw)
+        if not isinstance(row_id, int):
+            raise ValueError(row_id)
+        return (datetime.fromisoformat(sort_value) if sort_value is not None else None), row_id
+    except Exception:
+        raise PageError("Invalid cursor")
+
+
+def page_args():
+    """(limit, decoded cursor or None) from the query string."""
+    limit = request.args.get("limit", API_PAGE_SIZE)
+    try:
+        limit = int(limit)
+    except (TypeError, ValueError):
+        raise PageError("limit must be an integer")
+    if limit < 1:
+        raise PageError("limit must be at least 1")
+
+    cursor = request.args.get("cursor")
+    return min(limit, API_MAX_PAGE_SIZE), (decode_cursor(cursor) if cursor else None)
+
+
+def paginate(query, sort_col, id_col):
+    """
+    One page of query ordered by (sort_col DESC, id_col DESC), using the
+    request's ?limit / ?cursor. Returns (rows, next_cursor or None).
+    """
+    limit, cursor = page_args()
+    want = limit + 1  # one extra row tells us whether there is a next page
+    rows = []
+
+    # Dated rows first (skipped once the cursor is inside the NULL tail)
+    if cursor is None or cursor[0] is not None:
+        dated = query.filter(sort_col.isnot(None))
+        if cursor is not None:
+            dated = dated.filter(tuple_(sort_col, id_col) < tuple_(*cursor))
+        rows = dated.order_by(sort_col.desc(), id_col.desc()).limit(want).all()
+
+    if len(rows) < want:
+        undated = query.filter(sort_col.is_(None))
+        if cursor is not None and cursor[0] is None:
+            undated = undated.filter(id_col < cursor[1])
+        rows += undated.order_by(id_col.desc()).limit(want - len(rows)).all()
+
+    if len(rows) <= limit:
+        return rows, None
+
+    rows = rows[:limit]
+    last = rows[-1]
+    return rows, encode_cursor(getattr(last, sort_col.key), getattr(last, id_col.key))
+
+
+def page_response(data, next_cursor):
+    """jsonify(data) plus X-Next-Cursor and an RFC 8288 Link to the next page."""
+    response = jsonify(data)
+    if next_cursor:
+        args = request.args.to_dict()
+        args["cursor"] = next_cursor
+        response.headers["X-Next-Cursor"] = next_cursor
+        response.headers["Link"] = f'<{request.base_url}?{urlencode(args)}>; rel="next"'
+    return response, 200
@@ -0,0 +1,81 @@
+# backend/app/utils/query_filters.py
+"""
+Query-string filters shared by the /api list endpoints.
+
+- ?since=YYYY-MM-DD&until=YYYY-MM-DD (or full ISO datetimes); a date-only
+  `until` includes that whole day
+- ?q=free text: split on whitespace, every word must match one of the
+  endpoint's columns (case-insensitive substring). On PostgreSQL those
+  columns carry pg_trgm GIN indexes (see models.py), so ILIKE '%word%'
+  is an index scan rather than a full table read.
+"""
+
+from datetime import datetime, timedelta
+
+from flask import request
+from sqlalchemy import and_, or_
+
+MAX_SEARCH_WORDS = 5
+
+
+class FilterError(ValueError):
+    """Bad filter argument; api_routes answers 400."""
+
+
+def _parse_when(name: str, end: bool = False):
+    raw = (request.args.get(name) or "").strip()
+    if not raw:
+        return None
+    try:
+        value = datetime.fromisoformat(raw)
+    except ValueError:
+        raise FilterError(f"{name} must be an ISO date (YYYY-MM-DD) or datetime")
+    if end and len(raw) == 10:
+        value += timedelta(days=1)
+    return value
+
+
+def date_range(query, col):
+    """Applies ?since (inclusive) / ?until (exclusive, or whole day for a date) to col."""
+    since = _parse_when("since")
+    until = _parse_when("until", end=True)
+    if since:
+        query = query.filter(col >= since)
+    if until:
+        query = query.filter(col < until)
+    return query
+
+
+def int_arg(name: str):
+    raw = request.args.get(name)
+    if raw in (None, ""):
+        return None
+    try:
+        return int(raw)
+    except ValueError:
+        raise FilterError(f"{name} must be an integer")
+
+
+def search_words():
+    """Words of ?q (at most MAX_SEARCH_WORDS), or []."""
+    return (request.args.get("q") or "").split()[:MAX_SEARCH_WORDS]
+
+
+def like_pattern(word: str) -> str:
+    escaped = word.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+def text_search(query, word_clause):
+    """
+    word_clause(pattern, word) -> SQL condition for one word. Every word of
+    ?q has to match.
+    """
+    words = search_words()
+    if not words:
+        return query
+    return query.filter(and_(*[word_clause(like_pattern(w), w) for w in words]))
+
+
+def ilike_any(pattern: str, *cols):
+    return or_(*[col.ilike(pattern, escape="\\") for col in cols])
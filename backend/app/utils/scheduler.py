@@ -0,0 +1,340 @@
+# backend/app/utils/scheduler.py
+"""
+Single job-scheduling subsystem for the backend.
+
+Every gunicorn / Passenger worker runs create_app(), so the scheduler uses
+leader election: only the process holding the "scheduler" lock starts the
+APScheduler instance. The others keep retrying in the background and take
+over if the leader dies.
+
+Locks:
+- Postgres: session-level advisory locks (pg_try_advisory_lock) held on a
+  dedicated connection. They are released automatically if the process dies.
+- Anything else (SQLite in dev): an flock() on a lock file, which is enough
+  because SQLite deployments are single-host anyway. Without flock()
+  (Windows) the lock is never granted: no process leads and run_job skips,
+  rather than every worker running every job.
+
+Election starts in create_app(), in each worker process. That only works
+if workers import the app themselves: with gunicorn --preload the app (and
+the election thread) is created in the master before forking, so the
+master would lead and no worker would. --preload is not supported with
+RUN_SCHEDULER=1; a worker forked after election started logs a warning.
+
+Job definitions live in JOB_REGISTRY. Each job also runs under its own
+per-job lock, so the scheduler and the cron endpoint can never run the same
+job at the same time.
+"""
+
+import hashlib
+import importlib
+import os
+import tempfile
+import threading
+import time
+
+from apscheduler.schedulers.background import BackgroundScheduler
+
+from app.utils.db import db
+
+try:
+    import fcntl
+except ImportError:  # Windows dev machines
+    fcntl = None
+
+
+# -------------------------------
+# Job registry
+# -------------------------------
+# name -> {"func": "module:callable", "trigger": ..., **trigger kwargs}
+# Functions are imported lazily so this module stays free of helper imports.
+JOB_REGISTRY = {
+    "daily_health_tips": {
+        "func": "app.helpers.healthtip_scheduler:send_daily_health_tips",
+        "trigger": "cron",
+        "hour": int(os.getenv("DAILY_TIPS_HOUR", "7")),
+        "minute": 0,
+    },
+    "cleanup": {
+        "func": "app.helpers.cleanup:cleanup_expired_records",
+        "trigger": "cron",
+        "hour": 3,
+        "minute": 30,
+    },
+    "analytics_rollup": {
+        "func": "app.helpers.analytics_rollup:run_rollup",
+        "trigger": "cron",
+        "minute": int(os.getenv("ROLLUP_MINUTE", "5")),  # hourly
+    },
+    "clinic_reimport": {
+        "func": "app.helpers.clinic_index:reimport_from_env",
+        "trigger": "cron",
+        "day_of_week": "sun",
+        "hour": 2,
+        "minute": 0,
+    },
+}
+
+LEADER_LOCK_NAME = "scheduler"
+LEADER_RETRY_SECONDS = int(os.getenv("SCHEDULER_LEADER_RETRY_SECONDS", "60"))
+
+_scheduler = None
+_leader_lock = None
+_election_started = False
+_election_guard = threading.Lock()
+_fork_check_registered = False
+
+
+def register_job(name: str, func: str, trigger: str, **trigger_args):
+    """Add (or replace) a job definition in the registry."""
+    JOB_REGISTRY[name] = {"func": func, "trigger": trigger, **trigger_args}
+
+
+def _resolve(func_path: str):
+    module_name, attr = func_path.split(":", 1)
+    return getattr(importlib.import_module(module_name), attr)
+
+
+# -------------------------------
+# Locks
+# -------------------------------
+def _lock_key(name: str) -> int:
+    """Stable signed 64-bit key for pg advisory locks."""
+    digest = hashlib.sha1(f"shecare:{name}".encode("utf-8")).digest()
+    return int.from_bytes(digest[:8], "big", signed=True)
+
+
+class _PgAdvisoryLock:
+    def __init__(self, name: str):
+        self.name = name
+        self.key = _lock_key(name)
+        self.conn = None
+
+    def acquire(self) -> bool:
+        conn = db.engine.connect()
+        try:
+            got = conn.exec_driver_sql(
+                "SELECT pg_try_advisory_lock(%s)", (self.key,)
+            ).scalar()
+            conn.commit()
+        except Exception:
+            conn.close()
+            raise
+        if not got:
+            conn.close()
+            return False
+        self.conn = conn
+        return True
+
+    def is_alive(self) -> bool:
+        # The advisory lock lives and dies with this connection.
+        try:
+            self.conn.exec_driver_sql("SELECT 1")
+            self.conn.commit()
+            return True
+        except Exception:
+            return False
+
+    def release(self):
+        if self.conn is None:
+            return
+        try:
+            self.conn.exec_driver_sql("SELECT pg_advisory_unlock(%s)", (self.key,))
+            self.conn.commit()
+        finally:
+            self.conn.close()
+            self.conn = None
+
+
+class _FileLock:
+    def __init__(self, name: str):
+        lock_dir = os.getenv("SCHEDULER_LOCK_DIR") or tempfile.gettempdir()
+        self.path = os.path.join(lock_dir, f"shecare-{name}.lock")
+        self.fh = None
+
+    def acquire(self) -> bool:
+        if fcntl is None:
+            # Fail closed: granting it to everyone would let every worker lead
+            print(f"⚠️ No flock() on this platform; lock {self.path} is never granted (use PostgreSQL).")
+            return False
+        fh = open(self.path, "a+")
+        try:
+            fcntl.flock(fh.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            fh.close()
+            return False
+        self.fh = fh
+        return True
+
+    def is_alive(self) -> bool:
+        return self.fh is not None
+
+    def release(self):
+        if self.fh is None:
+            return
+        try:
+            if fcntl is not None:
+                fcntl.flock(self.fh.fileno(), fcntl.LOCK_UN)
+        finally:
+            self.fh.close()
+            self.fh = None
+
+
+def try_lock(name: str):
+    """
+    Try to take the named lock without blocking.
+    Returns a lock object (call .release()) or None if someone else holds it.
+    """
+    if db.engine.dialect.name == "postgresql":
+        lock = _PgAdvisoryLock(name)
+    else:
+        lock = _FileLock(name)
+    return lock if lock.acquire() else None
+
+
+# -------------------------------
+# Running jobs
+# -------------------------------
+def run_job(name: str, *args, **kwargs):
+    """
+    Run one registered job inside its per-job lock.
+    Returns (ran, result). ran is False if the job is already running elsewhere.
+    Must be called inside an app context.
+    """
+    spec = JOB_REGISTRY.get(name)
+    if spec is None:
+        raise KeyError(f"Unknown job: {name}")
+
+    lock = try_lock(f"job:{name}")
+    if lock is None:
+        print(f"Job {name} is already running in another process; skipping.")
+        return False, None
+
+    try:
+        return True, _resolve(spec["func"])(*args, **kwargs)
+    finally:
+        lock.release()
+
+
+def _run_scheduled(app, name: str):
+    with app.app_context():
+        try:
+            run_job(name)
+        except Exception as e:
+            print(f"Scheduled job {name} failed:", repr(e))
+        finally:
+            try:
+                db.session.remove()
+            except Exception:
+                pass
+
+
+def _check_leadership(app):
+    """
+    If the leader's lock connection drops, Postgres releases the advisory
+    lock and another worker may take over. Stop scheduling here when that
+    happens and go back to election.
+    """
+    global _scheduler, _leader_lock, _election_started
+
+    if _leader_lock is not None and _leader_lock.is_alive():
+        return
+
+    print(f"Scheduler lost leadership (pid={os.getpid()}); stopping jobs.")
+    try:
+        if _leader_lock is not None:
+            _leader_lock.release()
+    except Exception:
+        pass
+    _leader_lock = None
+
+    scheduler, _scheduler = _scheduler, None
+    with _election_guard:
+        _election_started = False
+    if scheduler is not None:
+        scheduler.shutdown(wait=False)
+    init_scheduler(app)
+
+
+def _start_as_leader(app):
+    global _scheduler
+
+    timezone = os.getenv("SCHEDULER_TIMEZONE", "Africa/Nairobi")
+    scheduler = BackgroundScheduler(timezone=timezone)
+
+    for name, spec in JOB_REGISTRY.items():
+        trigger_args = {k: v for k, v in spec.items() if k not in ("func", "trigger")}
+        scheduler.add_job(
+            _run_scheduled,
+            spec["trigger"],
+            args=(app, name),
+            id=name,
+            replace_existing=True,
+            coalesce=True,
+            max_instances=1,
+            **trigger_args,
+        )
+
+    scheduler.add_job(
+        _check_leadership,
+        "interval",
+        seconds=LEADER_RETRY_SECONDS,
+        args=(app,),
+        id="_leader_heartbeat",
+        max_instances=1,
+    )
+
+    scheduler.start()
+    _scheduler = scheduler
+    print(f"Scheduler leader elected (pid={os.getpid()}); jobs:", ", ".join(JOB_REGISTRY))
+
+
+def _election_loop(app):
+    global _leader_lock
+
+    while True:
+        with app.app_context():
+            try:
+                _leader_lock = try_lock(LEADER_LOCK_NAME)
+            except Exception as e:
+                print("Scheduler leader election failed:", repr(e))
+                _leader_lock = None
+
+            if _leader_lock is not None:
+                _start_as_leader(app)
+                return
+
+        time.sleep(LEADER_RETRY_SECONDS)
+
+
+def _warn_forked_after_election():
+    print(
+        f"⚠️ Scheduler election was started before this process was forked (pid={os.getpid()}); "
+        "it will never run jobs here. Don't use gunicorn --preload with RUN_SCHEDULER=1."
+    )
+
+
+def init_scheduler(app):
+    """
+    Start leader election for this process (idempotent).
+    The winning process runs every job in JOB_REGISTRY; the rest stay idle
+    and retry every SCHEDULER_LEADER_RETRY_SECONDS.
+    Call it in the worker process itself, after any fork.
+    """
+    global _election_started, _fork_check_registered
+
+    with _election_guard:
+        if _election_started:
+            return
+        _election_started = True
+        if not _fork_check_registered and hasattr(os, "register_at_fork"):
+            os.register_at_fork(after_in_child=_warn_forked_after_election)
+            _fork_check_registered = True
+
+    t = threading.Thread(
+        target=_election_loop,
+        args=(app,),
+        name="scheduler-election",
+        daemon=True,
+    )
+    t.start()
@@ -2,6 +2,7 @@ import os
 import random
 import re
 import threading
+import time
 from datetime import datetime
 
 from dotenv import load_dotenv
@@ -19,6 +20,7 @@ from ..helpers.clinicfinder import find_nearby_clinics
 from ..helpers.prescriptionuploader import prescription_uploader
 from ..helpers.healthtip_agent import generate_health_tip
 from ..helpers.free_chat_agent import free_chat_agent
+from ..utils import metrics
 
 from ..models import (
     db,
@@ -201,17 +203,26 @@ def send_whatsapp_message(to_phone: str, body: str) -> bool:
         return False
 
 
-def process_prescription_async(app, user_id: int, user_phone: str, media_url: str, media_type: str):
+def process_prescription_async(app, user_id: int, user_phone: str, media: list, enqueued_at: float = None):
     """
     Prescription stays async.
     IMPORTANT: run prescription_uploader inside THIS thread (has app context),
     so DB operations don't crash.
+    media: [(media_url, media_type), ...] for every attachment in the message.
+    enqueued_at: time.perf_counter() when the webhook handed the job off.
     """
     with app.app_context():
-        safe_print("process_prescription_async start. user_id=", user_id, "media_type=", media_type)
+        safe_print("process_prescription_async start. user_id=", user_id, "media=", len(media))
+        if enqueued_at is not None:
+            metrics.observe("prescription.queue_wait", time.perf_counter() - enqueued_at)
+        t0 = time.perf_counter()
         try:
-            success, ai_reply = prescription_uploader(user_id, media_url, media_type)
+            success, ai_reply = prescription_uploader(user_id, media)
+            t_send = time.perf_counter()
             ok = send_whatsapp_message(user_phone, ai_reply)
+            metrics.observe("prescription.send", time.perf_counter() - t_send)
+            metrics.observe("prescription.total", time.perf_counter() - t0, attachments=len(media))
+            metrics.incr("prescription.ok" if success else "prescription.failed")
             safe_print("process_prescription_async sent=", ok, "success_flag=", success)
         except Exception as e:
             safe_print("Async prescription processing failed:", repr(e))
@@ -236,6 +247,10 @@ def whatsapp_webhook():
     user_message = data.get("Body", "").strip()
     normalized = normalize_text(user_message)
     num_media = int(data.get("NumMedia", 0))
+    # WhatsApp "share location" pins arrive as Latitude/Longitude (+ optional Label/Address)
+    shared_lat = data.get("Latitude")
+    shared_lng = data.get("Longitude")
+    has_pin = bool(shared_lat and shared_lng)
 
     response = MessagingResponse()
     message = response.message()
@@ -282,9 +297,12 @@ def whatsapp_webhook():
 
     # 4) Prescription upload (async)
     if num_media > 0:
-        media_url = data.get("MediaUrl0")
-        media_type = data.get("MediaContentType0")
-        safe_print("Prescription upload detected. media_type=", media_type)
+        media = [
+            (data.get(f"MediaUrl{i}"), data.get(f"MediaContentType{i}"))
+            for i in range(num_media)
+            if data.get(f"MediaUrl{i}")
+        ]
+        safe_print("Prescription upload detected. media=", [t for _, t in media])
 
         ack = "✅ Got it. I’m reading your prescription now — I’ll reply shortly."
         message.body(ack)
@@ -293,7 +311,7 @@ def whatsapp_webhook():
         app = current_app._get_current_object()
         t = threading.Thread(
         target=process_prescription_async,
-        args=(app, user.id, user_phone, media_url, media_type),
+        args=(app, user.id, user_phone, media, time.perf_counter()),
         daemon=False,  # ✅ IMPORTANT: do NOT use daemon threads on Passenger/cPanel
         )
         t.start()
@@ -302,7 +320,11 @@ def whatsapp_webhook():
         safe_print("Prescription upload acknowledged; processing async...")
         return str(response), 200, {"Content-Type": "application/xml"}
 
-    # 5) Save user message
+    # 5) Save user message (a location pin has no Body; log its coordinates instead)
+    if has_pin and not user_message:
+        user_message = f"📍 {shared_lat},{shared_lng}"
+        normalized = normalize_text(user_message)
+
     user_msg = UserMessage(user_id=user.id, message=normalized, timestamp=datetime.utcnow())
     db.session.add(user_msg)
     db.session.commit()
@@ -311,6 +333,10 @@ def whatsapp_webhook():
 
     ai_reply = ""
 
+    # A shared location pin is always a clinic search, whatever state we were in
+    if has_pin:
+        session.session_state = "clinic_finder"
+
     # 6) Main menu (sync)
     if session.session_state == "main_menu":
         safe_print("Main menu input received. len=", len(normalized or ""))
@@ -404,7 +430,18 @@ def whatsapp_webhook():
             db.session.commit()
             ai_reply = "🔙 Back to menu — reply with a number."
         else:
-            clinics = find_nearby_clinics(user_message)
+            t0 = time.perf_counter()
+            if has_pin:
+                # Coordinates from the pin: no geocoding round trip
+                clinics = find_nearby_clinics(
+                    lat=shared_lat,
+                    lng=shared_lng,
+                    label=data.get("Label") or data.get("Address"),
+                )
+                metrics.observe("webhook.clinic_finder.pin", time.perf_counter() - t0)
+            else:
+                clinics = find_nearby_clinics(user_message)
+                metrics.observe("webhook.clinic_finder.text", time.perf_counter() - t0)
             reply = (
                 "🩺 Clinics near you:\n\n" + "\n\n".join(clinics)
                 if clinics
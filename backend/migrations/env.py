@@ -30,6 +30,8 @@ def run_migrations_offline():
     )
 
     with context.begin_transaction():
+        if url.startswith("postgres"):
+            context.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
         context.run_migrations()
 
 
@@ -45,6 +47,9 @@ def run_migrations_online():
         )
 
         with context.begin_transaction():
+            # The trigram GIN indexes (app/models/models.py) need pg_trgm
+            if connection.dialect.name == "postgresql":
+                context.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
             context.run_migrations()
 
 
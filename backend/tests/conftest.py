@@ -0,0 +1,29 @@
+# backend/tests/conftest.py
+import os
+import tempfile
+
+import pytest
+
+_tmp = tempfile.mkdtemp(prefix="shecare_tests_")
+os.environ.setdefault("OPENAI_API_KEY", "test")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_tmp, 'test.db')}"
+os.environ["BLOB_STORE_DIR"] = os.path.join(_tmp, "blobs")
+
+from app import create_app  # noqa: E402
+from app.utils.db import db  # noqa: E402
+
+
+@pytest.fixture
+def app():
+    app = create_app()
+    app.config["TESTING"] = True
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+        yield app
+        db.session.remove()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
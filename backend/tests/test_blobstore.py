@@ -0,0 +1,19 @@
+# backend/tests/test_blobstore.py
+import pytest
+
+from app.utils.blobstore import BlobStore, LocalBlobStore, sha256_hex
+
+
+def test_incomplete_backend_fails_at_construction():
+    class PutOnly(BlobStore):
+        def put(self, data):
+            return sha256_hex(data)
+
+    with pytest.raises(TypeError):
+        PutOnly()
+
+
+def test_local_store_round_trip(tmp_path):
+    store = LocalBlobStore(str(tmp_path))
+    key = store.put(b"rx")
+    assert key == sha256_hex(b"rx") and store.get(key) == b"rx"
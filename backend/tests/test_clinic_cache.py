@@ -0,0 +1,33 @@
+# backend/tests/test_clinic_cache.py
+from app.helpers import clinic_cache, clinicfinder
+from app.helpers.clinic_ranker import distance_label
+from app.helpers.clinic_index import haversine_m
+
+CLINIC = {"name": "Nairobi West Clinic", "address": "Langata Rd", "lat": -1.3030, "lng": 36.8170}
+
+
+def test_cached_cell_labels_distance_from_each_callers_point(app, monkeypatch):
+    searches = []
+
+    def fake_search(lat, lng, radius_m, deadline=None):
+        searches.append((lat, lng))
+        return [dict(CLINIC)], "local"
+
+    monkeypatch.setattr(clinicfinder, "_search_providers", fake_search)
+    clinic_cache._lru.clear()
+
+    # Opposite corners of the same precision-6 cell
+    cell = clinic_cache.cell_for(-1.3000, 36.8200)
+    c_lat, c_lng = clinic_cache.cell_center(cell)
+    near = (c_lat - 0.0025, c_lng - 0.005)
+    far = (c_lat + 0.0025, c_lng + 0.005)
+    assert clinic_cache.cell_for(*near) == clinic_cache.cell_for(*far) == cell
+
+    first = clinicfinder.nearby_clinic_lines(*near)
+    second = clinicfinder.nearby_clinic_lines(*far)
+
+    assert len(searches) == 1  # second call is a cache hit
+    for point, lines in ((near, first), (far, second)):
+        d = haversine_m(point[0], point[1], CLINIC["lat"], CLINIC["lng"])
+        assert distance_label(d) in lines[0]
+    assert first != second
@@ -0,0 +1,61 @@
+# backend/tests/test_clinic_providers.py
+import threading
+import time
+
+from app.helpers import clinicfinder
+
+
+def _calls():
+    calls = []
+
+    def provider(name, result, delay=0.0, error=None):
+        def fn():
+            calls.append(name)
+            time.sleep(delay)
+            if error:
+                raise error
+            return result
+        return fn
+
+    return calls, provider
+
+
+def test_hedged_provider_is_not_asked_when_the_primary_answers_in_time():
+    calls, provider = _calls()
+    tasks = [
+        ("primary_ok", provider("primary", "A", delay=0.1), (), None),
+        ("hedge_unused", provider("hedge", "B"), (), 1.0),
+    ]
+    winner, result, _ = clinicfinder._race(tasks, time.monotonic() + 5, bool)
+    assert (winner, result) == ("primary_ok", "A")
+    assert calls == ["primary"]
+
+
+def test_hedged_provider_starts_as_soon_as_the_primary_fails():
+    calls, provider = _calls()
+    tasks = [
+        ("primary_fails", provider("primary", None, error=RuntimeError("503")), (), None),
+        ("hedge_used", provider("hedge", "B"), (), 30.0),
+    ]
+    t0 = time.monotonic()
+    winner, result, _ = clinicfinder._race(tasks, t0 + 5, bool)
+    assert (winner, result) == ("hedge_used", "B")
+    assert time.monotonic() - t0 < 1
+
+
+def test_stragglers_only_hold_their_own_providers_slots(monkeypatch):
+    release = threading.Event()
+    monkeypatch.setattr(clinicfinder, "CLINIC_PROVIDER_WORKERS", 1)
+
+    def stuck():
+        release.wait(5)
+
+    try:
+        tasks = [("slow_provider", stuck, (), None), ("fast_provider", lambda: "A", (), None)]
+        assert clinicfinder._race(tasks, time.monotonic() + 5, bool)[0] == "fast_provider"
+
+        # slow_provider's only slot is still taken: skipped, not queued
+        winner, _result, outcomes = clinicfinder._race(tasks, time.monotonic() + 5, bool)
+        assert winner == "fast_provider" and outcomes["slow_provider"] == "busy"
+    finally:
+        release.set()
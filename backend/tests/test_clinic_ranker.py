@@ -0,0 +1,20 @@
+# backend/tests/test_clinic_ranker.py
+from app.helpers import clinic_ranker
+
+
+def test_too_large_table_is_not_rechecked_every_call(app, monkeypatch):
+    calls = []
+
+    def fake_version():
+        calls.append(1)
+        return (clinic_ranker.CLINIC_RANKER_MAX_ROWS + 1, None)
+
+    monkeypatch.setattr(clinic_ranker, "_table_version", fake_version)
+    clinic_ranker.invalidate()
+    assert clinic_ranker.get_ranker() is None
+    assert clinic_ranker.get_ranker() is None
+    assert len(calls) == 1
+
+    clinic_ranker.invalidate()
+    assert clinic_ranker.get_ranker() is None
+    assert len(calls) == 2
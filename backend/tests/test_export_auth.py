@@ -0,0 +1,33 @@
+# backend/tests/test_export_auth.py
+import pytest
+from flask_jwt_extended import create_access_token
+
+from app.models.models import Admin, User
+from app.utils.db import db
+
+
+def _token(role):
+    user = User(phone="0712345678", email=f"{role}@example.com", password="whatsapp_user", role=role)
+    db.session.add(user)
+    db.session.flush()
+    if role == "admin":
+        db.session.add(Admin(user_id=user.id))
+    db.session.commit()
+    return create_access_token(identity={"user_id": user.id, "email": user.email, "role": role})
+
+
+@pytest.mark.parametrize("path", ["/api/export/prescriptions", "/api/export/conversations?format=csv"])
+def test_export_requires_token(client, path):
+    assert client.get(path).status_code == 401
+
+
+def test_export_rejects_non_admin(client):
+    headers = {"Authorization": f"Bearer {_token('participant')}"}
+    assert client.get("/api/export/prescriptions", headers=headers).status_code == 403
+
+
+def test_export_allows_admin(client):
+    headers = {"Authorization": f"Bearer {_token('admin')}"}
+    response = client.get("/api/export/conversations?format=csv", headers=headers)
+    assert response.status_code == 200
+    assert response.get_data(as_text=True).startswith("id,user_id,sender,message,timestamp")
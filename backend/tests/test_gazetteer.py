@@ -0,0 +1,27 @@
+# backend/tests/test_gazetteer.py
+from app.helpers.gazetteer import Gazetteer, get_gazetteer
+
+
+def test_bundled_list_fuzzy_matches_single_word_typos():
+    gz = get_gazetteer()
+    assert gz.lookup("westland")[2] == "Westlands, Nairobi"
+    assert gz.lookup("Kitengla")[2] == "Kitengela, Kajiado"
+
+
+def test_multi_word_and_numbered_names_match_exactly_only():
+    gz = get_gazetteer()
+    assert gz.lookup("South B")[2] == "South B, Nairobi"
+    assert gz.lookup("South D") is None
+    assert gz.lookup("Githurai 46") is None
+
+
+def test_generic_words_are_not_places():
+    assert get_gazetteer().lookup("town") is None
+
+
+def test_near_tie_is_left_to_the_providers():
+    gz = Gazetteer()
+    gz.add("Kamuthi", [], "A", 20000, -1.0, 37.0)
+    gz.add("Kamathe", [], "B", 25000, -1.1, 37.1)
+    assert gz.lookup("Kamathi") is None
+    assert gz.lookup("Kamuthi")[2] == "Kamuthi, A"
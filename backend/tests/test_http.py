@@ -0,0 +1,52 @@
+# backend/tests/test_http.py
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+from app.utils import http
+
+
+@pytest.fixture
+def stub():
+    hits = []
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            hits.append(self.path)
+            if self.path == "/slow":
+                time.sleep(0.5)
+            self.send_response(503)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_port}", hits
+    server.shutdown()
+    server.server_close()
+
+
+def test_read_timeouts_are_not_retried(stub):
+    base, hits = stub
+    with pytest.raises(requests.exceptions.ConnectionError):
+        http.get(f"{base}/slow", timeout=0.1)
+    assert len(hits) == 1
+
+
+def test_retryable_statuses_are_retried_within_the_budget(stub, monkeypatch):
+    base, hits = stub
+    assert http.get(f"{base}/busy", timeout=1).status_code == 503
+    assert len(hits) == 1 + http.HTTP_RETRIES
+
+    hits.clear()
+    monkeypatch.setattr(http, "HTTP_TOTAL_TIMEOUT_S", 0.5)
+    assert http.get(f"{base}/busy", timeout=1).status_code == 503
+    assert len(hits) == 1
@@ -0,0 +1,35 @@
+# backend/tests/test_ocr_workers.py
+from app.helpers import ocr_workers
+
+
+class FakeWorker:
+    failures = 0
+
+    def __init__(self, _ctx):
+        if FakeWorker.failures:
+            FakeWorker.failures -= 1
+            raise RuntimeError("OCR worker did not start in time")
+        self.engine = "fake"
+        self.killed = False
+
+    def kill(self):
+        self.killed = True
+
+    def stop(self):
+        pass
+
+
+def test_failed_respawn_is_retried_and_keeps_the_slot(monkeypatch):
+    monkeypatch.setattr(ocr_workers, "_Worker", FakeWorker)
+    monkeypatch.setattr(ocr_workers, "OCR_RESPAWN_BACKOFF_S", (0.01,))
+    pool = ocr_workers.OCRWorkerPool(1)
+    try:
+        stuck = pool._idle.get_nowait()
+        FakeWorker.failures = 2
+        pool._replace(stuck)  # returns at once; the respawn runs in the background
+
+        replacement = pool._idle.get(timeout=5)
+        assert replacement is not stuck and stuck.killed
+        assert pool.stats()["workers"] == 1
+    finally:
+        pool.close()
@@ -0,0 +1,59 @@
+# backend/tests/test_prescription_dedup.py
+from app.helpers.prescription_store import UNINTERPRETED_RESPONSE, find_duplicate, find_near_duplicate
+from app.models.models import Prescription, User
+from app.utils.db import db
+
+SHA = "a" * 64
+PHASH = "0f0f0f0f0f0f0f0f"
+NEAR_PHASH = "0f0f0f0f0f0f0f0e"  # Hamming distance 1
+
+PAD = "DR. A. MWANGI CLINIC  P.O. BOX 123 NAIROBI  TEL 0722 000 000  Rx  "
+TEXT = PAD + "Amoxicillin 500mg 1x3 for 7 days. Paracetamol 1g prn"
+
+
+def _user(n):
+    user = User(phone=f"07123456{n:02d}", email=f"u{n}@example.com", password="whatsapp_user")
+    db.session.add(user)
+    db.session.flush()
+    return user
+
+
+def _prescription(user, response, ocr_text=TEXT):
+    db.session.add(Prescription(
+        user_id=user.id, image_sha256=SHA, image_phash=PHASH, response=response, ocr_text=ocr_text,
+    ))
+    db.session.commit()
+
+
+def test_same_user_exact_duplicate(app):
+    user = _user(1)
+    _prescription(user, "Amoxicillin 500mg")
+    assert find_duplicate(user.id, SHA).response == "Amoxicillin 500mg"
+
+
+def test_other_users_image_is_not_a_duplicate(app):
+    first, second = _user(1), _user(2)
+    _prescription(first, "Amoxicillin 500mg")
+    assert find_duplicate(second.id, SHA) is None
+    assert find_near_duplicate(second.id, NEAR_PHASH, TEXT) is None
+
+
+def test_failed_interpretation_is_not_reused(app):
+    user = _user(1)
+    _prescription(user, UNINTERPRETED_RESPONSE)
+    assert find_duplicate(user.id, SHA) is None
+    assert find_near_duplicate(user.id, NEAR_PHASH, TEXT) is None
+
+
+def test_retaken_photo_with_matching_text_is_a_near_duplicate(app):
+    user = _user(1)
+    _prescription(user, "Amoxicillin 500mg")
+    retaken = TEXT.replace("500mg", "5OOmg").lower()  # OCR noise
+    assert find_near_duplicate(user.id, NEAR_PHASH, retaken).response == "Amoxicillin 500mg"
+
+
+def test_same_pad_different_prescription_is_not_reused(app):
+    user = _user(1)
+    _prescription(user, "Amoxicillin 500mg")
+    other = PAD + "Metformin 850mg bd with meals, review in 1 month"
+    assert find_near_duplicate(user.id, NEAR_PHASH, other) is None
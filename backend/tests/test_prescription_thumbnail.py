@@ -0,0 +1,41 @@
+# backend/tests/test_prescription_thumbnail.py
+import io
+
+from flask_jwt_extended import create_access_token
+from PIL import Image
+
+from app.helpers.prescription_store import store_image
+from app.models.models import Admin, Prescription, User
+from app.utils.db import db
+
+
+def _prescription():
+    user = User(phone="0712345678", email="admin@example.com", password="whatsapp_user", role="admin")
+    db.session.add(user)
+    db.session.flush()
+    db.session.add(Admin(user_id=user.id))
+    buffer = io.BytesIO()
+    Image.new("RGB", (600, 400), "white").save(buffer, "JPEG")
+    key, size, mime = store_image(buffer.getvalue(), "image/jpeg")
+    prescription = Prescription(user_id=user.id, image_sha256=key, image_size=size, image_mime=mime, response="ok")
+    db.session.add(prescription)
+    db.session.commit()
+    token = create_access_token(identity={"user_id": user.id, "email": user.email, "role": "admin"})
+    return prescription.id, {"Authorization": f"Bearer {token}"}
+
+
+def test_thumbnail_requires_admin(client, app):
+    prescription_id, _headers = _prescription()
+    assert client.get(f"/api/prescriptions/{prescription_id}/thumbnail").status_code == 401
+
+
+def test_thumbnail_revalidates_by_etag(client, app):
+    prescription_id, headers = _prescription()
+    url = f"/api/prescriptions/{prescription_id}/thumbnail"
+    response = client.get(url, headers=headers)
+    assert response.status_code == 200
+    assert response.headers["Cache-Control"] == "private, no-cache"
+
+    etag = response.headers["ETag"]
+    again = client.get(url, headers={**headers, "If-None-Match": etag})
+    assert again.status_code == 304
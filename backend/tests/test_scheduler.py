@@ -0,0 +1,18 @@
+# backend/tests/test_scheduler.py
+from app.utils import scheduler
+
+
+def test_file_lock_without_flock_is_never_granted(monkeypatch, tmp_path):
+    monkeypatch.setenv("SCHEDULER_LOCK_DIR", str(tmp_path))
+    monkeypatch.setattr(scheduler, "fcntl", None)
+    assert scheduler._FileLock("scheduler").acquire() is False
+
+
+def test_file_lock_is_exclusive(monkeypatch, tmp_path):
+    monkeypatch.setenv("SCHEDULER_LOCK_DIR", str(tmp_path))
+    first = scheduler._FileLock("scheduler")
+    assert first.acquire()
+    try:
+        assert scheduler._FileLock("scheduler").acquire() is False
+    finally:
+        first.release()
@@ -0,0 +1,35 @@
+# backend/tests/test_tips_dry_run.py
+import pytest
+
+from app.helpers import broadcast_bench
+from app.models.models import User
+
+URL = "/tasks/send-daily-tips?dry_run=1"
+
+
+@pytest.fixture
+def cron_headers(monkeypatch):
+    monkeypatch.setenv("CRON_SECRET", "cron-test")
+    return {"X-CRON-KEY": "cron-test"}
+
+
+def test_dry_run_within_caps_runs(client, cron_headers):
+    body = {"users": 4, "concurrency": 2, "llm_latency_ms": 0, "send_latency_ms": 0, "jitter_ms": 0}
+    res = client.post(URL, json=body, headers=cron_headers)
+    assert res.status_code == 200
+    assert res.get_json()["sent"] == 4
+
+
+@pytest.mark.parametrize("body", [
+    {"users": 100_000, "llm_latency_ms": 0, "send_latency_ms": 0},
+    {"users": 10, "concurrency": 1000},
+    {"users": 200, "concurrency": 1},  # ~190 s at the default stub latencies
+])
+def test_dry_run_over_caps_is_rejected(client, cron_headers, body):
+    assert client.post(URL, json=body, headers=cron_headers).status_code == 400
+
+
+def test_synthetic_recipients_are_transient_users(app):
+    users = broadcast_bench._synthetic_users(3)
+    assert all(isinstance(u, User) and u.id is None for u in users)
+    assert len({u.phone for u in users}) == 3
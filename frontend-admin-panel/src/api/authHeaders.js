@@ -0,0 +1,6 @@
+// Admin-only backend routes (prescription images, exports) need the JWT
+// from POST /admin/login, stored under "admin_token".
+export function authHeaders() {
+  const token = localStorage.getItem("admin_token");
+  return token ? { Authorization: `Bearer ${token}` } : {};
+}
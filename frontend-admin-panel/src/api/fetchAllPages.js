@@ -0,0 +1,18 @@
+import axios from "axios";
+
+// The /api list endpoints return one page at a time (newest first) and put
+// the next page's cursor in the X-Next-Cursor header. This walks every page
+// and resolves like axios.get, with all rows concatenated in `data`.
+// `filters` are passed through as query parameters (e.g. { q, since }).
+export async function fetchAllPages(url, filters = {}, pageSize = 1000) {
+  const rows = [];
+  let cursor = null;
+  do {
+    const params = { ...filters, limit: pageSize };
+    if (cursor) params.cursor = cursor;
+    const res = await axios.get(url, { params });
+    rows.push(...res.data);
+    cursor = res.headers["x-next-cursor"];
+  } while (cursor);
+  return { data: rows };
+}
@@ -14,21 +14,17 @@ function BarGraph({ title, apiUrl, barColor }) {
   const [chartData, setChartData] = useState([]);
 
   useEffect(() => {
+    // apiUrl: /api/stats/roles -> { participant: n, practitioner: n, admin: n }
     axios
       .get(apiUrl)
       .then((res) => {
-        const users = res.data;
-
-        // Count roles
-        const participantsCount = users.filter(u => u.role === "participant").length;
-        const practitionersCount = users.filter(u => u.role === "practitioner").length;
-        const adminsCount = users.filter(u => u.role === "admin").length;
+        const counts = res.data;
 
         // Prepare chart data
         setChartData([
-          { userType: "Participants", count: participantsCount },
-          { userType: "Practitioners", count: practitionersCount },
-          { userType: "Admins", count: adminsCount },
+          { userType: "Participants", count: counts.participant || 0 },
+          { userType: "Practitioners", count: counts.practitioner || 0 },
+          { userType: "Admins", count: counts.admin || 0 },
         ]);
       })
       .catch((error) => {
@@ -1,5 +1,6 @@
 import React, { useEffect, useState } from "react";
 import axios from "axios";
+import { fetchAllPages } from "../../api/fetchAllPages";
 import {
   PieChart,
   Pie,
@@ -15,13 +16,11 @@ function UserRoleDoughnutChart() {
   useEffect(() => {
     async function fetchData() {
       try {
-        const usersResponse = await axios.get("http://127.0.0.1:5555/api/users");
-        const users = usersResponse.data;
+        const rolesResponse = await axios.get("http://127.0.0.1:5555/api/stats/roles");
+        const totalParticipants = rolesResponse.data.participant || 0;
+        const totalPractitioners = rolesResponse.data.practitioner || 0;
 
-        const totalParticipants = users.filter(u => u.role === "participant").length;
-        const totalPractitioners = users.filter(u => u.role === "practitioner").length;
-
-        const associatesResponse = await axios.get("http://127.0.0.1:5555/api/associates");
+        const associatesResponse = await fetchAllPages("http://127.0.0.1:5555/api/associates");
         const totalAssociates = associatesResponse.data.length;
 
         setData([
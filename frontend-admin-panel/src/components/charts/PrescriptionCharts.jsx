@@ -1,23 +1,19 @@
-import React from 'react';
+import React, { useEffect, useState } from 'react';
+import axios from 'axios';
 
 
 function PrescriptionCharts({ prescriptions }) {
-  // Chart 1: Prescriptions timeline (last 30 days)
-  const getTimelineData = () => {
-    const timelineData = {};
-    const last30Days = [...Array(30)].map((_, i) => {
-      const date = new Date();
-      date.setDate(date.getDate() - i);
-      return date.toISOString().split('T')[0];
-    }).reverse();
+  const [dailyCounts, setDailyCounts] = useState([]);
 
-    last30Days.forEach(date => {
-      timelineData[date] = prescriptions.filter(p => 
-        p.timestamp && p.timestamp.startsWith(date)
-      ).length;
-    });
+  // Chart 1: Prescriptions timeline (last 30 days), bucketed by the server
+  useEffect(() => {
+    axios.get('http://127.0.0.1:5555/api/stats/prescriptions', { params: { interval: 'day' } })
+      .then(res => setDailyCounts(res.data.series))
+      .catch(error => console.error('Error fetching prescription stats:', error));
+  }, []);
 
-    return Object.entries(timelineData).map(([date, count]) => ({
+  const getTimelineData = () => {
+    return dailyCounts.map(({ date, count }) => ({
       date: new Date(date).toLocaleDateString('en-US', { month: 'short', day: 'numeric' }),
       count
     }));
@@ -29,12 +29,13 @@ function UserGrowthTimeline({ apiUrl }) {
   };
 
   useEffect(() => {
-    axios.get(apiUrl)
+    // apiUrl: /api/stats/signups, daily for the last year (the server's bucket limit)
+    const since = new Date();
+    since.setDate(since.getDate() - 365);
+    axios.get(apiUrl, { params: { interval: "day", since: since.toISOString().split('T')[0] } })
       .then((res) => {
-        const users = res.data;
-        
         // Process data to get role trends over time
-        const timelineData = processRoleTimelineData(users);
+        const timelineData = processRoleTimelineData(res.data.series, res.data.before);
         setRoleData(timelineData);
         setFilteredData(timelineData);
         
@@ -56,39 +57,16 @@ function UserGrowthTimeline({ apiUrl }) {
       });
   }, [apiUrl]);
 
-  // Process user data to create role-specific timeline
-  const processRoleTimelineData = (users) => {
-    const dateRoleCounts = {};
-    
-    // Initialize structure for each date
-    users.forEach(user => {
-      if (user.created_at) {
-        const date = new Date(user.created_at).toISOString().split('T')[0];
-        if (!dateRoleCounts[date]) {
-          dateRoleCounts[date] = {
-            date: date,
-            participant: 0,
-            practitioner: 0,
-            admin: 0,
-            total: 0,
-            formattedDate: new Date(date).toLocaleDateString()
-          };
-        }
-        dateRoleCounts[date][user.role] = (dateRoleCounts[date][user.role] || 0) + 1;
-        dateRoleCounts[date].total += 1;
-      }
-    });
-
-    // Convert to array and calculate cumulative counts for each role
-    const sortedDates = Object.keys(dateRoleCounts).sort();
-    
-    let cumulativeParticipants = 0;
-    let cumulativePractitioners = 0;
-    let cumulativeAdmins = 0;
-    let cumulativeTotal = 0;
+  // Daily signups per role (series) + signups before the first day (before)
+  // -> role-specific cumulative timeline
+  const processRoleTimelineData = (series, before = {}) => {
+    let cumulativeParticipants = before.participant || 0;
+    let cumulativePractitioners = before.practitioner || 0;
+    let cumulativeAdmins = before.admin || 0;
+    let cumulativeTotal = before.total || 0;
 
-    const timelineData = sortedDates.map(date => {
-      const dailyData = dateRoleCounts[date];
+    const timelineData = series.map(day => {
+      const dailyData = { ...day, formattedDate: new Date(day.date).toLocaleDateString() };
       
       cumulativeParticipants += dailyData.participant;
       cumulativePractitioners += dailyData.practitioner;
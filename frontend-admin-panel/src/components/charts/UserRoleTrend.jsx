@@ -16,23 +16,10 @@ function UserRoleTrend({ title, apiUrl }) {
   const [chartData, setChartData] = useState([]);
 
   useEffect(() => {
+    // apiUrl: /api/stats/signups -> daily signups per role, already bucketed and sorted
     axios.get(apiUrl)
       .then((res) => {
-        const users = res.data;
-
-        // Group users by date and role
-        const grouped = {};
-        users.forEach(u => {
-          if (!u.created_at) return;
-          const date = u.created_at.split("T")[0]; // YYYY-MM-DD
-          if (!grouped[date]) grouped[date] = { date, participant: 0, practitioner: 0, admin: 0 };
-          const roleKey = u.role.toLowerCase();
-          if (grouped[date][roleKey] !== undefined) grouped[date][roleKey] += 1;
-        });
-
-        // Convert object to sorted array
-        const sortedData = Object.values(grouped).sort((a, b) => new Date(a.date) - new Date(b.date));
-        setChartData(sortedData);
+        setChartData(res.data.series);
       })
       .catch(err => {
         console.error("Error fetching user data:", err);
@@ -6,7 +6,7 @@ import Header from "../components/layout/Header.jsx";
 import Searchbar from "../components/forms/Searchbar.jsx";
 import BarGraph from "../components/charts/BarGraph.jsx";
 import UserRoleTrend from "../components/charts/UserRoleTrend.jsx";
-import axios from "axios";
+import { fetchAllPages } from "../api/fetchAllPages";
 import "../styles/Dashboard.css";
 
 function Dashboard() {
@@ -39,7 +39,7 @@ function Dashboard() {
 
   useEffect(() => {
     // Fetch stats
-    axios.get("http://127.0.0.1:5555/api/users")
+    fetchAllPages("http://127.0.0.1:5555/api/users")
       .then(res => {
         const usersData = res.data;
         setUsers(usersData);
@@ -74,11 +74,11 @@ function Dashboard() {
       
       
     // Fetch tips
-    axios.get("http://127.0.0.1:5555/api/tips")
+    fetchAllPages("http://127.0.0.1:5555/api/tips")
       .then(res => setTips(res.data));
 
     // Fetch prescriptions
-    axios.get("http://127.0.0.1:5555/api/prescriptions")
+    fetchAllPages("http://127.0.0.1:5555/api/prescriptions")
       .then(res => {
         const data = res.data;
         setPrescriptions(data);
@@ -262,12 +262,12 @@ function Dashboard() {
             <div className="charts-container">
               <BarGraph 
                 title="User Role Comparison"
-                apiUrl="http://127.0.0.1:5555/api/users"
+                apiUrl="http://127.0.0.1:5555/api/stats/roles"
                 barColor="#6C63FF"
               />
               <UserRoleTrend 
                 title="User Role Trend Over Time"
-                apiUrl="http://127.0.0.1:5555/api/users"
+                apiUrl="http://127.0.0.1:5555/api/stats/signups"
               />
             </div>
 
@@ -1,9 +1,37 @@
-import React, {useState, useEffect} from "react";
+import React, {useState, useEffect, useRef} from "react";
 import axios from "axios";
+import { fetchAllPages } from "../api/fetchAllPages";
+import { authHeaders } from "../api/authHeaders";
 import PrescriptionCharts from "../components/charts/PrescriptionCharts";
 import PrescriptionFilters from "../components/forms/PrescriptionFilters";
 import '../styles/Prescriptions.css'
 
+const API_BASE = "http://127.0.0.1:5555";
+
+// Thumbnails are admin-only, so they are fetched with the JWT (an <img src>
+// can't send it) and shown from an object URL.
+function PrescriptionThumb({ url, alt }) {
+  const [src, setSrc] = useState(null);
+
+  useEffect(() => {
+    let objectUrl = null;
+    let cancelled = false;
+    axios.get(`${API_BASE}${url}`, { responseType: "blob", headers: authHeaders() })
+      .then(res => {
+        if (cancelled) return;
+        objectUrl = URL.createObjectURL(res.data);
+        setSrc(objectUrl);
+      })
+      .catch(() => {});
+    return () => {
+      cancelled = true;
+      if (objectUrl) URL.revokeObjectURL(objectUrl);
+    };
+  }, [url]);
+
+  return src ? <img src={src} alt={alt} width="48" height="48" /> : '—';
+}
+
 
 function Prescriptions() {
   const [prescriptions, setPrescriptions] = useState([]);
@@ -11,6 +39,7 @@ function Prescriptions() {
   const [loading, setLoading] = useState(true);
   const [searchQuery, setSearchQuery] = useState('');
   const [dateFilter, setDateFilter] = useState('');
+  const latestFilterRequest = useRef(0);
 
 
   // Fetch prescriptions from the API
@@ -20,7 +49,7 @@ function Prescriptions() {
 
   const fetchPrescriptions=async()=>{
     try {
-      const response = await axios.get("http://127.0.0.1:5555/api/prescriptions");
+      const response = await fetchAllPages(`${API_BASE}/api/prescriptions`);
       setPrescriptions(response.data);
       setFilteredPrescriptions(response.data);
     } catch(error){
@@ -36,7 +65,7 @@ function Prescriptions() {
     const totalPrescriptions = dataToUse.length;
     const totalInputTokens = dataToUse.reduce((sum, p) => sum + (parseInt(p.input_token) || 0), 0);
     const totalOutputTokens = dataToUse.reduce((sum, p) => sum + (parseInt(p.output_token) || 0), 0);
-    const prescriptionsWithUpload = dataToUse.filter(p => p.uploaded).length;
+    const prescriptionsWithUpload = dataToUse.filter(p => p.uploaded || p.thumbnail_url).length;
     
     
     return {
@@ -55,26 +84,30 @@ function Prescriptions() {
     applyFilters(query, dateFilter);
   };
 
-  const applyFilters = (query = searchQuery, date = dateFilter) => {
-    let filtered = prescriptions;
-  
-  // Apply search filter
-    if (query.trim()) {
-      filtered = filtered.filter(prescription =>
-        prescription.response?.toLowerCase().includes(query.toLowerCase()) ||
-        prescription.user_id?.toString().includes(query)
-      );
-    }
-  
-  // Apply date filter
+  // Search (response text, user email/phone/id) and date filtering run on the server
+  const applyFilters = async (query = searchQuery, date = dateFilter) => {
+    const filters = {};
+    if (query.trim()) filters.q = query.trim();
     if (date) {
-      filtered = filtered.filter(prescription => {
-        const prescriptionDate = new Date(prescription.timestamp).toISOString().split('T')[0];
-        return prescriptionDate === date;
-      });
+      filters.since = date;
+      filters.until = date;
+    }
+
+    const requestId = ++latestFilterRequest.current;
+    if (!filters.q && !filters.since) {
+      setFilteredPrescriptions(prescriptions);
+      return;
+    }
+
+    try {
+      const response = await fetchAllPages(`${API_BASE}/api/prescriptions`, filters);
+      // Ignore answers to searches the user has already typed past
+      if (requestId === latestFilterRequest.current) {
+        setFilteredPrescriptions(response.data);
+      }
+    } catch(error){
+      console.log("Error filtering prescriptions:", error)
     }
-  
-    setFilteredPrescriptions(filtered);
   };
   const handleDateChange = (event) => {
     const date = event.target.value;
@@ -161,6 +194,7 @@ function Prescriptions() {
               <thead>
                 <tr>
                   <th>ID</th>
+                  <th>Image</th>
                   <th>User ID</th>
                   <th>AI Response Preview</th>
                   <th>Input Tokens</th>
@@ -173,6 +207,12 @@ function Prescriptions() {
                 {filteredPrescriptions.map((prescription) => (
                   <tr key={prescription.id}>
                     <td className="prescription-id">{prescription.id}</td>
+                    <td className="prescription-thumb">
+                      {prescription.thumbnail_url
+                        ? <PrescriptionThumb url={prescription.thumbnail_url} alt={`Prescription ${prescription.id}`} />
+                        : '—'
+                      }
+                    </td>
                     <td className="user-id">{prescription.user_id}</td>
                     <td className="response-preview">
                       {prescription.response 
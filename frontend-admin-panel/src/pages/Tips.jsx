@@ -1,5 +1,5 @@
 import React, { useState, useEffect } from 'react';
-import axios from 'axios';
+import { fetchAllPages } from '../api/fetchAllPages';
 //import Sidebar from '../components/layout/Sidebar';
 import '../styles/Tips.css';
 import Searchbar from '../components/forms/Searchbar';
@@ -31,7 +31,7 @@ function Tips() {
   }, [tips, selectedDate, searchQuery]);
   async function fetchTips() {
     try {
-      const response = await axios.get('http://127.0.0.1:5555/api/tips');
+      const response = await fetchAllPages('http://127.0.0.1:5555/api/tips');
       setTips(response.data);
     } catch (error) {
       console.error('Error fetching tips:', error);
@@ -1,5 +1,6 @@
-import React, {useEffect, useState} from "react";
+import React, {useEffect, useRef, useState} from "react";
 import axios from "axios";
+import { fetchAllPages } from "../api/fetchAllPages";
 import UserRoleDoughnutChart from "../components/charts/DonutChart";
 import UserTrendsInsight from "../components/charts/UserGrowthTimeline";
 import "../styles/Users.css";
@@ -17,6 +18,8 @@ function Users() {
   const [searchQuery, setSearchQuery] = useState("");
   const [users, setUsers] = useState([]);
   const [showUsersTable, setShowUsersTable] = useState(false);
+  const [filteredUsers, setFilteredUsers] = useState([]);
+  const latestSearch = useRef(0);
   
 
 
@@ -24,20 +27,27 @@ function Users() {
   setSearchQuery(query);
   };
 
-  // Search functionality
-  const filteredUsers = searchQuery ? users.filter(user =>
-      (user.first_name && user.first_name.toLowerCase().includes(searchQuery.toLowerCase()))||
-      (user.last_name && user.last_name.toLowerCase().includes(searchQuery.toLowerCase())) ||
-      (user.email && user.email.toLowerCase().includes(searchQuery.toLowerCase())) || 
-      (user.role && user.role.toLowerCase().includes(searchQuery.toLowerCase()))
-    ): users;
+  // Search runs on the server: /api/users?q= matches email, phone, role and profile names
+  useEffect(() => {
+    const query = searchQuery.trim();
+    const requestId = ++latestSearch.current;
+    if (!query) {
+      setFilteredUsers([]);
+      return;
+    }
+    axios.get("http://127.0.0.1:5555/api/users", { params: { q: query, limit: 50 } })
+      .then(res => {
+        if (requestId === latestSearch.current) setFilteredUsers(res.data);
+      })
+      .catch(error => console.log("Error searching users:", error));
+  }, [searchQuery]);
 
 
   useEffect(()=>{
     Promise.all([
-      axios.get("http://127.0.0.1:5555/api/participants"),
-      axios.get("http://127.0.0.1:5555/api/practitioners"), 
-      axios.get("http://127.0.0.1:5555/api/admins")
+      fetchAllPages("http://127.0.0.1:5555/api/participants"),
+      fetchAllPages("http://127.0.0.1:5555/api/practitioners"), 
+      fetchAllPages("http://127.0.0.1:5555/api/admins")
     ])
     .then(([participantsRes, practitionersRes, adminsRes]) => {
     // Combine all users and add role information
@@ -59,7 +69,7 @@ function Users() {
     .catch(error => console.log("Error fetching users:", error));
     
    
-    axios.get("http://127.0.0.1:5555/api/associates")
+    fetchAllPages("http://127.0.0.1:5555/api/associates")
     .then(res=>{
       const Asso=res.data;
       setAssociates(
@@ -89,8 +99,8 @@ function Users() {
           <div className="users-list">
             {filteredUsers.map(user => (
               <div key={user.id} className="user-card">
-                <h4>{user.first_name} {user.last_name}</h4>
-                <p><strong>Email:</strong> {user.email}</p>
+                <h4>{user.email}</h4>
+                <p><strong>Phone:</strong> {user.phone}</p>
                 <p><strong>Role:</strong> {user.role}</p>
               </div>
             ))}
@@ -163,7 +173,7 @@ function Users() {
       <UserRoleDoughnutChart />
       <br />
       <br />
-      <UserGrowthTimeline apiUrl="http://127.0.0.1:5555/api/users"/>
+      <UserGrowthTimeline apiUrl="http://127.0.0.1:5555/api/stats/signups"/>
     </div>
   );
 }